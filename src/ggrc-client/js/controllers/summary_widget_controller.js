@@ -252,16 +252,16 @@ export default can.Control({
   parseStatuses: function (type, data) {
     var statuses = CMS.Models[type].statuses;
     var groups = _.object(statuses, new Array(statuses.length).fill(0));
+    var total = 0;
     var result;
     data.forEach(function (item) {
-      if (item[1]) {
-        item[0] = 'Verified';
-      }
-      groups[item[0]]++;
+      var status = item[1] ? 'Verified' : item[0];
+      groups[status] += item[2];
+      total += item[2];
     });
     result = _.pairs(groups);
     return {
-      total: data.length,
+      total: total,
       statuses: result
     };
   },
@@ -272,12 +272,13 @@ export default can.Control({
    * @example
    * Example of response:
    * [
-   * ["In Review", 0],
-   * ["In Progress", 0],
-   * ["Completed", 1]
+   * ["In Review", false, 2],
+   * ["In Progress", false, 5],
+   * ["Completed", true, 1]
    * ]
    * where first value in array - title of status,
-   * and second - 0(not verified), 1(verified) assessment
+   * second - whether assessments are verified,
+   * and third - number of assessments in the group
    */
   getStatuses: function (auditId) {
     return $.get('/api/audits/'+ auditId + '/summary');
@@ -5,6 +5,7 @@
 
 
 import re
+import time
 
 from logging import getLogger
 from logging.config import dictConfig as setup_logging
@@ -24,6 +25,7 @@ from ggrc import extensions
 from ggrc import notifications
 from ggrc import settings
 from ggrc.utils import benchmark
+from ggrc.utils import request_stats
 
 
 setup_logging(settings.LOGGING)
@@ -71,21 +73,35 @@ def setup_user_timezone_offset():
   g.user_timezone_offset = request.headers.get("X-UserTimezoneOffset")
 
 
+# Cached maintenance flag with its expiration time.
+_maintenance_cache = {"expires_at": 0, "under_maintenance": False}
+
+
+def _is_under_maintenance():
+  """Check the maintenance flag at most once per MAINTENANCE_CHECK_TTL."""
+  if _maintenance_cache["expires_at"] > time.time():
+    return _maintenance_cache["under_maintenance"]
+  from ggrc.models.maintenance import Maintenance
+  try:
+    db_row = db.session.query(Maintenance).get(1)
+  except sqlalchemy.exc.ProgrammingError as e:
+    if re.search(r"""\(1146, "Table '.+' doesn't exist"\)$""", e.message):
+      db_row = None
+    else:
+      raise
+  under_maintenance = bool(db_row and db_row.under_maintenance)
+  _maintenance_cache.update(
+      expires_at=time.time() + getattr(settings, "MAINTENANCE_CHECK_TTL", 0),
+      under_maintenance=under_maintenance,
+  )
+  return under_maintenance
+
+
 @app.before_request
 def check_if_under_maintenance():
   """Check if the site is in maintenance mode."""
   with benchmark('Check for maintenance'):
-    from ggrc.models.maintenance import Maintenance
-    sess = db.session
-    try:
-      db_row = sess.query(Maintenance).get(1)
-    except sqlalchemy.exc.ProgrammingError as e:
-      if re.search(r"""\(1146, "Table '.+' doesn't exist"\)$""", e.message):
-        db_row = None
-      else:
-        raise
-    condition = (db_row and
-                 db_row.under_maintenance and
+    condition = (_is_under_maintenance() and
                  request.path != url_for('maintenance_') and
                  request.path != '/_ah/start')
     if condition:
@@ -146,7 +162,9 @@ def init_extension_blueprints(app_):
 
 def init_permissions_provider():
   from ggrc.rbac import permissions
+  from ggrc.rbac import user_access
   permissions.get_permissions_provider()
+  user_access.init_app(app)
 
 
 def init_extra_listeners():
@@ -243,6 +261,8 @@ init_extension_blueprints(app)
 init_permissions_provider()
 init_extra_listeners()
 notifications.register_notification_listeners()
+# Keep this after all other before_request handlers are registered.
+request_stats.init_app(app)
 
 _enable_debug_toolbar()
 _enable_jasmine()
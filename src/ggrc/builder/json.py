@@ -11,8 +11,11 @@ from logging import getLogger
 
 import iso8601
 import sqlalchemy
+from sqlalchemy import orm
 from sqlalchemy.ext.associationproxy import AssociationProxy
 from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.orm.exc import UnmappedColumnError
+from sqlalchemy.orm.properties import ColumnProperty
 from sqlalchemy.orm.properties import RelationshipProperty
 from werkzeug.exceptions import BadRequest
 
@@ -80,6 +83,59 @@ def publish(obj, inclusions=(), inclusion_filter=None,
   return obj
 
 
+def projection_options(model, attrs):
+  """Get loader options needed to publish only the given attributes of model.
+
+  Columns of published attributes are loaded with load_only and everything
+  else is left deferred. Relationships are loaded only when publishing them
+  needs the related objects, otherwise their stubs are built from the foreign
+  key columns.
+
+  Args:
+    model: model class of published objects.
+    attrs: names of attributes that will be published, names of attributes
+      that are not published for the model are ignored.
+
+  Returns:
+    list of query options or None if an attribute depends on unknown state
+    (custom publish logic, python properties, association proxies) and
+    objects must be fully loaded.
+  """
+  mapper = sqlalchemy.inspect(model)
+  publisher = get_json_builder(model)
+  include_links = getattr(publisher, "_include_links", ())
+  published = {getattr(attr, "attr_name", attr)
+               for attr in getattr(publisher, "_publish_attrs", ())}
+  columns = {"id"}
+  relationships = set()
+  for attr_name in attrs:
+    if attr_name not in published or attr_name == "type":
+      continue
+    if any(attr_name in getattr(base, "_custom_publish", {})
+           for base in model.__mro__):
+      return None
+    class_attr = getattr(model, attr_name, None)
+    if not isinstance(class_attr, InstrumentedAttribute):
+      return None
+    prop = class_attr.property
+    if isinstance(prop, ColumnProperty):
+      columns.add(prop.key)
+    elif isinstance(prop, RelationshipProperty):
+      try:
+        columns.update(mapper.get_property_by_column(column).key
+                       for column in prop.local_columns)
+      except UnmappedColumnError:
+        return None
+      if (prop.uselist or prop.backref or attr_name in include_links or
+              prop.mapper.polymorphic_on is not None):
+        relationships.add(attr_name)
+    else:
+      return None
+  options = [orm.Load(model).load_only(*columns)]
+  options.extend(orm.subqueryload(name) for name in relationships)
+  return options
+
+
 def update(obj, json_obj):
   """Translate the state represented by ``json_obj`` into update actions
   performed upon the model object ``obj``. After performing the update ``obj``
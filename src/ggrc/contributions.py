@@ -3,6 +3,8 @@
 
 """Lists of ggrc contributions."""
 
+from ggrc.fulltext import outbox
+from ggrc.models import person_object_count
 from ggrc.notifications import common
 from ggrc.notifications import notification_handlers
 from ggrc.notifications import data_handlers
@@ -11,12 +13,17 @@ from ggrc.utils import proposal
 
 CONTRIBUTED_CRON_JOBS = [
     common.send_daily_digest_notifications,
+    person_object_count.reconcile,
 ]
 
 HALF_HOUR_CRON_JOBS = [
     proposal.send_notification,
 ]
 
+MINUTE_CRON_JOBS = [
+    outbox.drain,
+]
+
 NOTIFICATION_LISTENERS = [
     notification_handlers.register_handlers
 ]
@@ -29,6 +29,7 @@ from ggrc.converters import pre_commit_checks
 from ggrc.converters.base_row import RowConverter
 from ggrc.converters.import_helper import get_column_order
 from ggrc.converters.import_helper import get_object_column_definitions
+from ggrc.converters.reference_cache import ReferenceCache
 from ggrc.services.common import get_modified_objects
 from ggrc.services.common import update_snapshot_index
 from ggrc.services.common import update_memcache_after_commit
@@ -106,6 +107,7 @@ class BlockConverter(object):
     self._roles_cache = None
     self._user_roles_cache = None
     self._ca_definitions_cache = None
+    self._reference_cache = None
     self.converter = converter
     self.offset = options.get("offset", 0)  # offset to the current block
     self.object_class = options.get("object_class")
@@ -317,6 +319,16 @@ class BlockConverter(object):
       self._owners_cache = self._create_owners_cache()
     return self._owners_cache
 
+  def get_reference_cache(self):
+    """Get lookup cache for objects referenced from the block cells."""
+    if self._reference_cache is None:
+      self._reference_cache = ReferenceCache(self)
+    return self._reference_cache
+
+  def drop_reference_cache(self):
+    """Drop cached references, needed after previous blocks were committed."""
+    self._reference_cache = None
+
   @cached_property
   def mapped_snapshots(self):
     """Cached property of mapped to audit snapshots"""
@@ -459,6 +471,8 @@ class BlockConverter(object):
     """
     if self.ignore:
       return
+    if field_list is None:
+      self.drop_reference_cache()
     for row_converter in self.row_converters:
       row_converter.handle_row_data(field_list)
     if field_list is None:
@@ -511,6 +525,7 @@ class BlockConverter(object):
 
   def import_secondary_objects(self):
     """Import secondary objects procedure."""
+    self.drop_reference_cache()
     for row_converter in self.row_converters:
       row_converter.setup_secondary_objects()
 
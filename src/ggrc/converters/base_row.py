@@ -118,7 +118,8 @@ class RowConverter(object):
                      column_names=", ".join(missing))
 
   def find_by_key(self, key, value):
-    return self.object_class.query.filter_by(**{key: value}).first()
+    cache = self.block_converter.get_reference_cache()
+    return cache.get_object(self.object_class, key, value, column=key)
 
   def get_value(self, key):
     item = self.attrs.get(key) or self.objects.get(key)
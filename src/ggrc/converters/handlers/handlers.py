@@ -8,19 +8,14 @@ from datetime import date
 from datetime import datetime
 from dateutil.parser import parse
 
-from sqlalchemy import and_
-from sqlalchemy import or_
-
 from ggrc import db
 from ggrc.converters import errors
 from ggrc.converters import get_exportables
 from ggrc.login import get_current_user
 from ggrc.models import Audit
-from ggrc.models import CategoryBase
 from ggrc.models import Contract
 from ggrc.models import Assessment
 from ggrc.models import ObjectPerson
-from ggrc.models import Option
 from ggrc.models import Person
 from ggrc.models import Policy
 from ggrc.models import Program
@@ -64,6 +59,11 @@ class ColumnHandler(object):
     if options.get("parse"):
       self.set_value()
 
+  @property
+  def reference_cache(self):
+    """Block level lookup cache for referenced objects."""
+    return self.row_converter.block_converter.get_reference_cache()
+
   def check_unique_consistency(self):
     """Returns true if no object exists with the same unique field."""
     if not self.unique:
@@ -72,11 +72,10 @@ class ColumnHandler(object):
       return
     if not self.row_converter.obj:
       return
-    nr_duplicates = self.row_converter.object_class.query.filter(and_(
-        getattr(self.row_converter.object_class, self.key) == self.value,
-        self.row_converter.object_class.id != self.row_converter.obj.id
-    )).count()
-    if nr_duplicates > 0:
+    ids = self.reference_cache.get_ids(
+        self.row_converter.object_class, self.key, self.value,
+        column=self.key)
+    if ids - {self.row_converter.obj.id}:
       self.add_error(errors.DUPLICATE_VALUE,
                      column_name=self.key,
                      value=self.value)
@@ -235,12 +234,32 @@ class UserColumnHandler(ColumnHandler):
         self.add_warning(errors.UNKNOWN_USER_WARNING, email=email)
     return list(users)
 
+  def _get_person_resolver(self):
+    """Get import resolver with all emails of the column resolved."""
+    from ggrc.utils import user_generator
+    block_converter = self.row_converter.block_converter
+    shared_state = block_converter.converter.shared_state
+    resolver = shared_state.get("person_resolver")
+    if resolver is None:
+      resolver = user_generator.PersonResolver()
+      shared_state["person_resolver"] = resolver
+    prefetched = shared_state.setdefault("person_columns", set())
+    if (id(block_converter), self.key) not in prefetched:
+      prefetched.add((id(block_converter), self.key))
+      values = self.reference_cache.get_column_values(self.key)
+      resolver.resolve(value for value in values if len(value.split()) == 1)
+    return resolver
+
   def get_person(self, email):
     from ggrc.utils import user_generator
     new_objects = self.row_converter.block_converter.converter.new_objects
     if email not in new_objects[Person]:
+      if not user_generator.is_external_lookup_enabled():
+        new_objects[Person][email] = self.reference_cache.get_object(
+            Person, "email", email, column=self.key)
+        return new_objects[Person].get(email)
       try:
-        new_objects[Person][email] = user_generator.find_user(email)
+        new_objects[Person][email] = self._get_person_resolver().get(email)
       except ValueError as ex:
         self.add_error(
             errors.VALIDATION_ERROR,
@@ -479,7 +498,8 @@ class MappingColumnHandler(ColumnHandler):
     slugs = set([slug.lower() for slug in lines if slug.strip()])
     objects = []
     for slug in slugs:
-      obj = class_.query.filter_by(slug=slug).first()
+      obj = self.reference_cache.get_object(class_, "slug", slug,
+                                            column=self.key)
       if obj:
         if permissions.is_allowed_update_for(obj):
           objects.append(obj)
@@ -575,11 +595,8 @@ class OptionColumnHandler(ColumnHandler):
       return None
     prefixed_key = "{}_{}".format(
         self.row_converter.object_class._inflector.table_singular, self.key)
-    item = Option.query.filter(
-        and_(Option.title == self.raw_value.strip(),
-             or_(Option.role == self.key,
-                 Option.role == prefixed_key))).first()
-    return item
+    return self.reference_cache.get_option([self.key, prefixed_key],
+                                           self.raw_value.strip())
 
   def get_value(self):
     option = getattr(self.row_converter.obj, self.key, None)
@@ -608,7 +625,8 @@ class ParentColumnHandler(ColumnHandler):
     slug = self.raw_value
     obj = self.new_objects.get(self.parent, {}).get(slug)
     if obj is None:
-      obj = self.parent.query.filter(self.parent.slug == slug).first()
+      obj = self.reference_cache.get_object(self.parent, "slug", slug,
+                                            column=self.key)
     if obj is None:
       self.add_error(errors.UNKNOWN_OBJECT,
                      object_type=self.parent._inflector.human_singular.title(),
@@ -662,7 +680,8 @@ class SectionDirectiveColumnHandler(MappingColumnHandler):
   def get_directive_from_slug(self, directive_class, slug):
     if slug in self.new_objects[directive_class]:
       return self.new_objects[directive_class][slug]
-    return directive_class.query.filter_by(slug=slug).first()
+    return self.reference_cache.get_object(directive_class, "slug", slug,
+                                           column=self.key)
 
   def parse_item(self):
     """ get a directive from slug """
@@ -816,10 +835,8 @@ class CategoryColumnHandler(ColumnHandler):
     names = [name for name in names if name != ""]
     if not names:
       return None
-    categories = CategoryBase.query.filter(and_(
-        CategoryBase.name.in_(names),
-        CategoryBase.type == self.category_base_type
-    )).all()
+    categories = self.reference_cache.get_categories(
+        self.category_base_type, names)
     category_names = set([c.name.strip() for c in categories])
     for name in names:
       if name not in category_names:
@@ -30,7 +30,7 @@ class ObjectsColumnHandler(handlers.ColumnHandler):
         self.add_warning(errors.WRONG_VALUE, column_name=self.display_name)
         continue
       new_object_slugs = self.new_slugs[class_]
-      obj = class_.query.filter(class_.slug == slug).first()
+      obj = self.reference_cache.get_object(class_, "slug", slug)
       if obj:
         objects.append(obj)
       elif not (slug in new_object_slugs and self.dry_run):
@@ -68,14 +68,25 @@ def generate_csv_string(csv_data):
 
 
 def extract_relevant_data(csv_data):
-  """ Split csv data into data and metadata """
-  striped_data = [[unicode.strip(c) for c in line]
-                  for line in csv_data]  # noqa
-  transpose_data = zip(*striped_data[1:])
-  non_empty = [d for d in transpose_data if any(d)]
-  data = zip(*non_empty[1:])
-  column_definitions = list(data.pop(0))
-  data = [list(d) for d in data]
+  """Split csv data into data and metadata.
+
+  The first line of a block and the first non empty column, that contain the
+  object type, are removed together with all empty columns. Only the cells of
+  the remaining columns are copied, so the block is not transposed back and
+  forth.
+
+  Args:
+    csv_data (list of list of unicode): lines of a single csv block.
+
+  Returns:
+    tuple of column headers and list of stripped data rows.
+  """
+  lines = [[cell.strip() for cell in line] for line in csv_data[1:]]
+  width = min(len(line) for line in lines) if lines else 0
+  columns = [index for index in range(width)
+             if any(line[index] for line in lines)][1:]
+  column_definitions = [lines[0][index] for index in columns]
+  data = [[line[index] for index in columns] for line in lines[1:]]
   return column_definitions, data
 
 
@@ -90,21 +101,36 @@ def equalize_array(array):
   return array
 
 
+def iter_blocks(csv_data):
+  """Split csv lines by empty lines while they are being read.
+
+  Args:
+    csv_data: iterable of csv lines, e.g. a csv_reader generator.
+
+  Yields:
+    tuples with offset of the first block line and list of block lines.
+  """
+  block = None
+  block_offset = None
+  for offset, line in enumerate(csv_data):
+    if any(line):
+      if block is None:
+        block_offset, block = offset, []
+      block.append(line)
+    elif block is not None:
+      yield block_offset, block
+      block = None
+  if block is not None:
+    yield block_offset, block
+
+
 def split_array(csv_data):
   """ Split array by empty lines """
   data_blocks = []
   offsets = []
-  current_block = None
-  for offset, line in enumerate(csv_data):
-    if sum([len(l) for l in line]) > 0:
-      if current_block is None:
-        offsets.append(offset)
-        data_blocks.append([])
-        current_block = len(data_blocks) - 1
-      data_blocks[current_block].append(line)
-    else:
-      current_block = None
-
+  for offset, block in iter_blocks(csv_data):
+    offsets.append(offset)
+    data_blocks.append(block)
   return offsets, data_blocks
 
 
@@ -121,7 +147,11 @@ def csv_reader(csv_data, dialect=csv.excel, **kwargs):
 
 
 def read_csv_file(csv_file):
-  """ Get full string representation of the csv file """
+  """ Get full string representation of the csv file
+
+  Imports should prefer iterating csv_reader directly, so that the whole file
+  is never held in memory as a list of rows.
+  """
   return [row for row in csv_reader(csv_file)]
 
 
@@ -130,18 +160,34 @@ def utf_8_encode_array(array):
   return [[val.encode("utf-8") for val in line] for line in array]
 
 
+def _decode_line(line, encoding):
+  """Decode a line with the given encoding or return None on failure."""
+  if encoding is None:
+    return None
+  try:
+    return line.decode(encoding)
+  except UnicodeDecodeError:
+    return None
+
+
 def utf_8_encoder(csv_data):
   """This function is a generator that attempts to encode the string as utf-8.
-  It is assumed that the data is likely to be encoded in ascii. If encoding
-  fails, however, the function will attempt to guess the encoding and convert
-  it to utf-8.
-  Guessing is only done when a line fails to encode as there may be characters
-  further in the stream that aren't valid ascii and encoding is performed per
-  line yielded; guessing is the fallback on a per-line basis.
+  It is assumed that the data is likely to be encoded in ascii or utf-8, such
+  lines are yielded unchanged. If decoding fails, the function guesses the
+  encoding and converts the line to utf-8.
+  The guessed encoding is reused for all following lines that are not valid
+  utf-8, it is guessed again only if it can not decode such a line.
   """
+  encoding_guess = None
   for line in csv_data:
     try:
-      yield line.decode('utf-8').encode('utf-8')
+      line.decode('utf-8')
+      yield line
+      continue
     except UnicodeDecodeError:
+      pass
+    decoded = _decode_line(line, encoding_guess)
+    if decoded is None:
       encoding_guess = chardet.detect(line)['encoding']
-      yield line.decode(encoding_guess).encode('utf-8')
+      decoded = line.decode(encoding_guess)
+    yield decoded.encode('utf-8')
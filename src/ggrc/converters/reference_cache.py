@@ -0,0 +1,207 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Lookup cache for objects referenced from cells of an import block.
+
+Column handlers resolve references such as slugs, emails, options and
+categories for every cell separately. Instead of running a query per cell,
+the first lookup for a column loads references for all values found in that
+column of the block with a few IN queries. Lookups of values that were not
+prefetched, e.g. values changed by parsing, are loaded one by one and cached
+as well, including negative results.
+
+The cache must be dropped after objects get committed, since committed
+objects are expired and new objects could have been created.
+"""
+
+from collections import defaultdict
+
+from ggrc import db
+from ggrc.models import CategoryBase
+from ggrc.models import Option
+from ggrc.utils import structures
+
+
+CHUNK_SIZE = 1000
+
+
+def _lookup_key(value):
+  """Get key for cache dicts that matches the MySQL string comparison."""
+  return value.strip() if isinstance(value, basestring) else value
+
+
+def _chunks(values):
+  values = list(values)
+  for index in range(0, len(values), CHUNK_SIZE):
+    yield values[index:index + CHUNK_SIZE]
+
+
+class ReferenceCache(object):
+  """Block level cache of objects referenced from the csv cells.
+
+  Attributes:
+    block_converter: BlockConverter with raw rows used for prefetching.
+  """
+
+  def __init__(self, block_converter):
+    self.block_converter = block_converter
+    self._prefetched = set()
+    self._objects = defaultdict(structures.CaseInsensitiveDict)
+    self._ids = defaultdict(structures.CaseInsensitiveDict)
+    self._options = None
+    self._categories = {}
+
+  def get_column_values(self, column):
+    """Get all distinct non empty values from cells of a block column.
+
+    Multi line cells contribute the whole cell value and each of its lines.
+
+    Args:
+      column: attribute name of the column as used in block headers.
+
+    Returns:
+      set of stripped cell values or an empty set if the block does not
+      contain the given column.
+    """
+    headers = self.block_converter.headers.keys()
+    if column not in headers:
+      return set()
+    index = headers.index(column)
+    values = set()
+    for row in self.block_converter.rows:
+      if index >= len(row):
+        continue
+      values.add(row[index].strip())
+      values.update(line.strip() for line in row[index].splitlines())
+    values.discard("")
+    return values
+
+  def _prefetch(self, kind, model, key, column):
+    """Get column values that were not prefetched for this lookup yet."""
+    if column is None or (kind, model, key, column) in self._prefetched:
+      return []
+    self._prefetched.add((kind, model, key, column))
+    return self.get_column_values(column)
+
+  def get_object(self, model, key, value, column=None):
+    """Get object of the given model that has the key equal to value.
+
+    Args:
+      model: model class of the referenced object.
+      key: name of the unique attribute used for the lookup, e.g. "slug".
+      value: value of the key attribute.
+      column: block column containing values of the key attribute. All values
+        of the column are loaded on the first lookup.
+
+    Returns:
+      the matching object or None if it does not exist.
+    """
+    objects = self._objects[(model, key)]
+    values = self._prefetch("object", model, key, column)
+    self._load_objects(model, key, values, objects)
+    if _lookup_key(value) not in objects:
+      self._load_objects(model, key, [value], objects)
+    return objects[_lookup_key(value)]
+
+  @staticmethod
+  def _load_objects(model, key, values, objects):
+    """Load objects with given key values into the objects dict."""
+    values = {_lookup_key(value) for value in values}
+    values = [value for value in values if value not in objects]
+    if not values:
+      return
+    attr = getattr(model, key)
+    for chunk in _chunks(values):
+      for obj in model.query.filter(attr.in_(chunk)):
+        objects.setdefault(_lookup_key(getattr(obj, key)), obj)
+    for value in values:
+      objects.setdefault(value, None)
+
+  def get_ids(self, model, key, value, column=None):
+    """Get ids of all objects of the given model with key equal to value.
+
+    This is used for checking unique columns, where all objects with the same
+    value are needed and not just the first one.
+
+    Args:
+      model: model class of the checked objects.
+      key: name of the checked attribute.
+      value: value of the checked attribute.
+      column: block column containing values of the attribute. All values of
+        the column are loaded on the first lookup.
+
+    Returns:
+      set of ids of objects with the given value.
+    """
+    ids = self._ids[(model, key)]
+    values = self._prefetch("ids", model, key, column)
+    self._load_ids(model, key, values, ids)
+    if _lookup_key(value) not in ids:
+      self._load_ids(model, key, [value], ids)
+    return ids[_lookup_key(value)]
+
+  @staticmethod
+  def _load_ids(model, key, values, ids):
+    """Load ids of objects with given key values into the ids dict."""
+    values = {_lookup_key(value) for value in values}
+    values = [value for value in values if value not in ids]
+    if not values:
+      return
+    for value in values:
+      ids[value] = set()
+    attr = getattr(model, key)
+    for chunk in _chunks(values):
+      query = db.session.query(attr, model.id).filter(attr.in_(chunk))
+      for attr_value, id_ in query:
+        ids.setdefault(_lookup_key(attr_value), set()).add(id_)
+
+  def get_option(self, roles, title):
+    """Get option with the given title for any of the given roles.
+
+    All options are loaded with a single query on the first lookup.
+
+    Args:
+      roles: list of option roles that are allowed for the column.
+      title: title of the option.
+
+    Returns:
+      matching Option with the lowest id or None if there is no such option.
+    """
+    if self._options is None:
+      self._options = {}
+      for option in Option.query.order_by(Option.id):
+        self._options.setdefault(
+            (option.role, _lookup_key(option.title or "").lower()), option)
+    options = [self._options.get((role, _lookup_key(title).lower()))
+               for role in roles]
+    options = [option for option in options if option is not None]
+    if not options:
+      return None
+    return min(options, key=lambda option: option.id)
+
+  def get_categories(self, category_type, names):
+    """Get categories of the given type with any of the given names.
+
+    All categories of a type are loaded with a single query on the first
+    lookup.
+
+    Args:
+      category_type: type of CategoryBase objects, e.g. "ControlCategory".
+      names: list of category names.
+
+    Returns:
+      list of matching categories without duplicates.
+    """
+    if category_type not in self._categories:
+      by_name = structures.CaseInsensitiveDict()
+      query = CategoryBase.query.filter(CategoryBase.type == category_type)
+      for category in query:
+        by_name.setdefault(_lookup_key(category.name), []).append(category)
+      self._categories[category_type] = by_name
+    by_name = self._categories[category_type]
+    categories = []
+    for name in names:
+      for category in by_name.get(_lookup_key(name), []):
+        if category not in categories:
+          categories.append(category)
+    return categories
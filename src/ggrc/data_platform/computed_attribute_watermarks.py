@@ -0,0 +1,29 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Computed attribute watermarks module."""
+
+from ggrc import db
+
+
+class ComputedAttributeWatermarks(db.Model):
+  """Last revision processed by incremental computation of an attribute.
+
+  While partitions of a computation run in background tasks, the revision
+  they process is kept in pending_revision_id with the number of partitions
+  that are not computed yet.
+  """
+  # pylint: disable=too-few-public-methods
+  __tablename__ = 'computed_attribute_watermarks'
+
+  attribute_template_id = db.Column(
+      db.Integer,
+      db.ForeignKey('attribute_templates.attribute_template_id',
+                    ondelete='CASCADE'),
+      primary_key=True,
+      autoincrement=False,
+  )
+  revision_id = db.Column(db.Integer, nullable=True)
+  pending_revision_id = db.Column(db.Integer, nullable=True)
+  pending_partitions = db.Column(db.Integer, nullable=False, default=0)
+  updated_at = db.Column(db.DateTime, nullable=False)
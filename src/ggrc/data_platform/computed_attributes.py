@@ -23,13 +23,16 @@ import sqlalchemy as sa
 
 from ggrc import db
 from ggrc import login
-from ggrc.utils import revisions as revision_utils
+from ggrc import settings
+from ggrc.data_platform.computed_attribute_watermarks import \
+    ComputedAttributeWatermarks
+from ggrc.fulltext import sort_keys
 from ggrc.utils import benchmark
 from ggrc.models import all_models as models
 
-# Statement for inserting attribute values without explicit call of delete.
-ATTRIBUTE_REPLACE_STATEMENT = """
-  REPLACE INTO attributes (
+# Statement for upserting attribute values with a single multi row insert.
+ATTRIBUTE_UPSERT_STATEMENT = """
+  INSERT INTO attributes (
         object_type,
         object_id,
         source_type,
@@ -61,10 +64,19 @@ ATTRIBUTE_REPLACE_STATEMENT = """
       :created_by_id,
       :updated_by_id
   )
+  ON DUPLICATE KEY UPDATE
+      source_type = VALUES(source_type),
+      source_id = VALUES(source_id),
+      source_attr = VALUES(source_attr),
+      value_datetime = VALUES(value_datetime),
+      value_integer = VALUES(value_integer),
+      value_string = VALUES(value_string),
+      updated_at = VALUES(updated_at),
+      updated_by_id = VALUES(updated_by_id)
 """
 
-INDEX_REPLACE_STATEMENT = """
-  REPLACE INTO fulltext_record_properties (
+INDEX_UPSERT_STATEMENT = """
+  INSERT INTO fulltext_record_properties (
       `key`,
       `type`,
       `tags`,
@@ -82,6 +94,86 @@ INDEX_REPLACE_STATEMENT = """
       :context_id,
       :subproperty
   )
+  ON DUPLICATE KEY UPDATE
+      tags = VALUES(tags),
+      content = VALUES(content),
+      context_id = VALUES(context_id)
+"""
+
+# Statement for rebuilding full text records from stored computed values.
+INDEX_REBUILD_STATEMENT = """
+  INSERT INTO fulltext_record_properties (
+      `key`,
+      `type`,
+      `tags`,
+      `property`,
+      `content`,
+      `context_id`,
+      `subproperty`
+  )
+  SELECT
+      a.object_id,
+      a.object_type,
+      CONCAT_WS("-", s.parent_type, s.parent_id, s.child_type),
+      d.name,
+      COALESCE(
+          CAST(a.value_datetime AS CHAR),
+          NULLIF(a.value_string, ""),
+          CAST(a.value_integer AS CHAR),
+          ""
+      ),
+      NULL,
+      ""
+  FROM attributes AS a
+  JOIN attribute_definitions AS d
+      ON d.attribute_definition_id = a.attribute_definition_id
+  JOIN attribute_types AS t
+      ON t.attribute_type_id = d.attribute_type_id
+  LEFT JOIN snapshots AS s
+      ON a.object_type = "Snapshot" AND s.id = a.object_id
+  WHERE t.computed = 1
+  ON DUPLICATE KEY UPDATE
+      tags = VALUES(tags),
+      content = VALUES(content)
+"""
+
+WATERMARK_UPSERT_STATEMENT = """
+  INSERT INTO computed_attribute_watermarks (
+      attribute_template_id,
+      revision_id,
+      updated_at
+  )
+  VALUES (
+      :attribute_template_id,
+      :revision_id,
+      :updated_at
+  )
+  ON DUPLICATE KEY UPDATE
+      revision_id = VALUES(revision_id),
+      pending_revision_id = NULL,
+      pending_partitions = 0,
+      updated_at = VALUES(updated_at)
+"""
+
+# Statement for starting partitioned computation up to a revision, the
+# processed revision is kept until all partitions are computed.
+PENDING_WATERMARK_UPSERT_STATEMENT = """
+  INSERT INTO computed_attribute_watermarks (
+      attribute_template_id,
+      pending_revision_id,
+      pending_partitions,
+      updated_at
+  )
+  VALUES (
+      :attribute_template_id,
+      :revision_id,
+      :partitions,
+      :updated_at
+  )
+  ON DUPLICATE KEY UPDATE
+      pending_revision_id = VALUES(pending_revision_id),
+      pending_partitions = VALUES(pending_partitions),
+      updated_at = VALUES(updated_at)
 """
 
 
@@ -166,7 +258,7 @@ def _get_group_key(revision, aggregate_type, computed_object):
         revision.destination_type in related_snapshots):
     # computed source related to a snapshot of an object
     snap = snapshot_from_rel(revision)
-    if snap.child_type == computed_object:
+    if snap is not None and snap.child_type == computed_object:
       key = "related_snapshots"
   return key
 
@@ -559,24 +651,13 @@ def get_index_data(computed_values, snapshot_tag_map):
 def store_data(attributes_data, index_data):
   """Store new computed values to the database."""
   if attributes_data:
-    db.session.execute(ATTRIBUTE_REPLACE_STATEMENT, attributes_data)
+    db.session.execute(ATTRIBUTE_UPSERT_STATEMENT, attributes_data)
   if index_data:
-    db.session.execute(INDEX_REPLACE_STATEMENT, index_data)
+    db.session.execute(INDEX_UPSERT_STATEMENT, index_data)
+    sort_keys.refresh_pairs((row["type"], row["key"]) for row in index_data)
   db.session.commit()
 
 
-def get_all_latest_revisions_ids():
-  """Get latest revisions for aggregate objects."""
-  with benchmark("Get all latest revision ids"):
-    attributes = get_computed_attributes()
-    revision_ids = []
-    for attribute in attributes:
-      aggregate_type = get_aggregate_type(attribute)
-      revisions = revision_utils._get_revisions_by_type(aggregate_type)
-      revision_ids.extend(revisions.values())
-    return revision_ids
-
-
 def delete_all_computed_values():
   """Remove all attribute values for computed attributes."""
   with benchmark("Delete all computed attribute values"):
@@ -586,11 +667,247 @@ def delete_all_computed_values():
     ).delete()
 
 
+def get_input_types(attribute):
+  """Get resource types of revisions that can change attribute values."""
+  return {
+      get_aggregate_type(attribute),
+      attribute.object_template.name,
+      "Snapshot",
+      "Relationship",
+  }
+
+
+def get_watermarks(attributes):
+  """Get ids of last processed revisions of the given attributes."""
+  if not attributes:
+    return {}
+  watermark = ComputedAttributeWatermarks
+  return dict(db.session.query(
+      watermark.attribute_template_id,
+      watermark.revision_id,
+  ).filter(
+      watermark.attribute_template_id.in_(
+          attr.attribute_template_id for attr in attributes)
+  ))
+
+
+def store_watermarks(attributes, revision_id):
+  """Mark all revisions up to revision_id as processed for attributes."""
+  if not attributes or revision_id is None:
+    return
+  now = datetime.datetime.now()
+  db.session.execute(WATERMARK_UPSERT_STATEMENT, [{
+      "attribute_template_id": attr.attribute_template_id,
+      "revision_id": revision_id,
+      "updated_at": now,
+  } for attr in attributes])
+  db.session.commit()
+
+
+def start_watermarks(attributes, partitions, revision_id):
+  """Store revision_id as pending until all partitions are computed.
+
+  Watermarks of attributes without any partitions are stored right away.
+
+  Args:
+    attributes: computed attribute templates.
+    partitions: list of (attribute, object type, ids) tuples of the
+      attributes, see get_partitions.
+    revision_id: id of the last revision processed by the partitions.
+  """
+  counts = collections.Counter(attr for attr, _, _ in partitions)
+  store_watermarks([attr for attr in attributes if not counts[attr]],
+                   revision_id)
+  if not counts:
+    return
+  now = datetime.datetime.now()
+  db.session.execute(PENDING_WATERMARK_UPSERT_STATEMENT, [{
+      "attribute_template_id": attr.attribute_template_id,
+      "revision_id": revision_id,
+      "partitions": count,
+      "updated_at": now,
+  } for attr, count in counts.iteritems()])
+  db.session.commit()
+
+
+def complete_partition(attribute, revision_id):
+  """Store the pending watermark if the last partition was computed.
+
+  A pending watermark of a failed partition is never stored, so the next
+  "all_latest" run processes the same revisions again.
+
+  Args:
+    attribute: computed attribute template of the partition.
+    revision_id: pending revision id the partition was started with.
+  """
+  watermark = ComputedAttributeWatermarks.__table__
+  condition = sa.and_(
+      watermark.c.attribute_template_id == attribute.attribute_template_id,
+      watermark.c.pending_revision_id == revision_id,
+  )
+  # the first update locks the row, so only the last partition sees zero
+  db.session.execute(watermark.update().where(sa.and_(
+      condition,
+      watermark.c.pending_partitions > 0,
+  )).values(pending_partitions=watermark.c.pending_partitions - 1))
+  db.session.execute(watermark.update().where(sa.and_(
+      condition,
+      watermark.c.pending_partitions == 0,
+  )).values(
+      revision_id=watermark.c.pending_revision_id,
+      pending_revision_id=None,
+      updated_at=datetime.datetime.now(),
+  ))
+  db.session.commit()
+
+
+def reset_watermarks():
+  """Force computation of all values on the next "all_latest" run."""
+  db.session.query(ComputedAttributeWatermarks).delete()
+  db.session.commit()
+
+
+def get_changed_revision_ids(attribute, watermark):
+  """Get ids of revisions that changed inputs of an attribute.
+
+  Args:
+    attribute: computed attribute template.
+    watermark: id of the last processed revision or None if the attribute has
+      never been computed incrementally.
+
+  Returns:
+    query of ids of revisions of attribute inputs created after the
+    watermark, or of ids of latest revisions of all aggregate objects if there
+    is no watermark.
+  """
+  revision = models.Revision
+  if watermark is None:
+    return db.session.query(sa.func.max(revision.id)).filter(
+        revision.resource_type == get_aggregate_type(attribute),
+    ).group_by(revision.resource_id)
+  return db.session.query(revision.id).filter(
+      revision.id > watermark,
+      revision.resource_type.in_(get_input_types(attribute)),
+  )
+
+
+def get_changed_objects(attributes):
+  """Get objects with attribute inputs changed since the watermarks."""
+  watermarks = get_watermarks(attributes)
+  affected_objects = {}
+  for attr in attributes:
+    revision_ids = get_changed_revision_ids(
+        attr, watermarks.get(attr.attribute_template_id))
+    revisions = models.Revision.query.filter(
+        models.Revision.id.in_(revision_ids.subquery()))
+    attribute_groups = group_revisions([attr], revisions)
+    affected_objects.update(get_affected_objects(attribute_groups))
+  return affected_objects
+
+
+def get_partitions(affected_objects, size):
+  """Split affected objects into partitions.
+
+  Args:
+    affected_objects: dict with sets of (type, id) tuples for attributes.
+    size: maximal number of objects in a partition.
+
+  Yields:
+    (attribute, object type, sorted ids) tuples, where ids of the same type
+    are split into consecutive id ranges.
+  """
+  for attr, objects in affected_objects.iteritems():
+    ids_by_type = collections.defaultdict(list)
+    for object_type, object_id in objects:
+      ids_by_type[object_type].append(object_id)
+    for object_type, ids in sorted(ids_by_type.iteritems()):
+      ids.sort()
+      for start in range(0, len(ids), size):
+        yield attr, object_type, ids[start:start + size]
+
+
+def compute_partition(attribute, object_type, ids):
+  """Compute and store values of an attribute for objects of one type."""
+  affected_objects = {attribute: {(object_type, id_) for id_ in ids}}
+  with benchmark("Get all relationships for these computed objects"):
+    relationships = get_relationships(affected_objects)
+  with benchmark("Get snapshot data"):
+    snapshot_map, snapshot_tag_map = get_snapshot_data(affected_objects)
+  with benchmark("Compute values"):
+    computed_values = compute_values(affected_objects, relationships,
+                                     snapshot_map)
+  with benchmark("Get computed attributes data"):
+    attributes_data = get_attributes_data(computed_values)
+  with benchmark("Get computed attribute full-text index data"):
+    index_data = get_index_data(computed_values, snapshot_tag_map)
+  with benchmark("Store attribute data and full-text index data"):
+    store_data(attributes_data, index_data)
+
+
+def process_partition(parameters):
+  """Compute a partition scheduled by compute_attributes.
+
+  Args:
+    parameters: dict with attribute_template_id, object_type, ids and the
+      pending watermark revision id or None.
+  """
+  with benchmark("Compute attributes partition"):
+    attribute = models.AttributeTemplates.query.get(
+        parameters["attribute_template_id"])
+    if attribute is None:
+      return
+    compute_partition(attribute, parameters["object_type"],
+                      parameters["ids"])
+    if parameters.get("watermark") is not None:
+      complete_partition(attribute, parameters["watermark"])
+
+
+def _run_partitions(partitions, size, attributes=(), watermark=None):
+  """Compute partitions in parallel background tasks if they are large.
+
+  If watermark is set, it is stored for attributes once all of their
+  partitions are computed.
+  """
+  from ggrc import views
+  from ggrc.models.background_task import get_task_backend
+  total = sum(len(ids) for _, _, ids in partitions)
+  if total > size and get_task_backend() != "sync":
+    if watermark is not None:
+      start_watermarks(attributes, partitions, watermark)
+    for attribute, object_type, ids in partitions:
+      views.start_compute_partition(
+          attribute_template_id=attribute.attribute_template_id,
+          object_type=object_type,
+          ids=ids,
+          watermark=watermark,
+      )
+    return
+  for attribute, object_type, ids in partitions:
+    compute_partition(attribute, object_type, ids)
+  store_watermarks(attributes, watermark)
+
+
+def reindex_values():
+  """Rebuild full text records of all stored computed values."""
+  with benchmark("Rebuild computed attribute full-text index data"):
+    db.session.execute(INDEX_REBUILD_STATEMENT)
+    sort_keys.refresh_pairs(db.session.query(
+        models.Attributes.object_type,
+        models.Attributes.object_id,
+    ).distinct().all())
+    db.session.commit()
+
+
 def compute_attributes(revision_ids):
   """Compute new values based an changed objects.
 
+  Affected objects are split into partitions by attribute, object type and id
+  range. With an asynchronous task backend, multiple partitions are computed
+  by parallel background tasks.
+
   Args:
-    objects: array of object stubs of modified objects.
+    revision_ids: ids of new revisions or "all_latest" for all revisions
+      created since the last "all_latest" run of each attribute.
   """
 
   with benchmark("Compute attributes"):
@@ -598,32 +915,24 @@ def compute_attributes(revision_ids):
     if not revision_ids:
       return
 
-    with benchmark("Get revisions."):
-      if revision_ids == "all_latest":
-        revision_ids = get_all_latest_revisions_ids()
-
-      revisions = models.Revision.query.filter(
-          models.Revision.id.in_(revision_ids))
-
     with benchmark("Get all computed attributes"):
       attributes = get_computed_attributes()
 
-    with benchmark("Group revisions by computed attributes"):
-      attribute_groups = group_revisions(attributes, revisions)
-    with benchmark("get all objects affected by computed attributes"):
-      affected_objects = get_affected_objects(attribute_groups)
-    with benchmark("Get all relationships for these computed objects"):
-      relationships = get_relationships(affected_objects)
-    with benchmark("Get snapshot data"):
-      snapshot_map, snapshot_tag_map = get_snapshot_data(affected_objects)
-
-    with benchmark("Compute values"):
-      computed_values = compute_values(affected_objects, relationships,
-                                       snapshot_map)
-
-    with benchmark("Get computed attributes data"):
-      attributes_data = get_attributes_data(computed_values)
-    with benchmark("Get computed attribute full-text index data"):
-      index_data = get_index_data(computed_values, snapshot_tag_map)
-    with benchmark("Store attribute data and full-text index data"):
-      store_data(attributes_data, index_data)
+    last_revision_id = None
+    if revision_ids == "all_latest":
+      last_revision_id = db.session.query(
+          sa.func.max(models.Revision.id)).scalar()
+      with benchmark("Get objects with changed inputs"):
+        affected_objects = get_changed_objects(attributes)
+    else:
+      with benchmark("Get revisions."):
+        revisions = models.Revision.query.filter(
+            models.Revision.id.in_(revision_ids))
+      with benchmark("Group revisions by computed attributes"):
+        attribute_groups = group_revisions(attributes, revisions)
+      with benchmark("get all objects affected by computed attributes"):
+        affected_objects = get_affected_objects(attribute_groups)
+
+    size = settings.COMPUTED_ATTRIBUTES_PARTITION_SIZE
+    _run_partitions(list(get_partitions(affected_objects, size)), size,
+                    attributes, last_revision_id)
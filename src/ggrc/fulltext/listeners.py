@@ -17,6 +17,15 @@ ACTIONS = ['after_insert', 'after_delete', 'after_update']
 
 def _runner(mapper, content, target):  # pylint:disable=unused-argument
   """Collect all reindex models in session"""
+  mark_for_reindex(target)
+
+
+def mark_for_reindex(target):
+  """Add target and objects indexed by its rules to the session reindex set.
+
+  Objects written with raw statements are not seen by mapper events, so bulk
+  operations have to mark them explicitly.
+  """
   ggrc_indexer = fulltext.get_indexer()
   db.session.reindex_set = getattr(db.session, "reindex_set", set())
   getters = ggrc_indexer.indexer_rules.get(target.__class__.__name__) or []
@@ -10,6 +10,7 @@ from sqlalchemy import inspect, orm
 from ggrc import db
 
 from ggrc import fulltext
+from ggrc.fulltext import sort_keys
 
 
 ReindexRule = namedtuple("ReindexRule", ["model", "rule"])
@@ -63,6 +64,7 @@ class Indexed(object):
     for query in [delete_query, insert_query]:
       if query is not None:
         db.session.execute(query)
+    sort_keys.refresh(cls.__name__, ids)
 
   @classmethod
   def indexed_query(cls):
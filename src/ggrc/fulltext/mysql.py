@@ -20,8 +20,8 @@ from ggrc.login import is_creator
 from ggrc.models import all_models
 from ggrc.models.inflector import get_model
 from ggrc.query import my_objects
-from ggrc.rbac import context_query_filter
-from ggrc.rbac import permissions
+from ggrc.rbac import user_access
+from ggrc.fulltext import outbox
 from ggrc.fulltext.sql import SqlIndexer
 
 
@@ -70,20 +70,16 @@ class MysqlIndexer(SqlIndexer):
     """
     type_queries = []
     for model_name in model_names:
-      contexts, resources = permissions.get_context_resource(
-          model_name=model_name,
-          permission_type=permission_type,
-          permission_model=permission_model
-      )
-      statement = and_(
+      type_queries.append(and_(
           MysqlRecordProperty.type == model_name,
-          context_query_filter(MysqlRecordProperty.context_id, contexts)
-      )
-      if resources:
-        statement = or_(and_(MysqlRecordProperty.type == model_name,
-                             MysqlRecordProperty.key.in_(resources)),
-                        statement)
-      type_queries.append(statement)
+          user_access.permission_filter(
+              model_name,
+              MysqlRecordProperty.context_id,
+              MysqlRecordProperty.key,
+              permission_type=permission_type,
+              permission_model=permission_model,
+          ),
+      ))
 
     return and_(
         MysqlRecordProperty.type.in_(model_names),
@@ -227,7 +223,11 @@ Indexer = MysqlIndexer
 def update_indexer(session):  # pylint:disable=unused-argument
   """General function to update index
 
-  for all updated related instance before commit"""
+  for all updated related instance before commit.
+
+  If asynchronous indexing is enabled, changed objects are only stored in the
+  fulltext index outbox and indexed later by the outbox drain job.
+  """
   models_ids_to_reindex = defaultdict(set)
   db.session.flush()
   for for_index in getattr(db.session, 'reindex_set', set()):
@@ -236,8 +236,15 @@ def update_indexer(session):  # pylint:disable=unused-argument
     type_name, id_value = for_index.get_reindex_pair()
     if type_name:
       models_ids_to_reindex[type_name].add(id_value)
-  db.session.expire_all()  # expire required to fix declared_attr cached value
   db.session.reindex_set = set()
+  if outbox.is_enabled():
+    outbox.enqueue(
+        (model_name, id_value)
+        for model_name, ids in models_ids_to_reindex.iteritems()
+        for id_value in ids
+    )
+    return
+  db.session.expire_all()  # expire required to fix declared_attr cached value
   for model_name, ids in models_ids_to_reindex.iteritems():
     get_model(model_name).bulk_record_update_for(ids)
 
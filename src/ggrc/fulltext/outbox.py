@@ -0,0 +1,192 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Transactional outbox for asynchronous fulltext indexing.
+
+If FULLTEXT_INDEX_ASYNC is enabled, committing a write only stores (type, key)
+pairs of changed objects in the fulltext_index_outbox table, in the same
+transaction as the change itself. The drain job then rebuilds fulltext
+records of the stored objects in batches.
+
+Repeated changes of a pending object are coalesced into a single row, only
+its version is increased. A row is removed after indexing only if its version
+did not change in the meantime, so changes committed during indexing are not
+lost.
+"""
+
+import datetime
+from collections import defaultdict
+from logging import getLogger
+from multiprocessing.pool import ThreadPool
+
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import declared_attr
+
+from ggrc import db
+from ggrc import settings
+from ggrc.models.inflector import get_model
+from ggrc.utils import benchmark
+
+
+# pylint: disable=invalid-name
+logger = getLogger(__name__)
+
+
+# pylint: disable=too-few-public-methods
+class FulltextIndexOutbox(db.Model):
+  """Db model for objects waiting for fulltext index update."""
+  __tablename__ = "fulltext_index_outbox"
+
+  type = db.Column(db.String(64), primary_key=True)
+  key = db.Column(db.Integer, primary_key=True, autoincrement=False)
+  version = db.Column(db.Integer, nullable=False, default=1)
+  created_at = db.Column(db.DateTime, nullable=False)
+
+  @declared_attr
+  def __table_args__(cls):  # pylint: disable=no-self-argument
+    return (
+        db.Index("ix_{}_created_at".format(cls.__tablename__), "created_at"),
+    )
+
+
+_ENQUEUE_SQL = sa.text("""
+    INSERT INTO fulltext_index_outbox (type, `key`, version, created_at)
+    VALUES (:type, :key, 1, :created_at)
+    ON DUPLICATE KEY UPDATE version = version + 1
+""")
+
+
+def is_enabled():
+  return getattr(settings, "FULLTEXT_INDEX_ASYNC", False)
+
+
+def enqueue(pairs):
+  """Store objects that need reindexing in the outbox.
+
+  This function does not commit, rows are stored in the current transaction.
+
+  Args:
+    pairs: iterable of (type, id) tuples of changed objects.
+  """
+  now = datetime.datetime.now()
+  params = [{"type": type_, "key": key, "created_at": now}
+            for type_, key in pairs]
+  if params:
+    db.session.execute(_ENQUEUE_SQL, params)
+
+
+def get_stats():
+  """Get outbox lag metrics.
+
+  Returns:
+    dict with number of pending objects and age of the oldest pending entry
+    in seconds.
+  """
+  table = FulltextIndexOutbox.__table__
+  count, oldest = db.session.execute(sa.select([
+      sa.func.count(),
+      sa.func.min(table.c.created_at),
+  ]).select_from(table)).first()
+  lag = 0
+  if oldest:
+    lag = (datetime.datetime.now() - oldest).total_seconds()
+  return {"pending": count, "lag_seconds": lag}
+
+
+def _index_batch(rows):
+  """Rebuild fulltext records for a batch of outbox rows and remove them."""
+  ids_by_type = defaultdict(set)
+  for type_, key, _ in rows:
+    ids_by_type[type_].add(key)
+  for type_, ids in ids_by_type.iteritems():
+    model = get_model(type_)
+    if model is None:
+      logger.warning("Skipping fulltext index update for unknown type %s",
+                     type_)
+      continue
+    model.bulk_record_update_for(ids)
+
+  table = FulltextIndexOutbox.__table__
+  db.session.execute(table.delete().where(sa.and_(
+      table.c.type == sa.bindparam("row_type"),
+      table.c.key == sa.bindparam("row_key"),
+      table.c.version == sa.bindparam("row_version"),
+  )), [
+      {"row_type": type_, "row_key": key, "row_version": version}
+      for type_, key, version in rows
+  ])
+  db.session.commit()
+
+
+def _drain_partition(partition, partitions, batch_size):
+  """Index all outbox rows with key in the given partition.
+
+  Returns:
+    number of processed outbox rows.
+  """
+  table = FulltextIndexOutbox.__table__
+  query = sa.select([table.c.type, table.c.key, table.c.version]).order_by(
+      table.c.created_at,
+  ).limit(batch_size)
+  if partitions > 1:
+    query = query.where(table.c.key % partitions == partition)
+
+  processed = 0
+  while True:
+    rows = db.session.execute(query).fetchall()
+    if not rows:
+      return processed
+    with benchmark("Index fulltext outbox batch"):
+      _index_batch(rows)
+    processed += len(rows)
+
+
+def _drain_partition_in_context(args):
+  """Drain an outbox partition in a worker thread."""
+  from ggrc.app import app
+  with app.app_context():
+    try:
+      return _drain_partition(*args)
+    finally:
+      db.session.remove()
+
+
+def drain(batch_size=None, workers=None):
+  """Index all objects stored in the outbox.
+
+  Outbox rows are split into partitions by object id, so that workers never
+  index the same object and don't compete for the same rows.
+
+  Args:
+    batch_size: number of outbox rows indexed in a single transaction.
+    workers: number of worker threads.
+
+  Returns:
+    number of processed outbox rows.
+  """
+  if batch_size is None:
+    batch_size = getattr(settings, "FULLTEXT_OUTBOX_BATCH_SIZE", 500)
+  if workers is None:
+    workers = getattr(settings, "FULLTEXT_OUTBOX_WORKERS", 1)
+
+  stats = get_stats()
+  if not stats["pending"]:
+    return 0
+  logger.info("Fulltext index outbox: %(pending)s pending objects, "
+              "lag %(lag_seconds).1f seconds", stats)
+
+  with benchmark("Drain fulltext index outbox"):
+    if workers <= 1:
+      processed = _drain_partition(0, 1, batch_size)
+    else:
+      db.session.commit()
+      pool = ThreadPool(workers)
+      try:
+        processed = sum(pool.map(_drain_partition_in_context, [
+            (partition, workers, batch_size)
+            for partition in range(workers)
+        ]))
+      finally:
+        pool.terminate()
+  logger.info("Fulltext index outbox: indexed %s objects", processed)
+  return processed
@@ -0,0 +1,195 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Typed sort keys of full text index properties.
+
+Sorting by custom attributes and other indexed properties used to order by
+the TEXT content of fulltext_record_properties, so numbers and dates were
+sorted lexically. For every sortable full text record (one with an empty or
+"__sort__" subproperty) the fulltext_sort_keys table keeps its content parsed
+as a number and as a date together with a prefix of the text. Ordering uses
+these typed columns, which are covered by a single composite index.
+
+Sort keys are derived from full text records, so every code path that writes
+full text records refreshes sort keys of the affected objects with `refresh`
+and every path that removes records calls `delete`.
+"""
+
+import datetime
+import re
+from collections import defaultdict
+
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.sql import column
+from sqlalchemy.sql import table
+
+from ggrc import db
+
+
+TEXT_LENGTH = 250
+
+CHUNK_SIZE = 1000
+
+SORTABLE_SUBPROPERTIES = (u"__sort__", u"")
+
+_NUMBER_RE = re.compile(r"^-?\d{1,30}(\.\d{1,30})?$")
+
+# Accepted date formats with lengths of the date part of the content.
+_DATE_FORMATS = (
+    ("%Y-%m-%d %H:%M:%S", 19),
+    ("%Y-%m-%dT%H:%M:%S", 19),
+    ("%Y-%m-%d", 10),
+    ("%m/%d/%Y", 10),
+)
+
+_RECORDS = table(
+    "fulltext_record_properties",
+    column("key"),
+    column("type"),
+    column("property"),
+    column("subproperty"),
+    column("content"),
+)
+
+
+# pylint: disable=too-few-public-methods
+class FulltextSortKey(db.Model):
+  """Db model for typed sort values of full text index properties."""
+  __tablename__ = "fulltext_sort_keys"
+
+  key = db.Column(db.Integer, primary_key=True, autoincrement=False)
+  type = db.Column(db.String(64), primary_key=True)
+  property = db.Column(db.String(250), primary_key=True)
+  value_num = db.Column(db.Float(precision=53))
+  value_date = db.Column(db.DateTime)
+  value_text = db.Column(db.String(TEXT_LENGTH), nullable=False, default=u"")
+
+  @declared_attr
+  def __table_args__(cls):  # pylint: disable=no-self-argument
+    return (
+        db.Index(
+            "ix_{}_value".format(cls.__tablename__),
+            "type", "property", "value_num", "value_date", "value_text",
+        ),
+    )
+
+
+def order_columns(sort_key):
+  """Get ordering columns of a FulltextSortKey entity or alias."""
+  return [sort_key.value_num, sort_key.value_date, sort_key.value_text]
+
+
+def _parse_date(content):
+  """Parse a date or datetime from the start of the content."""
+  for date_format, length in _DATE_FORMATS:
+    if len(content) > length and content[length] not in u".+Z":
+      continue
+    try:
+      value = datetime.datetime.strptime(content[:length], date_format)
+    except ValueError:
+      continue
+    if value.year >= 1000:
+      return value
+  return None
+
+
+def get_sort_values(content):
+  """Get typed sort values for content of a full text record.
+
+  Returns:
+    tuple with the content as a number, as a datetime and as a text, the
+    number and the datetime are None if the content can not be parsed.
+  """
+  content = (content or u"").strip()
+  number = float(content) if _NUMBER_RE.match(content) else None
+  return number, _parse_date(content), content[:TEXT_LENGTH]
+
+
+def build_rows(type_, records):
+  """Build sort key rows for full text records of a single type.
+
+  Args:
+    type_: type of indexed objects.
+    records: iterable of (key, property, subproperty, content) tuples, a
+      "__sort__" subproperty takes precedence over an empty one.
+
+  Returns:
+    list of dicts with values of fulltext_sort_keys columns.
+  """
+  contents = {}
+  for key, property_, subproperty, content in records:
+    if subproperty == u"__sort__" or (key, property_) not in contents:
+      contents[(key, property_)] = content
+  rows = []
+  for (key, property_), content in contents.iteritems():
+    number, date, text = get_sort_values(content)
+    rows.append({
+        "key": key,
+        "type": type_,
+        "property": property_,
+        "value_num": number,
+        "value_date": date,
+        "value_text": text,
+    })
+  return rows
+
+
+def _chunks(values):
+  values = sorted(values)
+  for start in range(0, len(values), CHUNK_SIZE):
+    yield values[start:start + CHUNK_SIZE]
+
+
+def delete(type_=None, keys=None):
+  """Delete sort keys of objects.
+
+  Args:
+    type_: type of objects, sort keys of all types are deleted if None.
+    keys: ids of objects, all objects of the type are affected if None.
+  """
+  sort_key = FulltextSortKey.__table__
+  query = sort_key.delete()
+  if type_ is not None:
+    query = query.where(sort_key.c.type == type_)
+  if keys is None:
+    db.session.execute(query)
+    return
+  for chunk in _chunks(set(keys)):
+    db.session.execute(query.where(sort_key.c.key.in_(chunk)))
+
+
+def refresh(type_, keys):
+  """Rebuild sort keys of objects from their full text records.
+
+  This function does not commit, sort keys are stored in the current
+  transaction.
+  """
+  sort_key = FulltextSortKey.__table__
+  for chunk in _chunks(set(keys)):
+    db.session.execute(sort_key.delete().where(sa.and_(
+        sort_key.c.type == type_,
+        sort_key.c.key.in_(chunk),
+    )))
+    records = db.session.execute(sa.select([
+        _RECORDS.c.key,
+        _RECORDS.c.property,
+        _RECORDS.c.subproperty,
+        _RECORDS.c.content,
+    ]).where(sa.and_(
+        _RECORDS.c.type == type_,
+        _RECORDS.c.key.in_(chunk),
+        _RECORDS.c.subproperty.in_(SORTABLE_SUBPROPERTIES),
+    )))
+    rows = build_rows(type_, records)
+    if rows:
+      db.session.execute(sort_key.insert(), rows)
+
+
+def refresh_pairs(pairs):
+  """Rebuild sort keys of objects given by (type, id) pairs."""
+  keys_by_type = defaultdict(set)
+  for type_, key in pairs:
+    keys_by_type[type_].add(key)
+  for type_, keys in keys_by_type.iteritems():
+    refresh(type_, keys)
@@ -6,6 +6,7 @@
 from collections import defaultdict
 
 from ggrc import db
+from ggrc.fulltext import sort_keys
 
 
 class SqlIndexer(object):
@@ -57,6 +58,8 @@ class SqlIndexer(object):
     """Create records in db."""
     for db_record in self.records_generator(record):
       db.session.add(db_record)
+    db.session.flush()
+    sort_keys.refresh(record.type, [record.key])
     if commit:
       db.session.commit()
 
@@ -77,6 +80,7 @@ class SqlIndexer(object):
     db.session.query(self.record_type).filter(
         self.record_type.key == key,
         self.record_type.type == type).delete()
+    sort_keys.delete(type, [key])
     if commit:
       db.session.commit()
 
@@ -92,12 +96,14 @@ class SqlIndexer(object):
     ).delete(
         synchronize_session="fetch"
     )
+    sort_keys.delete(type, keys)
     if commit:
       db.session.commit()
 
   def delete_all_records(self, commit=True):
     """Clear index table."""
     db.session.query(self.record_type).delete()
+    sort_keys.delete()
     if commit:
       db.session.commit()
 
@@ -105,5 +111,6 @@ class SqlIndexer(object):
     """Delete values from index table for selected type."""
     db.session.query(self.record_type).filter(
         self.record_type.type == type).delete()
+    sort_keys.delete(type)
     if commit:
       db.session.commit()
@@ -3,6 +3,8 @@
 
 """File action utitlities for GDrive module"""
 
+import csv
+import itertools
 from StringIO import StringIO
 
 from apiclient import discovery
@@ -13,7 +15,7 @@ from werkzeug.exceptions import (
     BadRequest, NotFound, InternalServerError, Unauthorized
 )
 
-from ggrc.converters.import_helper import read_csv_file
+from ggrc.converters.import_helper import csv_reader
 from ggrc.gdrive import get_http_auth
 
 
@@ -47,10 +49,16 @@ def get_gdrive_file(file_data):
     else:
       file_data = drive_service.files().export_media(
           fileId=file_data['id'], mimeType='text/csv').execute()
-    csv_data = read_csv_file(StringIO(file_data))
+    # rows are parsed lazily while the import splits them into blocks, the
+    # first row is read here to reject files that are not valid csv, errors
+    # in later rows are handled where the rows are consumed
+    rows = csv_reader(StringIO(file_data))
+    csv_data = itertools.chain(list(itertools.islice(rows, 1)), rows)
   except AttributeError:
     # when file_data has no splitlines() method
     raise BadRequest("Wrong file format.")
+  except (csv.Error, UnicodeDecodeError):
+    raise BadRequest("Wrong file format.")
   except HttpError as e:
     message = json.loads(e.content).get("error").get("message")
     if e.resp.status == 404:
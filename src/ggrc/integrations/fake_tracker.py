@@ -0,0 +1,131 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""In-process fake of the issue tracker API of the integration service.
+
+The fake replaces urlfetch.fetch used by integration clients, so issue
+tracker code can be tested and load tested offline. It keeps issues in
+memory, can simulate latency and failures of single issues, and records
+requests together with the highest number of concurrent requests.
+
+Usage:
+  tracker = FakeIssueTracker(latency=0.05)
+  with tracker.install():
+    synchronization.update_issues(updates)
+  tracker.max_concurrency
+"""
+
+import contextlib
+import json
+import re
+import threading
+import time
+import urlparse
+
+from ggrc.integrations import client
+
+
+_ISSUE_PATH = re.compile(r'^/api/issues(?:/(?P<issue_id>\d+))?$')
+
+
+class FakeResponse(object):
+  """Response with the attributes of urlfetch responses."""
+  # pylint: disable=too-few-public-methods
+
+  def __init__(self, status_code, content):
+    self.status_code = status_code
+    self.content = content
+
+
+class FakeIssueTracker(object):
+  """Fake issue tracker service.
+
+  Attributes:
+    issues: dict of issue dicts by issue id.
+    requests: list of (method, path) tuples of received requests.
+    failures: dict with lists of status codes returned for an issue id
+      before requests for that issue succeed.
+    latency: number of seconds every request takes.
+    max_concurrency: highest number of requests processed at once.
+  """
+  # pylint: disable=too-many-instance-attributes
+
+  def __init__(self, latency=0, failures=None):
+    self.issues = {}
+    self.requests = []
+    self.failures = failures or {}
+    self.latency = latency
+    self.max_concurrency = 0
+    self._concurrency = 0
+    self._next_id = 1
+    self._lock = threading.Lock()
+
+  def _enter(self, method, path):
+    with self._lock:
+      self.requests.append((method, path))
+      self._concurrency += 1
+      self.max_concurrency = max(self.max_concurrency, self._concurrency)
+
+  def _exit(self):
+    with self._lock:
+      self._concurrency -= 1
+
+  def _pop_failure(self, issue_id):
+    """Get the next simulated failure status of an issue."""
+    with self._lock:
+      statuses = self.failures.get(issue_id)
+      if statuses:
+        return statuses.pop(0)
+    return None
+
+  def _handle(self, method, issue_id, payload):
+    """Get status and content of a response."""
+    if issue_id is None:
+      if method != client.urlfetch.POST:
+        return 405, 'Method not allowed'
+      with self._lock:
+        issue_id = self._next_id
+        self._next_id += 1
+        self.issues[issue_id] = dict(payload, issueId=issue_id)
+      return 200, json.dumps(self.issues[issue_id])
+
+    failure = self._pop_failure(issue_id)
+    if failure:
+      return failure, 'Simulated failure'
+    with self._lock:
+      if method == client.urlfetch.PUT:
+        self.issues.setdefault(issue_id, {'issueId': issue_id})
+        self.issues[issue_id].update(payload)
+      elif issue_id not in self.issues:
+        return 404, 'Not found'
+      return 200, json.dumps(self.issues[issue_id])
+
+  def fetch(self, url, method=client.urlfetch.GET, payload=None, **_):
+    """Handle a request instead of urlfetch.fetch."""
+    path = urlparse.urlparse(url).path
+    self._enter(method, path)
+    try:
+      if self.latency:
+        time.sleep(self.latency)
+      match = _ISSUE_PATH.match(path)
+      if not match:
+        return FakeResponse(404, 'Not found')
+      issue_id = match.group('issue_id')
+      status, content = self._handle(
+          method,
+          int(issue_id) if issue_id else None,
+          json.loads(payload) if payload else {},
+      )
+      return FakeResponse(status, content)
+    finally:
+      self._exit()
+
+  @contextlib.contextmanager
+  def install(self):
+    """Route integration service requests to this fake."""
+    original_fetch = client.urlfetch.fetch
+    client.urlfetch.fetch = self.fetch
+    try:
+      yield self
+    finally:
+      client.urlfetch.fetch = original_fetch
@@ -0,0 +1,158 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Concurrent synchronization of issues with the issue tracker.
+
+Updates are sent by a bounded pool of threads. All threads share a token
+bucket, so the integration service never gets more than
+ISSUE_TRACKER_SYNC_RATE requests per second. Requests failing with throttling
+or server errors are retried with exponential backoff and full jitter, and
+the outcome of every issue is returned to the caller.
+"""
+
+import collections
+import logging
+import random
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+from ggrc import settings
+from ggrc.integrations import integrations_errors
+from ggrc.integrations import issues
+
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+SyncResult = collections.namedtuple(
+    'SyncResult', ['issue_id', 'success', 'attempts', 'error'])
+
+
+class TokenBucket(object):
+  """Thread safe token bucket rate limiter.
+
+  Attributes:
+    rate: number of tokens added per second, 0 disables limiting.
+    capacity: maximal number of tokens available for bursts.
+  """
+  # pylint: disable=too-few-public-methods
+
+  def __init__(self, rate, capacity=None, clock=time.time, sleep=time.sleep):
+    self.rate = float(rate)
+    self.capacity = capacity or max(rate, 1)
+    self._tokens = self.capacity
+    self._clock = clock
+    self._sleep = sleep
+    self._updated_at = clock()
+    self._lock = threading.Lock()
+
+  def _reserve(self):
+    """Take a token and get number of seconds to wait until it is valid."""
+    with self._lock:
+      now = self._clock()
+      self._tokens = min(
+          self.capacity,
+          self._tokens + (now - self._updated_at) * self.rate,
+      )
+      self._updated_at = now
+      self._tokens -= 1
+      if self._tokens >= 0:
+        return 0
+      return -self._tokens / self.rate
+
+  def acquire(self):
+    """Block until a request can be sent."""
+    if not self.rate:
+      return
+    delay = self._reserve()
+    if delay:
+      self._sleep(delay)
+
+
+def get_retry_delay(attempt, base_delay):
+  """Get randomized delay before the next attempt with full jitter."""
+  return random.uniform(0, base_delay * 2 ** attempt)
+
+
+def _is_retryable(error):
+  return (isinstance(error, integrations_errors.HttpError) and
+          error.status in RETRY_STATUSES)
+
+
+def call_with_retries(func, bucket, retries, base_delay):
+  """Call func respecting the rate limit and retrying transient errors.
+
+  Args:
+    func: callable sending a single request.
+    bucket: TokenBucket shared by all concurrent calls.
+    retries: number of retries after the first failed attempt.
+    base_delay: base of the exponential backoff in seconds.
+
+  Returns:
+    tuple with the number of attempts and the error of the last attempt or
+    None on success.
+  """
+  attempt = 0
+  while True:
+    attempt += 1
+    bucket.acquire()
+    try:
+      func()
+      return attempt, None
+    except integrations_errors.Error as error:
+      if attempt > retries or not _is_retryable(error):
+        return attempt, error
+      time.sleep(get_retry_delay(attempt - 1, base_delay))
+
+
+def update_issues(updates, client=None, workers=None, rate=None,
+                  retries=None, retry_delay=None):
+  """Update issue tracker issues concurrently.
+
+  Args:
+    updates: iterable of (issue_id, params) tuples.
+    client: issues.Client used for requests.
+    workers: maximal number of concurrent requests.
+    rate: maximal number of requests per second, 0 disables limiting.
+    retries: number of retries of throttled and failed requests.
+    retry_delay: base delay between retries in seconds.
+
+  Returns:
+    list of SyncResult tuples in the order of updates.
+  """
+  # pylint: disable=too-many-arguments
+  updates = list(updates)
+  if not updates:
+    return []
+  client = client or issues.Client()
+  if workers is None:
+    workers = settings.ISSUE_TRACKER_SYNC_WORKERS
+  if rate is None:
+    rate = settings.ISSUE_TRACKER_SYNC_RATE
+  if retries is None:
+    retries = settings.ISSUE_TRACKER_SYNC_RETRIES
+  if retry_delay is None:
+    retry_delay = settings.ISSUE_TRACKER_SYNC_RETRY_DELAY
+  bucket = TokenBucket(rate)
+
+  def update(item):
+    """Send update of a single issue."""
+    issue_id, params = item
+    attempts, error = call_with_retries(
+        lambda: client.update_issue(issue_id, params),
+        bucket, retries, retry_delay,
+    )
+    if error is not None:
+      logger.error('Unable to update IssueTracker issue ID=%s after %s '
+                   'attempts: %s', issue_id, attempts, error)
+    return SyncResult(issue_id, error is None, attempts,
+                      None if error is None else str(error))
+
+  pool = ThreadPool(max(1, min(workers, len(updates))))
+  try:
+    return pool.map(update, updates)
+  finally:
+    pool.close()
+    pool.join()
@@ -9,6 +9,7 @@ backends
 
 import json
 import re
+import time
 from functools import wraps
 from werkzeug.exceptions import Forbidden
 
@@ -23,9 +24,75 @@ def get_login_module():
   return get_extension_module_for('LOGIN_MANAGER', False)
 
 
+# Recently loaded detached users by user id, with their expiration time.
+#
+# The cache is local to the process. Changes committed by this process evict
+# the changed users right away, other processes keep serving their cached
+# users until the entries expire, so user data and roles can be stale for at
+# most USER_CACHE_TTL seconds after a change.
+_USER_CACHE = {}
+
+_FORGOTTEN_USERS_INFO_KEY = "forgotten_users"
+
+
 def user_loader(user_id):
-  from ggrc.utils.user_generator import find_user_by_id
-  return find_user_by_id(user_id)
+  """Load user for flask_login and count its queries as preamble queries."""
+  from ggrc.utils import request_stats
+  with request_stats.count_preamble():
+    return _load_user(user_id)
+
+
+def _load_user(user_id):
+  """Load user by id.
+
+  Users are loaded with a single query at most once per USER_CACHE_TTL
+  seconds, other requests merge the cached detached user into their session
+  without queries.
+  """
+  from ggrc import db
+  from ggrc import settings
+  from ggrc.utils import user_generator
+  ttl = getattr(settings, "USER_CACHE_TTL", 0)
+  if not ttl:
+    return user_generator.find_user_by_id(user_id)
+
+  expires_at, user = _USER_CACHE.get(unicode(user_id), (0, None))
+  if expires_at < time.time():
+    user = user_generator.find_detached_user_by_id(user_id)
+    if user is None:
+      return None
+    _USER_CACHE[unicode(user_id)] = (time.time() + ttl, user)
+  return db.session.merge(user, load=False)
+
+
+def forget_users(user_ids):
+  """Remove users with changed data or roles from the user cache."""
+  for user_id in user_ids:
+    _USER_CACHE.pop(unicode(user_id), None)
+
+
+def forget_users_on_commit(user_ids, session):
+  """Remove users from the user cache when the transaction commits.
+
+  Evicting users before the commit would let concurrent requests cache the
+  data that is not committed yet.
+
+  Args:
+    user_ids: ids of users with changed data or roles.
+    session: session of the transaction.
+  """
+  if user_ids:
+    session.info.setdefault(_FORGOTTEN_USERS_INFO_KEY, set()).update(user_ids)
+
+
+def handle_commit(session):
+  """Remove users changed by the committed transaction from the cache."""
+  forget_users(session.info.pop(_FORGOTTEN_USERS_INFO_KEY, ()))
+
+
+def handle_rollback(session):
+  """Forget evictions of a transaction that was rolled back."""
+  session.info.pop(_FORGOTTEN_USERS_INFO_KEY, None)
 
 
 def init_app(app):
@@ -0,0 +1,44 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add person object counts table
+
+Create Date: 2018-01-17 12:15:30.412587
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b70592c44459'
+down_revision = '2ac95a7b18fa'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'person_object_counts',
+      sa.Column('person_id', sa.Integer(), nullable=False),
+      sa.Column('counter', sa.String(length=32), nullable=False),
+      sa.Column('object_type', sa.String(length=64), nullable=False),
+      sa.Column('count', sa.Integer(), nullable=False),
+      sa.Column('stale', sa.Boolean(), nullable=False),
+      sa.Column('version', sa.Integer(), nullable=False,
+                server_default='0'),
+      sa.Column('updated_at', sa.DateTime(), nullable=False),
+      sa.PrimaryKeyConstraint('person_id', 'counter', 'object_type'),
+  )
+  op.create_index('ix_person_object_counts_type_stale',
+                  'person_object_counts', ['object_type', 'stale'])
+  op.create_index('ix_person_object_counts_updated_at',
+                  'person_object_counts', ['updated_at'])
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('person_object_counts')
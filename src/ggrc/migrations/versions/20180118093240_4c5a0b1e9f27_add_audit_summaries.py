@@ -0,0 +1,45 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add audit summaries table
+
+Create Date: 2018-01-18 09:32:40.187362
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4c5a0b1e9f27'
+down_revision = 'b70592c44459'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'audit_summaries',
+      sa.Column('audit_id', sa.Integer(), nullable=False),
+      sa.Column('status', sa.String(length=250), nullable=False),
+      sa.Column('verified', sa.Boolean(), nullable=False),
+      sa.Column('count', sa.Integer(), nullable=False),
+      sa.ForeignKeyConstraint(['audit_id'], ['audits.id'],
+                              ondelete='CASCADE'),
+      sa.PrimaryKeyConstraint('audit_id', 'status', 'verified'),
+  )
+  op.execute("""
+      INSERT INTO audit_summaries (audit_id, status, verified, count)
+      SELECT audit_id, status, verified_date IS NOT NULL, COUNT(*)
+      FROM assessments
+      WHERE audit_id IS NOT NULL
+      GROUP BY audit_id, status, verified_date IS NOT NULL
+  """)
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('audit_summaries')
@@ -0,0 +1,37 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add content_normalized flag to revisions
+
+Existing revisions keep the flag unset and get normalized by the
+/admin/normalize_revisions background task, since rewriting the content of
+all revisions is too slow for a migration.
+
+Create Date: 2018-01-19 10:45:12.304815
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'ab9b84fb56e9'
+down_revision = '4c5a0b1e9f27'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.add_column(
+      'revisions',
+      sa.Column('content_normalized', sa.Boolean(), nullable=False,
+                server_default='0'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_column('revisions', 'content_normalized')
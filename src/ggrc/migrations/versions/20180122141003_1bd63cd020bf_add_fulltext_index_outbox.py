@@ -0,0 +1,38 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add fulltext index outbox table
+
+Create Date: 2018-01-22 14:10:03.561024
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '1bd63cd020bf'
+down_revision = 'ab9b84fb56e9'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'fulltext_index_outbox',
+      sa.Column('type', sa.String(length=64), nullable=False),
+      sa.Column('key', sa.Integer(), autoincrement=False, nullable=False),
+      sa.Column('version', sa.Integer(), nullable=False),
+      sa.Column('created_at', sa.DateTime(), nullable=False),
+      sa.PrimaryKeyConstraint('type', 'key'),
+  )
+  op.create_index('ix_fulltext_index_outbox_created_at',
+                  'fulltext_index_outbox', ['created_at'])
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('fulltext_index_outbox')
@@ -0,0 +1,54 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add user access tables
+
+Create Date: 2018-01-24 10:35:12.281935
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '835d99591d5a'
+down_revision = '1bd63cd020bf'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'user_access',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('person_id', sa.Integer(), nullable=False),
+      sa.Column('action', sa.String(length=64), nullable=False),
+      sa.Column('resource_type', sa.String(length=64), nullable=False),
+      sa.Column('context_id', sa.Integer(), nullable=True),
+      sa.Column('resource_id', sa.Integer(), nullable=True),
+      sa.ForeignKeyConstraint(['person_id'], ['people.id'],
+                              ondelete='CASCADE'),
+      sa.PrimaryKeyConstraint('id'),
+  )
+  op.create_index('ix_user_access_contexts', 'user_access',
+                  ['person_id', 'action', 'resource_type', 'context_id'])
+  op.create_index('ix_user_access_resources', 'user_access',
+                  ['person_id', 'action', 'resource_type', 'resource_id'])
+  op.create_table(
+      'user_access_stamps',
+      sa.Column('person_id', sa.Integer(), autoincrement=False,
+                nullable=False),
+      sa.Column('updated_at', sa.DateTime(), nullable=False),
+      sa.ForeignKeyConstraint(['person_id'], ['people.id'],
+                              ondelete='CASCADE'),
+      sa.PrimaryKeyConstraint('person_id'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('user_access_stamps')
+  op.drop_table('user_access')
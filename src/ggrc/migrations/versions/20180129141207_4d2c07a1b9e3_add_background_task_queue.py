@@ -0,0 +1,49 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add background task queue
+
+Create Date: 2018-01-29 14:12:07.518403
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4d2c07a1b9e3'
+down_revision = '835d99591d5a'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'background_task_queue',
+      sa.Column('id', sa.Integer(), nullable=False),
+      sa.Column('background_task_id', sa.Integer(), nullable=False),
+      sa.Column('task_name', sa.String(length=250), nullable=False),
+      sa.Column('url', sa.String(length=250), nullable=False),
+      sa.Column('method', sa.String(length=16), nullable=False),
+      sa.Column('attempts', sa.Integer(), nullable=False),
+      sa.Column('run_after', sa.DateTime(), nullable=False),
+      sa.Column('claimed_by', sa.String(length=250), nullable=True),
+      sa.Column('claimed_at', sa.DateTime(), nullable=True),
+      sa.Column('finished_at', sa.DateTime(), nullable=True),
+      sa.Column('created_at', sa.DateTime(), nullable=False),
+      sa.ForeignKeyConstraint(['background_task_id'], ['background_tasks.id'],
+                              ondelete='CASCADE'),
+      sa.PrimaryKeyConstraint('id'),
+  )
+  op.create_index('ix_background_task_queue_pending', 'background_task_queue',
+                  ['finished_at', 'claimed_by', 'run_after'])
+  op.create_index('ix_background_task_queue_task_name',
+                  'background_task_queue', ['task_name', 'finished_at'])
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('background_task_queue')
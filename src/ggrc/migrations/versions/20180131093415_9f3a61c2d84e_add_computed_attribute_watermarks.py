@@ -0,0 +1,42 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add computed attribute watermarks
+
+Create Date: 2018-01-31 09:34:15.274918
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9f3a61c2d84e'
+down_revision = '4d2c07a1b9e3'
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'computed_attribute_watermarks',
+      sa.Column('attribute_template_id', sa.Integer(), autoincrement=False,
+                nullable=False),
+      sa.Column('revision_id', sa.Integer(), nullable=True),
+      sa.Column('pending_revision_id', sa.Integer(), nullable=True),
+      sa.Column('pending_partitions', sa.Integer(), nullable=False,
+                server_default='0'),
+      sa.Column('updated_at', sa.DateTime(), nullable=False),
+      sa.ForeignKeyConstraint(['attribute_template_id'],
+                              ['attribute_templates.attribute_template_id'],
+                              ondelete='CASCADE'),
+      sa.PrimaryKeyConstraint('attribute_template_id'),
+  )
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('computed_attribute_watermarks')
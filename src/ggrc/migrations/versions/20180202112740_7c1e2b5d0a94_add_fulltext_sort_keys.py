@@ -0,0 +1,85 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Add fulltext sort keys
+
+Create Date: 2018-02-02 11:27:40.318527
+"""
+# disable Invalid constant name pylint warning for mandatory Alembic variables.
+# pylint: disable=invalid-name
+
+import sqlalchemy as sa
+from sqlalchemy.sql import column
+from sqlalchemy.sql import table
+
+from alembic import op
+
+from ggrc.fulltext import sort_keys
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e2b5d0a94'
+down_revision = '9f3a61c2d84e'
+
+
+def populate_sort_keys(connection):
+  """Create sort keys for all existing sortable full text records."""
+  sort_keys_table = table(
+      'fulltext_sort_keys',
+      column('key'),
+      column('type'),
+      column('property'),
+      column('value_num'),
+      column('value_date'),
+      column('value_text'),
+  )
+  types = [row.type for row in connection.execute(
+      "SELECT DISTINCT type FROM fulltext_record_properties")]
+  for type_ in types:
+    records = connection.execute(sa.text("""
+        SELECT `key`, property, subproperty, content
+        FROM fulltext_record_properties
+        WHERE type = :type AND subproperty IN :subproperties
+        ORDER BY `key`
+    """), type=type_, subproperties=sort_keys.SORTABLE_SUBPROPERTIES)
+    batch = []
+    last_key = None
+    for record in records:
+      # flush only between objects, so that all records of an object are in
+      # the same batch
+      if len(batch) >= sort_keys.CHUNK_SIZE and record.key != last_key:
+        connection.execute(sort_keys_table.insert(),
+                           sort_keys.build_rows(type_, batch))
+        batch = []
+      batch.append(tuple(record))
+      last_key = record.key
+    if batch:
+      connection.execute(sort_keys_table.insert(),
+                         sort_keys.build_rows(type_, batch))
+
+
+def upgrade():
+  """Upgrade database schema and/or data, creating a new revision."""
+  op.create_table(
+      'fulltext_sort_keys',
+      sa.Column('key', sa.Integer(), autoincrement=False, nullable=False),
+      sa.Column('type', sa.String(length=64), nullable=False),
+      sa.Column('property', sa.String(length=250), nullable=False),
+      sa.Column('value_num', sa.Float(precision=53), nullable=True),
+      sa.Column('value_date', sa.DateTime(), nullable=True),
+      sa.Column('value_text', sa.String(length=250), nullable=False),
+      sa.PrimaryKeyConstraint('key', 'type', 'property'),
+  )
+  op.create_index(
+      'ix_fulltext_sort_keys_value',
+      'fulltext_sort_keys',
+      ['type', 'property', 'value_num', 'value_date', 'value_text'],
+      unique=False,
+  )
+  populate_sort_keys(op.get_bind())
+
+
+def downgrade():
+  """Downgrade database schema and/or data back to the previous revision."""
+  op.drop_table('fulltext_sort_keys')
@@ -0,0 +1,121 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Aggregated assessment counters for the audit summary page.
+
+The audit summary chart needs the number of assessments in an audit for each
+(status, verified) pair. The counts are stored in the audit_summaries table
+and updated with deltas by the assessment session hooks in the same
+transaction as the assessment change itself, so reading the summary never
+touches the assessments table.
+"""
+
+import sqlalchemy as sa
+
+from ggrc import db
+
+
+# pylint: disable=too-few-public-methods
+class AuditSummary(db.Model):
+  """Db model for assessment counts of a single audit."""
+  __tablename__ = "audit_summaries"
+
+  audit_id = db.Column(
+      db.Integer,
+      db.ForeignKey("audits.id", ondelete="CASCADE"),
+      primary_key=True,
+      autoincrement=False,
+  )
+  status = db.Column(db.String(250), primary_key=True)
+  verified = db.Column(db.Boolean, primary_key=True)
+  count = db.Column(db.Integer, nullable=False, default=0)
+
+
+_UPDATE_COUNTS_SQL = sa.text("""
+    INSERT INTO audit_summaries (audit_id, status, verified, count)
+    VALUES (:audit_id, :status, :verified, :delta)
+    ON DUPLICATE KEY UPDATE count = count + VALUES(count)
+""")
+
+
+def get_summary(audit_id):
+  """Get stored assessment counts of an audit.
+
+  Args:
+    audit_id: id of the audit.
+
+  Returns:
+    list of (status, verified, count) tuples for all non empty groups.
+  """
+  table = AuditSummary.__table__
+  rows = db.session.execute(
+      sa.select([table.c.status, table.c.verified, table.c.count]).where(
+          sa.and_(
+              table.c.audit_id == audit_id,
+              table.c.count > 0,
+          )
+      ).order_by(table.c.status, table.c.verified)
+  )
+  return [(status, bool(verified), count) for status, verified, count in rows]
+
+
+def update_counts(deltas):
+  """Apply count changes to the stored summaries.
+
+  This function does not commit, so the counters are changed in the same
+  transaction as the assessments that caused the change.
+
+  Args:
+    deltas: dict with (audit_id, status, verified) tuple as key and the
+      change of the count as value.
+  """
+  params = [
+      {
+          "audit_id": audit_id,
+          "status": status,
+          "verified": verified,
+          "delta": delta,
+      }
+      for (audit_id, status, verified), delta in deltas.iteritems()
+      if delta and audit_id is not None
+  ]
+  if params:
+    db.session.execute(_UPDATE_COUNTS_SQL, params)
+
+
+def rebuild(audit_ids=None):
+  """Recompute stored summaries from the assessments table.
+
+  Args:
+    audit_ids: ids of audits to rebuild, all audits are rebuilt by default.
+  """
+  table = AuditSummary.__table__
+  assessment_table = sa.table(
+      "assessments",
+      sa.column("audit_id"),
+      sa.column("status"),
+      sa.column("verified_date"),
+  )
+  delete = table.delete()
+  select = sa.select([
+      assessment_table.c.audit_id,
+      assessment_table.c.status,
+      assessment_table.c.verified_date.isnot(None),
+      sa.func.count(),
+  ]).group_by(
+      assessment_table.c.audit_id,
+      assessment_table.c.status,
+      assessment_table.c.verified_date.isnot(None),
+  )
+  if audit_ids is not None:
+    if not audit_ids:
+      return
+    delete = delete.where(table.c.audit_id.in_(audit_ids))
+    select = select.where(assessment_table.c.audit_id.in_(audit_ids))
+  else:
+    select = select.where(assessment_table.c.audit_id.isnot(None))
+  db.session.execute(delete)
+  db.session.execute(table.insert().from_select(
+      ["audit_id", "status", "verified", "count"],
+      select,
+  ))
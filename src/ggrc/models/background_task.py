@@ -3,6 +3,8 @@
 
 """Module for ggrc background tasks."""
 
+import datetime
+import json
 import traceback
 from logging import getLogger
 from functools import wraps
@@ -55,6 +57,22 @@ class BackgroundTask(Base, Stateful, db.Model):
     db.session.add(self)
     db.session.commit()
 
+  def update_progress(self, done, total):
+    """Store progress of the running task.
+
+    The progress is stored as the task result with the 202 status code, until
+    it gets replaced by the final result in finish.
+
+    Args:
+      done: number of processed items.
+      total: number of all items the task has to process.
+    """
+    self.result = {'content': json.dumps({'done': done, 'total': total}),
+                   'status_code': 202,
+                   'headers': [('Content-Type', 'application/json')]}
+    db.session.add(self)
+    db.session.commit()
+
   def finish(self, status, result):
     """Finish the current bg task."""
     # Ensure to not commit any not-yet-committed changes
@@ -82,6 +100,65 @@ class BackgroundTask(Base, Stateful, db.Model):
                               self.result['headers']))
 
 
+class QueuedBackgroundTask(db.Model):
+  """Entry of the database backed queue of the local task backend."""
+  # pylint: disable=too-few-public-methods
+  __tablename__ = 'background_task_queue'
+
+  id = db.Column(db.Integer, primary_key=True)  # pylint: disable=invalid-name
+  background_task_id = db.Column(
+      db.Integer,
+      db.ForeignKey('background_tasks.id', ondelete='CASCADE'),
+      nullable=False,
+  )
+  task_name = db.Column(db.String(250), nullable=False)
+  url = db.Column(db.String(250), nullable=False)
+  method = db.Column(db.String(16), nullable=False)
+  attempts = db.Column(db.Integer, nullable=False, default=0)
+  run_after = db.Column(db.DateTime, nullable=False)
+  claimed_by = db.Column(db.String(250), nullable=True)
+  claimed_at = db.Column(db.DateTime, nullable=True)
+  finished_at = db.Column(db.DateTime, nullable=True)
+  created_at = db.Column(db.DateTime, nullable=False)
+
+  __table_args__ = (
+      db.Index('ix_background_task_queue_pending',
+               'finished_at', 'claimed_by', 'run_after'),
+      db.Index('ix_background_task_queue_task_name',
+               'task_name', 'finished_at'),
+  )
+
+
+def get_task_backend():
+  """Get name of the backend that runs queued tasks.
+
+  Returns:
+    "appengine" for App Engine task queues, "local" for the database queue
+    processed by `python -m ggrc.task_queue` workers and "sync" for running
+    tasks inside the request that created them.
+  """
+  backend = getattr(settings, 'BACKGROUND_TASK_BACKEND', None)
+  if backend:
+    return backend
+  if getattr(settings, 'APP_ENGINE', False):
+    return "appengine"
+  return "sync"
+
+
+def _enqueue(task, name, url, method):
+  """Add a task to the database queue of the local backend."""
+  now = datetime.datetime.utcnow()
+  db.session.add(QueuedBackgroundTask(
+      background_task_id=task.id,
+      task_name=name,
+      url=url,
+      method=method,
+      run_after=now,
+      created_at=now,
+  ))
+  db.session.commit()
+
+
 def create_task(name, url, queued_callback=None, parameters=None, method=None):
   """Create a enqueue a bacground task."""
   if not method:
@@ -107,7 +184,8 @@ def create_task(name, url, queued_callback=None, parameters=None, method=None):
   }
 
   # schedule a task queue
-  if getattr(settings, 'APP_ENGINE', False):
+  backend = get_task_backend()
+  if backend == "appengine":
     from google.appengine.api import taskqueue
     headers = Headers({k: v for k, v in request.headers if k not in banned})
     headers.add('X-Task-Id', task.id)
@@ -119,6 +197,8 @@ def create_task(name, url, queued_callback=None, parameters=None, method=None):
         method=method,
         headers=headers
     )
+  elif backend == "local" and queued_callback:
+    _enqueue(task, name, url, method)
   elif queued_callback:
     queued_callback(task)
   return task
@@ -6,11 +6,15 @@
 from ggrc.models.hooks import access_control_list
 from ggrc.models.hooks import assessment
 from ggrc.models.hooks import audit
+from ggrc.models.hooks import audit_summary
+from ggrc.models.hooks import change_stamps
 from ggrc.models.hooks import comment
 from ggrc.models.hooks import custom_attribute_definition
 from ggrc.models.hooks import issue
 from ggrc.models.hooks import issue_tracker
+from ggrc.models.hooks import person_object_count
 from ggrc.models.hooks import relationship
+from ggrc.models.hooks import user_access
 from ggrc.models.hooks.acl import audit_roles
 from ggrc.models.hooks.acl import relationship_deletion
 from ggrc.models.hooks import proposal
@@ -26,6 +30,10 @@ ALL_HOOKS = [
     custom_attribute_definition,
     audit_roles,
     relationship_deletion,
+    person_object_count,
+    audit_summary,
+    user_access,
+    change_stamps,
 
     # Keep IssueTracker at the end of list to make sure that all other hooks
     # are already executed and all data is final.
@@ -0,0 +1,109 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Hooks that keep audit summary counters in sync with assessments."""
+
+import collections
+
+import sqlalchemy as sa
+from sqlalchemy.orm.session import Session
+
+from ggrc.models import all_models
+from ggrc.models import audit_summary
+
+
+_SUMMARY_ATTRS = ("audit_id", "status", "verified_date")
+
+# Marker for attribute values that were not loaded before the flush.
+_UNKNOWN = object()
+
+
+def _committed_value(obj, attr):
+  """Get attribute value as it was before the current flush."""
+  history = sa.inspect(obj).attrs[attr].history
+  if history.deleted:
+    return history.deleted[0]
+  if history.unchanged:
+    return history.unchanged[0]
+  return _UNKNOWN
+
+
+def _summary_key(audit_id, status, verified_date):
+  return audit_id, status, verified_date is not None
+
+
+def _old_key(assessment):
+  """Get summary key of the assessment before the flush or None if unknown."""
+  values = [_committed_value(assessment, attr) for attr in _SUMMARY_ATTRS]
+  if _UNKNOWN in values:
+    return None
+  return _summary_key(*values)
+
+
+def _new_key(assessment):
+  return _summary_key(*[getattr(assessment, attr) for attr in _SUMMARY_ATTRS])
+
+
+def _is_changed(assessment):
+  state = sa.inspect(assessment)
+  return any(state.attrs[attr].history.has_changes()
+             for attr in _SUMMARY_ATTRS)
+
+
+def _handle_updated(assessment, deltas, rebuild_ids):
+  """Move updated assessment from its old summary group to the new one."""
+  old_key, new_key = _old_key(assessment), _new_key(assessment)
+  if old_key is None:
+    rebuild_ids.add(new_key[0])
+    old_audit_id = _committed_value(assessment, "audit_id")
+    if old_audit_id is not _UNKNOWN:
+      rebuild_ids.add(old_audit_id)
+  elif old_key != new_key:
+    deltas[old_key] -= 1
+    deltas[new_key] += 1
+
+
+def _handle_deleted(assessment, deltas, rebuild_ids):
+  """Remove deleted assessment from its summary group."""
+  old_key = _old_key(assessment)
+  if old_key is not None:
+    deltas[old_key] -= 1
+    return
+  old_audit_id = _committed_value(assessment, "audit_id")
+  if old_audit_id is not _UNKNOWN:
+    rebuild_ids.add(old_audit_id)
+
+
+def handle_assessment_changes(session, flush_context):
+  """Update audit summaries with changes of flushed assessments.
+
+  Counts of the previous (status, verified) group are decremented and counts
+  of the new group incremented. If the previous state of an assessment was
+  not loaded, the summary of its audit is recomputed instead.
+  """
+  # pylint: disable=unused-argument
+  deltas = collections.Counter()
+  rebuild_ids = set()
+
+  for obj in session.new:
+    if isinstance(obj, all_models.Assessment):
+      deltas[_new_key(obj)] += 1
+  for obj in session.dirty:
+    if isinstance(obj, all_models.Assessment) and _is_changed(obj):
+      _handle_updated(obj, deltas, rebuild_ids)
+  for obj in session.deleted:
+    if isinstance(obj, all_models.Assessment):
+      _handle_deleted(obj, deltas, rebuild_ids)
+
+  rebuild_ids.discard(None)
+  audit_summary.update_counts({
+      key: delta for key, delta in deltas.iteritems()
+      if key[0] not in rebuild_ids
+  })
+  if rebuild_ids:
+    audit_summary.rebuild(rebuild_ids)
+
+
+def init_hook():
+  """Initialize hooks for audit summary counters."""
+  sa.event.listen(Session, "after_flush", handle_assessment_changes)
@@ -0,0 +1,16 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Hooks that bump change stamps of committed object types."""
+
+import sqlalchemy as sa
+from sqlalchemy.orm.session import Session
+
+from ggrc.services import change_stamps
+
+
+def init_hook():
+  """Initialize hooks for change stamps."""
+  sa.event.listen(Session, "after_flush", change_stamps.handle_flush)
+  sa.event.listen(Session, "after_commit", change_stamps.handle_commit)
+  sa.event.listen(Session, "after_rollback", change_stamps.handle_rollback)
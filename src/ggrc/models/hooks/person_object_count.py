@@ -0,0 +1,84 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Hooks that invalidate stored dashboard counters of affected people."""
+
+import sqlalchemy as sa
+from sqlalchemy.orm.session import Session
+
+from ggrc.models import all_models
+from ggrc.models import person_object_count
+
+
+def _person_ids(obj):
+  """Get ids of people affected by an ACL or UserRole instance.
+
+  For changed instances both the previous and the current person are
+  affected.
+  """
+  person_ids = set(sa.inspect(obj).attrs.person_id.history.sum())
+  if obj.person:
+    person_ids.add(obj.person.id)
+  return person_ids
+
+
+def _is_modified(obj, attr_names):
+  """Check if any of the given attributes of obj have changed."""
+  attrs = sa.inspect(obj).attrs
+  return any(attrs[name].history.has_changes()
+             for name in attr_names if name in attrs)
+
+
+def _counted_changes(session):
+  """Get objects of the flush that change stored counters.
+
+  Returns:
+    iterator of new and deleted objects and of modified objects with changes
+    in the attributes the counters depend on.
+  """
+  for obj in set(session.new) | set(session.deleted):
+    yield obj
+  for obj in session.dirty:
+    if isinstance(obj, (all_models.AccessControlList, all_models.UserRole)):
+      if session.is_modified(obj, include_collections=False):
+        yield obj
+    elif isinstance(obj, all_models.Relationship):
+      continue
+    elif obj.__class__.__name__ in person_object_count.ALL_OBJECTS_TYPES:
+      if _is_modified(obj, person_object_count.COUNTED_ATTRIBUTES):
+        yield obj
+
+
+def handle_counted_changes(session, flush_context):
+  """Mark counters affected by the flushed changes as stale.
+
+  - new, deleted and reassigned ACL entries and user roles change both
+    visible objects and permissions of a person, so all counters of that
+    person are stale;
+  - new and deleted relationships change "My Work" objects of the mapped
+    types for people assigned to the mapped objects;
+  - new and deleted objects and objects with changed status or context change
+    counts of their type for everyone.
+  """
+  # pylint: disable=unused-argument
+  person_ids = set()
+  mapped_pairs = set()
+  object_types = set()
+  for obj in _counted_changes(session):
+    if isinstance(obj, (all_models.AccessControlList, all_models.UserRole)):
+      person_ids.update(_person_ids(obj))
+    elif isinstance(obj, all_models.Relationship):
+      mapped_pairs.add(((obj.source_type, obj.source_id),
+                        (obj.destination_type, obj.destination_id)))
+    elif obj.__class__.__name__ in person_object_count.ALL_OBJECTS_TYPES:
+      object_types.add(obj.__class__.__name__)
+  person_ids.discard(None)
+
+  person_object_count.mark_stale(person_ids=person_ids)
+  person_object_count.mark_stale(object_types=object_types)
+  person_object_count.mark_mappings_stale(mapped_pairs)
+
+
+def init_hook():
+  """Initialize hooks for stored person object counters."""
+  sa.event.listen(Session, "after_flush", handle_counted_changes)
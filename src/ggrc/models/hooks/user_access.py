@@ -0,0 +1,83 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Hooks that invalidate user access rows, cached permissions and users."""
+
+import itertools
+
+import sqlalchemy as sa
+from sqlalchemy.orm.session import Session
+
+from ggrc import login
+from ggrc.rbac import permissions_cache
+from ggrc.rbac import user_access
+
+
+# Types of objects that grant permissions to the person they reference.
+_GRANT_TYPES = {"AccessControlList", "UserRole"}
+
+# Types of objects that can change permissions of any user.
+_GLOBAL_TYPES = {
+    "AccessControlRole",
+    "Context",
+    "ContextImplication",
+    "Role",
+    "Workflow",
+}
+
+
+def _get_person_ids(obj):
+  """Get ids of people referenced by the object now and before the flush."""
+  history = sa.inspect(obj).attrs.person_id.history
+  return set(itertools.chain(history.added, history.unchanged,
+                             history.deleted))
+
+
+def handle_grant_changes(session, flush_context):
+  """Invalidate user access rows and permissions of people with changed
+  roles.
+
+  Relationships change permissions of people with roles in contexts of the
+  mapped objects. Cached permissions of everyone are invalidated for them,
+  user access rows only for these people.
+  """
+  # pylint: disable=unused-argument
+  person_ids = set()
+  changed_people = set()
+  mapped_stubs = set()
+  global_change = False
+  for obj in itertools.chain(session.new, session.dirty, session.deleted):
+    obj_type = getattr(obj, "type", None)
+    if obj_type in _GRANT_TYPES:
+      person_ids.update(_get_person_ids(obj))
+    elif obj_type == "Relationship":
+      mapped_stubs.add((obj.source_type, obj.source_id))
+      mapped_stubs.add((obj.destination_type, obj.destination_id))
+    elif obj_type in _GLOBAL_TYPES:
+      global_change = True
+    elif obj_type == "Person":
+      changed_people.add(obj.id)
+  person_ids.discard(None)
+  if global_change:
+    user_access.invalidate(session=session)
+  else:
+    user_access.invalidate(
+        person_ids | user_access.get_context_people(mapped_stubs),
+        session=session,
+    )
+  if global_change or mapped_stubs:
+    permissions_cache.invalidate_on_commit(session=session)
+  permissions_cache.invalidate_on_commit(person_ids, session=session)
+  login.forget_users_on_commit(person_ids | changed_people, session)
+
+
+def init_hook():
+  """Initialize hooks for user access rows and cached permissions."""
+  sa.event.listen(Session, "after_flush", handle_grant_changes)
+  sa.event.listen(Session, "after_commit", user_access.handle_commit)
+  sa.event.listen(Session, "after_rollback", user_access.handle_rollback)
+  sa.event.listen(Session, "after_commit", permissions_cache.handle_commit)
+  sa.event.listen(Session, "after_rollback",
+                  permissions_cache.handle_rollback)
+  sa.event.listen(Session, "after_commit", login.handle_commit)
+  sa.event.listen(Session, "after_rollback", login.handle_rollback)
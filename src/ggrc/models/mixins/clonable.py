@@ -4,6 +4,8 @@
 """A mixin for objects that can be cloned"""
 
 import itertools
+
+from ggrc import db
 from ggrc.services import signals
 
 
@@ -48,18 +50,28 @@ class Clonable(object):
         clone_scope(base_object, obj, event)
 
   def generate_attribute(self, attribute):
-    """Generate a new unique attribute as a copy of original"""
-    attr = getattr(self, attribute)
+    """Generate a new unique attribute as a copy of original
 
-    def count_values(key, value):
-      return self.query.filter_by(**{key: value}).count()
+    All existing copies are loaded with a single query and the lowest number
+    that is not used by any of them is picked for the new copy.
+    """
+    attr = getattr(self, attribute)
+    prefix = u"{0} - copy ".format(attr)
+    column = getattr(type(self), attribute)
+    pattern = u"{}%".format(
+        prefix.replace("!", "!!").replace("%", "!%").replace("_", "!_"))
+
+    used_numbers = set()
+    query = db.session.query(column).filter(column.like(pattern, escape="!"))
+    for value, in query:
+      suffix = value[len(prefix):].strip()
+      if suffix.isdigit():
+        used_numbers.add(int(suffix))
 
     i = 1
-    generated_attr_value = "{0} - copy {1}".format(attr, i)
-    while count_values(attribute, generated_attr_value):
+    while i in used_numbers:
       i += 1
-      generated_attr_value = "{0} - copy {1}".format(attr, i)
-    return generated_attr_value
+    return u"{0} - copy {1}".format(attr, i)
 
   def clone_custom_attribute_values(self, obj):
     """Copy object's custom attribute values"""
@@ -0,0 +1,277 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Materialized per person object counters.
+
+Dashboard pages ("My Work" and "All Objects") show the number of objects of
+each type visible to the current user. Computing those numbers requires a
+union of all my objects queries and a permission filtered COUNT for every
+type, so the results are stored in the person_object_counts table.
+
+Counters are never updated with +1/-1 deltas because the visible counts
+depend on permissions. Instead the session hooks mark only the affected
+(person, type) rows as stale, and stale rows get recomputed on the next read.
+Recomputed counts are stored in a separate transaction so that reading the
+counters never commits the request session.
+
+Every invalidation increments the row version. Recomputed counts are stored
+only if the version did not change since it was read in the transaction that
+computed them, so invalidations of concurrent transactions are never lost.
+Missing rows are created as stale, because there is no version to compare
+them with, and they are stored as fresh on the next read.
+"""
+
+import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import declared_attr
+
+from ggrc import db
+
+
+MY_WORK = u"my_work"
+ALL_OBJECTS = u"all_objects"
+
+MY_WORK_TYPES = frozenset([
+    "Issue",
+    "AccessGroup",
+    "Assessment",
+    "Audit",
+    "Clause",
+    "Contract",
+    "Control",
+    "DataAsset",
+    "Facility",
+    "Market",
+    "Objective",
+    "OrgGroup",
+    "Policy",
+    "Process",
+    "Product",
+    "Program",
+    "Project",
+    "Regulation",
+    "Risk",
+    "Section",
+    "Standard",
+    "System",
+    "Threat",
+    "Vendor",
+    "CycleTaskGroupObjectTask",
+])
+
+ALL_OBJECTS_TYPES = MY_WORK_TYPES | frozenset([
+    "Workflow",
+])
+
+# Attributes of counted objects that change their visibility on dashboards
+COUNTED_ATTRIBUTES = ("status", "context_id")
+
+
+# pylint: disable=too-few-public-methods
+class PersonObjectCount(db.Model):
+  """Db model for stored dashboard object counts."""
+  __tablename__ = "person_object_counts"
+
+  person_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+  counter = db.Column(db.String(32), primary_key=True)
+  object_type = db.Column(db.String(64), primary_key=True)
+  count = db.Column(db.Integer, nullable=False, default=0)
+  stale = db.Column(db.Boolean, nullable=False, default=False)
+  version = db.Column(db.Integer, nullable=False, default=0)
+  updated_at = db.Column(db.DateTime, nullable=False)
+
+  @declared_attr
+  def __table_args__(cls):  # pylint: disable=no-self-argument
+    return (
+        db.Index("ix_{}_type_stale".format(cls.__tablename__),
+                 "object_type", "stale"),
+        db.Index("ix_{}_updated_at".format(cls.__tablename__), "updated_at"),
+    )
+
+
+def get_counts(person_id, counter):
+  """Get stored counts for the given person.
+
+  Args:
+    person_id: id of the person that owns the counters.
+    counter: name of the counter set, MY_WORK or ALL_OBJECTS.
+
+  Returns:
+    tuple with a dict of fresh counts by object type and a dict of versions
+    of stale counters by object type, missing counters are in neither.
+  """
+  table = PersonObjectCount.__table__
+  rows = db.session.execute(
+      sa.select([
+          table.c.object_type,
+          table.c.count,
+          table.c.stale,
+          table.c.version,
+      ]).where(
+          sa.and_(
+              table.c.person_id == person_id,
+              table.c.counter == counter,
+          )
+      )
+  )
+  counts = {}
+  versions = {}
+  for object_type, count, stale, version in rows:
+    if stale:
+      versions[object_type] = version
+    else:
+      counts[object_type] = count
+  return counts, versions
+
+
+def store_counts(person_id, counter, counts, versions):
+  """Store recomputed counts for the given person.
+
+  Counts are written on a separate connection and committed right away, the
+  request session is not flushed or committed. Stale counters are stored
+  only if they were not invalidated again since their versions were read,
+  missing counters are created as stale.
+
+  Args:
+    person_id: id of the person that owns the counters.
+    counter: name of the counter set, MY_WORK or ALL_OBJECTS.
+    counts: dict with object type as key and count as value.
+    versions: dict with versions of stale counters by object type, as
+      returned by get_counts in the transaction that computed the counts.
+  """
+  if not counts:
+    return
+  table = PersonObjectCount.__table__
+  now = datetime.datetime.now()
+  stale_rows = [{
+      "key_type": object_type,
+      "key_version": versions[object_type],
+      "new_count": count,
+  } for object_type, count in counts.iteritems() if object_type in versions]
+  missing_rows = [{
+      "person_id": person_id,
+      "counter": counter,
+      "object_type": object_type,
+      "count": counts[object_type],
+      "stale": True,
+      "version": 0,
+      "updated_at": now,
+  } for object_type in set(counts) - set(versions)]
+  with db.engine.begin() as connection:
+    if stale_rows:
+      connection.execute(table.update().where(
+          sa.and_(
+              table.c.person_id == person_id,
+              table.c.counter == counter,
+              table.c.object_type == sa.bindparam("key_type"),
+              table.c.version == sa.bindparam("key_version"),
+          )
+      ).values(
+          count=sa.bindparam("new_count"),
+          stale=False,
+          updated_at=now,
+      ), stale_rows)
+    if missing_rows:
+      # IGNORE skips rows created by concurrent requests
+      connection.execute(table.insert().prefix_with("IGNORE"), missing_rows)
+
+
+def mark_stale(person_ids=None, object_types=None, counters=None):
+  """Mark stored counters as stale.
+
+  Rows matching all of the given filters get invalidated, at least one of
+  person_ids and object_types must be set.
+
+  Args:
+    person_ids: ids of people whose counters should be recomputed.
+    object_types: object types whose counters should be recomputed.
+    counters: list of counter names, all counters are used by default.
+  """
+  if not person_ids and not object_types:
+    return
+  table = PersonObjectCount.__table__
+  conditions = []
+  if person_ids:
+    conditions.append(table.c.person_id.in_(person_ids))
+  if object_types:
+    conditions.append(table.c.object_type.in_(object_types))
+  if counters:
+    conditions.append(table.c.counter.in_(counters))
+  db.session.execute(table.update().where(sa.and_(*conditions)).values(
+      stale=True,
+      version=table.c.version + 1,
+  ))
+
+
+def _get_mapping_people(stubs):
+  """Get ids of people whose "My Work" objects depend on mapped objects.
+
+  These are the mapped people, people with ACL entries on the mapped objects
+  and people with roles in contexts of the mapped objects.
+
+  Args:
+    stubs: set of (type, id) tuples of mapped objects.
+  """
+  from ggrc.models import all_models
+  acl = all_models.AccessControlList
+  context = all_models.Context
+  user_role = all_models.UserRole
+  person_ids = {id_ for type_, id_ in stubs if type_ == "Person"}
+  stubs = [stub for stub in stubs if stub[0] != "Person"]
+  if not stubs:
+    return person_ids
+  rows = db.session.execute(sa.union(
+      sa.select([acl.person_id]).where(
+          sa.tuple_(acl.object_type, acl.object_id).in_(stubs)),
+      sa.select([user_role.person_id]).select_from(
+          user_role.__table__.join(
+              context.__table__, user_role.context_id == context.id)
+      ).where(
+          sa.tuple_(context.related_object_type,
+                    context.related_object_id).in_(stubs)),
+  ))
+  person_ids.update(person_id for person_id, in rows)
+  return person_ids
+
+
+def mark_mappings_stale(pairs):
+  """Mark "My Work" counters affected by changed mappings as stale.
+
+  Args:
+    pairs: iterable of ((type, id), (type, id)) tuples of mapped objects.
+  """
+  stubs = {stub for pair in pairs for stub in pair}
+  object_types = {type_ for type_, _ in stubs} & MY_WORK_TYPES
+  if not object_types:
+    return
+  person_ids = _get_mapping_people(stubs)
+  if person_ids:
+    mark_stale(
+        person_ids=person_ids,
+        object_types=object_types,
+        counters=[MY_WORK],
+    )
+
+
+def reconcile(max_age=datetime.timedelta(days=1)):
+  """Periodic reconciliation of the stored counters.
+
+  Hooks cover the common cases of count changes, but some changes (such as
+  context changes of existing objects) are not tracked. To keep the drift
+  bounded all counters older than max_age are marked as stale and counters
+  of deleted people are removed.
+  """
+  from ggrc.models import all_models
+  table = PersonObjectCount.__table__
+  threshold = datetime.datetime.now() - max_age
+  db.session.execute(table.update().where(
+      sa.and_(
+          table.c.stale == sa.false(),
+          table.c.updated_at < threshold,
+      )
+  ).values(stale=True, version=table.c.version + 1))
+  db.session.execute(table.delete().where(
+      ~table.c.person_id.in_(sa.select([all_models.Person.id]))
+  ))
+  db.session.commit()
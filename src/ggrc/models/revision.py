@@ -3,6 +3,8 @@
 
 """Defines a Revision model for storing snapshots."""
 
+import copy
+
 from ggrc import builder
 from ggrc import db
 from ggrc.models.mixins import Base
@@ -15,6 +17,7 @@ from ggrc.utils import referenced_objects
 
 class Revision(Base, db.Model):
   """Revision object holds a JSON snapshot of the object at a time."""
+  # pylint: disable=too-many-instance-attributes
 
   __tablename__ = 'revisions'
 
@@ -24,6 +27,12 @@ class Revision(Base, db.Model):
   action = db.Column(db.Enum(u'created', u'modified', u'deleted'),
                      nullable=False)
   _content = db.Column('content', LongJsonType, nullable=False)
+  # True if the stored content already contains all populated values, so
+  # populate_* helpers don't need to run when the content is read.
+  content_normalized = db.Column(db.Boolean, nullable=False, default=False)
+
+  # (raw content, populated content) pair of the last content read.
+  _content_cache = None
 
   resource_slug = db.Column(db.String, nullable=True)
   source_type = db.Column(db.String, nullable=True)
@@ -283,12 +292,8 @@ class Revision(Base, db.Model):
         result.append(categorization)
     return {key_name: result}
 
-  @builder.simple_property
-  def content(self):
-    """Property. Contains the revision content dict.
-
-    Updated by required values, generated from saved content dict."""
-    # pylint: disable=too-many-locals
+  def populate_content(self):
+    """Get content dict updated by values generated from saved content."""
     populated_content = self._content.copy()
     populated_content.update(self.populate_acl())
     populated_content.update(self.populate_reference_url())
@@ -299,7 +304,25 @@ class Revision(Base, db.Model):
     populated_content.update(self.populate_categoies("assertions"))
     return populated_content
 
+  @builder.simple_property
+  def content(self):
+    """Property. Contains the revision content dict.
+
+    Populated content is computed only once per loaded content value and each
+    read returns a deep copy of it, so callers that change nested values such
+    as access_control_list can't change the cache.
+    """
+    content = self._content
+    if self._content_cache is None or self._content_cache[0] is not content:
+      if self.content_normalized:
+        populated_content = content
+      else:
+        populated_content = self.populate_content()
+      self._content_cache = (content, populated_content)
+    return copy.deepcopy(self._content_cache[1])
+
   @content.setter
   def content(self, value):
     """ Setter for content property."""
     self._content = value
+    self.content_normalized = False
@@ -14,6 +14,7 @@ from datetime import datetime
 from logging import getLogger
 from operator import itemgetter
 
+import sqlalchemy as sa
 from sqlalchemy.orm import joinedload
 from sqlalchemy.sql.expression import true
 from werkzeug.exceptions import Forbidden
@@ -21,14 +22,18 @@ from google.appengine.api import mail
 
 from ggrc import db
 from ggrc import extensions
+from ggrc import models
 from ggrc import settings
 from ggrc.models import Person
 from ggrc.models import Notification
+from ggrc.notifications import sinks
 from ggrc.rbac import permissions
 from ggrc.utils import DATE_FORMAT_US, merge_dict
 
+from ggrc.notifications import data_handlers
 from ggrc_workflows.notification.data_handler import (
-    cycle_tasks_cache, deleted_task_rels_cache, get_cycle_task_data
+    cycle_tasks_cache, deleted_task_rels_cache, get_cycle_task_data,
+    removed_task_objects_cache
 )
 
 
@@ -85,14 +90,18 @@ class Services(object):
       return service(
           notif,
           tasks_cache=kwargs.get("tasks_cache"),
-          del_rels_cache=kwargs.get('del_rels_cache')
+          del_rels_cache=kwargs.get('del_rels_cache'),
+          removed_objects_cache=kwargs.get("removed_objects_cache"),
       )
+    if service is data_handlers.get_assignable_data:
+      return service(notif, diff_cache=kwargs.get("diff_cache"))
 
     return service(notif)
 
 
-def get_filter_data(
-    notification, people_cache, tasks_cache=None, del_rels_cache=None
+def get_filter_data(  # pylint: disable=too-many-arguments
+    notification, people_cache, tasks_cache=None, del_rels_cache=None,
+    removed_objects_cache=None, diff_cache=None
 ):
   """Get filtered notification data.
 
@@ -108,6 +117,10 @@ def get_filter_data(
       accessible by their ID as a key
     del_rels_cache (dict): prefetched Revision instances representing the
       relationships to Tasks that were deleted grouped by task ID as a key
+    removed_objects_cache (dict): prefetched latest Revision instances of
+      objects removed from Tasks accessible by (type, id) tuple as a key
+    diff_cache (dict): prefetched updated fields accessible by notification
+      ID as a key
 
   Returns:
     dict: dictionary containing notification data for all users who should
@@ -115,7 +128,8 @@ def get_filter_data(
   """
   result = {}
   data = Services.call_service(
-      notification, tasks_cache=tasks_cache, del_rels_cache=del_rels_cache)
+      notification, tasks_cache=tasks_cache, del_rels_cache=del_rels_cache,
+      removed_objects_cache=removed_objects_cache, diff_cache=diff_cache)
 
   for user, user_data in data.iteritems():
     if should_receive(notification, user_data, people_cache):
@@ -123,6 +137,63 @@ def get_filter_data(
   return result
 
 
+def preload_notification_objects(notifications):
+  """Load objects for all notifications with one query per object type.
+
+  Data handlers get notification objects with `model.query.get`, which returns
+  instances already present in the session without querying the database.
+
+  Args:
+    notifications (list of Notification): notifications that will be handled.
+
+  Returns:
+    list of loaded objects.
+  """
+  ids_by_type = defaultdict(set)
+  for notification in notifications:
+    ids_by_type[notification.object_type].add(notification.object_id)
+
+  objects = []
+  for object_type, ids in ids_by_type.iteritems():
+    model = getattr(models, object_type, None)
+    if model is None:
+      continue
+    objects.extend(model.eager_query().filter(model.id.in_(ids)).all())
+  return objects
+
+
+def preload_people(objects):
+  """Load people with access to the given objects for should_receive checks.
+
+  Recipients of most notifications are people from the access control list
+  of the notification object. People who are not loaded here are fetched one
+  by one in should_receive.
+
+  Args:
+    objects (list): objects for which notifications are being sent.
+
+  Returns:
+    dict: people cache with person id as a key and Person as value.
+  """
+  ids_by_type = defaultdict(set)
+  for obj in objects:
+    ids_by_type[obj.type].add(obj.id)
+  if not ids_by_type:
+    return {}
+
+  acl = models.AccessControlList
+  people = db.session.query(Person).options(
+      joinedload('user_roles').joinedload('role'),
+      joinedload('notification_configs')
+  ).filter(Person.id.in_(
+      db.session.query(acl.person_id).filter(sa.or_(*[
+          sa.and_(acl.object_type == object_type, acl.object_id.in_(ids))
+          for object_type, ids in ids_by_type.iteritems()
+      ]))
+  ))
+  return {person.id: person for person in people}
+
+
 def get_notification_data(notifications):
   """Get notification data for all notifications.
 
@@ -140,15 +211,21 @@ def get_notification_data(notifications):
   if not notifications:
     return {}
   aggregate_data = {}
-  people_cache = {}
 
+  # objects must be referenced while the notifications are handled, otherwise
+  # they can be dropped from the session identity map
+  objects = preload_notification_objects(notifications)
+  people_cache = preload_people(objects)
   tasks_cache = cycle_tasks_cache(notifications)
   deleted_rels_cache = deleted_task_rels_cache(tasks_cache.keys())
+  removed_cache = removed_task_objects_cache(deleted_rels_cache)
+  diff_cache = data_handlers.updated_fields_cache(notifications)
 
   for notification in notifications:
     filtered_data = get_filter_data(
         notification, people_cache, tasks_cache=tasks_cache,
-        del_rels_cache=deleted_rels_cache)
+        del_rels_cache=deleted_rels_cache,
+        removed_objects_cache=removed_cache, diff_cache=diff_cache)
     aggregate_data = merge_dict(aggregate_data, filtered_data)
 
   # Remove notifications for objects without a contact (such as task groups)
@@ -213,7 +290,9 @@ def get_daily_notifications():
     list of Notifications, data: a tuple of notifications that were handled
       and corresponding data for those notifications.
   """
-  notifications = db.session.query(Notification).filter(
+  notifications = db.session.query(Notification).options(
+      joinedload('notification_type'),
+  ).filter(
       (Notification.send_on <= datetime.today()) &
       ((Notification.sent_at.is_(None)) | (Notification.repeating == true()))
   ).all()
@@ -274,6 +353,38 @@ def should_receive(notif, user_data, people_cache):
   return has_digest
 
 
+def get_mail_sink():
+  """Get the destination for digest emails based on app settings.
+
+  Returns:
+    MailSink: sink that stores emails in DIGEST_MAIL_DIR if it is set, or
+      sends them with send_email otherwise.
+  """
+  batch_size = getattr(settings, "DIGEST_MAIL_BATCH_SIZE",
+                       sinks.DEFAULT_BATCH_SIZE)
+  mail_dir = getattr(settings, "DIGEST_MAIL_DIR", "")
+  if mail_dir:
+    return sinks.FileMailSink(mail_dir, batch_size)
+  return sinks.CallbackMailSink(send_email, batch_size,
+                                getattr(settings, "DIGEST_WORKERS", 1))
+
+
+def render_digests(notif_data):
+  """Render digest emails for all users.
+
+  Rendering is CPU bound, so emails are rendered one by one while they are
+  consumed by the mail sink.
+
+  Args:
+    notif_data (dict): notification data with user email as a key.
+
+  Yields:
+    tuple: user email and rendered email body.
+  """
+  for user_email, data in notif_data.iteritems():
+    yield user_email, settings.EMAIL_DIGEST.render(digest=modify_data(data))
+
+
 def send_daily_digest_notifications():
   """Send emails for today's or overdue notifications.
 
@@ -284,11 +395,10 @@ def send_daily_digest_notifications():
   notif_list, notif_data = get_daily_notifications()
   sent_emails = []
   subject = "GGRC daily digest for {}".format(date.today().strftime("%b %d"))
-  for user_email, data in notif_data.iteritems():
-    data = modify_data(data)
-    email_body = settings.EMAIL_DIGEST.render(digest=data)
-    send_email(user_email, subject, email_body)
-    sent_emails.append(user_email)
+  with get_mail_sink() as sink:
+    for user_email, email_body in render_digests(notif_data):
+      sink.add(user_email, subject, email_body)
+      sent_emails.append(user_email)
   set_notification_sent_time(notif_list)
   return "emails sent to: <br> {}".format("<br>".join(sent_emails))
 
@@ -300,8 +410,13 @@ def set_notification_sent_time(notif_list):
     notif_list (list of Notification): List of notification for which we want
       to modify sent_at field.
   """
-  for notif in notif_list:
-    notif.sent_at = datetime.now()
+  notif_ids = [notif.id for notif in notif_list]
+  if notif_ids:
+    db.session.execute(
+        Notification.__table__.update().where(
+            Notification.id.in_(notif_ids)
+        ).values(sent_at=datetime.now())
+    )
   db.session.commit()
 
 
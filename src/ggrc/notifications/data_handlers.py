@@ -115,13 +115,34 @@ def _get_revisions(obj, created_at):
   return new_rev, old_rev
 
 
-def _get_updated_fields(obj, created_at, definitions, roles):
-  """Get dict of updated  attributes of assessment"""
-  fields = []
+def _get_revision_window(revisions, created_at):
+  """Get ids of current revision and revision before notification is created.
 
-  new_rev, old_rev = _get_revisions(obj, created_at)
-  if not old_rev:
-    return []
+  This is the in-memory counterpart of _get_revisions.
+
+  Args:
+    revisions (list): (id, created_at) tuples of all object revisions,
+      sorted by id.
+    created_at (datetime): creation time of the notification.
+
+  Returns:
+    tuple: ids of the newest and the old revision, both can be None.
+  """
+  if not revisions:
+    return None, None
+  new_id = revisions[-1][0]
+  older_ids = [id_ for id_, rev_created_at in revisions
+               if rev_created_at < created_at and id_ < new_id]
+  if older_ids:
+    return new_id, older_ids[-1]
+  same_time_ids = [id_ for id_, rev_created_at in revisions
+                   if rev_created_at == created_at and id_ < new_id]
+  return new_id, same_time_ids[0] if same_time_ids else None
+
+
+def _diff_revisions(new_rev, old_rev, definitions, roles):
+  """Get list of display names of fields changed between two revisions."""
+  fields = []
 
   new_attrs = new_rev.content
   old_attrs = old_rev.content
@@ -151,6 +172,131 @@ def _get_updated_fields(obj, created_at, definitions, roles):
   return updated_fields
 
 
+def _get_updated_fields(obj, created_at, definitions, roles):
+  """Get dict of updated  attributes of assessment"""
+  new_rev, old_rev = _get_revisions(obj, created_at)
+  if not old_rev:
+    return []
+  return _diff_revisions(new_rev, old_rev, definitions, roles)
+
+
+def _get_revision_windows(notifs):
+  """Get revision windows of all notifications with a single query.
+
+  Args:
+    notifs (list of Notification): notifications for updated objects.
+
+  Returns:
+    dict: notification id as a key and revision window as value.
+  """
+  ids_by_type = defaultdict(set)
+  for notif in notifs:
+    ids_by_type[notif.object_type].add(notif.object_id)
+  revision_query = db.session.query(
+      models.Revision.id,
+      models.Revision.resource_type,
+      models.Revision.resource_id,
+      models.Revision.created_at,
+  ).filter(sa.or_(*[
+      sa.and_(models.Revision.resource_type == object_type,
+              models.Revision.resource_id.in_(ids))
+      for object_type, ids in ids_by_type.iteritems()
+  ])).order_by(models.Revision.id)
+  object_revisions = defaultdict(list)
+  for id_, resource_type, resource_id, created_at in revision_query:
+    object_revisions[(resource_type, resource_id)].append((id_, created_at))
+
+  windows = {}
+  for notif in notifs:
+    windows[notif.id] = _get_revision_window(
+        object_revisions[(notif.object_type, notif.object_id)],
+        notif.created_at,
+    )
+  return windows
+
+
+def updated_fields_cache(notifs):
+  """Compute updated fields for all "assessment_updated" notifications.
+
+  Revisions for all diffs are fetched with two queries. The first one loads
+  only ids and creation times of revisions of all notified objects, then
+  the newest revision and the revision before the notification was created
+  are picked for each notification, and the second query loads content of
+  only those revisions.
+
+  Args:
+    notifs (list of Notification): notifications that will be handled.
+
+  Returns:
+    dict: notification id as a key and list of updated fields as value.
+  """
+  notifs = [notif for notif in notifs
+            if notif.notification_type.name == "assessment_updated"]
+  if not notifs:
+    return {}
+
+  windows = _get_revision_windows(notifs)
+  revision_ids = {id_ for window in windows.itervalues() for id_ in window
+                  if id_ is not None}
+  if not revision_ids:
+    return {}
+  revisions = {
+      rev.id: rev for rev in
+      models.Revision.query.filter(models.Revision.id.in_(revision_ids))
+  }
+
+  type_cache = {}
+  result = {}
+  for notif in notifs:
+    new_id, old_id = windows[notif.id]
+    if old_id is None:
+      result[notif.id] = []
+      continue
+    if notif.object_type not in type_cache:
+      obj = get_notification_object(notif)
+      if not obj:
+        continue
+      type_cache[notif.object_type] = (
+          AttributeInfo.get_object_attr_definitions(obj.__class__),
+          _get_assignable_roles(obj),
+      )
+    definitions, roles = type_cache[notif.object_type]
+    result[notif.id] = _diff_revisions(
+        revisions[new_id], revisions[old_id], definitions, roles)
+  return result
+
+
+def get_latest_revisions(stubs):
+  """Get the newest revision of each of the given objects.
+
+  Args:
+    stubs (iterable): (object_type, object_id) tuples.
+
+  Returns:
+    dict: (object_type, object_id) tuple as a key and Revision as value.
+  """
+  ids_by_type = defaultdict(set)
+  for object_type, object_id in stubs:
+    ids_by_type[object_type].add(object_id)
+  if not ids_by_type:
+    return {}
+  latest_ids = db.session.query(
+      sa.func.max(models.Revision.id),
+  ).filter(sa.or_(*[
+      sa.and_(models.Revision.resource_type == object_type,
+              models.Revision.resource_id.in_(ids))
+      for object_type, ids in ids_by_type.iteritems()
+  ])).group_by(
+      models.Revision.resource_type,
+      models.Revision.resource_id,
+  ).all()
+  if not latest_ids:
+    return {}
+  revisions = models.Revision.query.filter(
+      models.Revision.id.in_([id_ for id_, in latest_ids]))
+  return {(rev.resource_type, rev.resource_id): rev for rev in revisions}
+
+
 def _get_assignable_roles(obj):
   """Get access control roles for assignable"""
   query = db.session.query(
@@ -160,13 +306,15 @@ def _get_assignable_roles(obj):
   return {role_id: name for role_id, name in query}
 
 
-def _get_assignable_dict(people, notif):
+def _get_assignable_dict(people, notif, diff_cache=None):
   """Get dict data for assignable object in notification.
 
   Args:
     people (List[Person]): List o people objects who should receive the
       notification.
     notif (Notification): Notification that should be sent.
+    diff_cache (dict): prefetched updated fields accessible by notification
+      ID as a key.
   Returns:
     dict: dictionary containing notification data for all people in the given
       list.
@@ -174,8 +322,15 @@ def _get_assignable_dict(people, notif):
   obj = get_notification_object(notif)
   data = {}
 
-  definitions = AttributeInfo.get_object_attr_definitions(obj.__class__)
-  roles = _get_assignable_roles(obj)
+  updated_fields = None
+  if notif.notification_type.name == "assessment_updated":
+    if diff_cache is not None and notif.id in diff_cache:
+      updated_fields = diff_cache[notif.id]
+    else:
+      definitions = AttributeInfo.get_object_attr_definitions(obj.__class__)
+      roles = _get_assignable_roles(obj)
+      updated_fields = _get_updated_fields(obj, notif.created_at,
+                                           definitions, roles)
 
   for person in people:
     # We should default to today() if no start date is found on the object.
@@ -192,12 +347,7 @@ def _get_assignable_dict(people, notif):
                     notif.id: as_user_time(notif.created_at)},
                 "notif_updated_at": {
                     notif.id: as_user_time(notif.updated_at)},
-                "updated_fields": _get_updated_fields(obj,
-                                                      notif.created_at,
-                                                      definitions,
-                                                      roles)
-                if notif.notification_type.name == "assessment_updated"
-                else None,
+                "updated_fields": updated_fields,
             }
         }
     }
@@ -225,11 +375,13 @@ def assignable_open_data(notif):
   return _get_assignable_dict(people, notif)
 
 
-def assignable_updated_data(notif):
+def assignable_updated_data(notif, diff_cache=None):
   """Get data for updated assignable object.
 
   Args:
     notif (Notification): Notification entry for an open assignable object.
+    diff_cache (dict): prefetched updated fields accessible by notification
+      ID as a key.
 
   Returns:
     A dict containing all notification data for the given notification.
@@ -243,7 +395,7 @@ def assignable_updated_data(notif):
     return {}
   people = [person for person in obj.assignees]
 
-  return _get_assignable_dict(people, notif)
+  return _get_assignable_dict(people, notif, diff_cache=diff_cache)
 
 
 def _get_declined_people(obj):
@@ -348,11 +500,13 @@ def get_notification_object(notif):
   return None
 
 
-def get_assignable_data(notif):
+def get_assignable_data(notif, diff_cache=None):
   """Return data for assignable object notifications.
 
   Args:
     notif (Notification): notification with an Assignable object_type.
+    diff_cache (dict): prefetched updated fields accessible by notification
+      ID as a key.
 
   Returns:
     Dict with all data for the assignable notification or an empty dict if the
@@ -379,6 +533,8 @@ def get_assignable_data(notif):
 
   for suffix, data_handler in data_handlers.iteritems():
     if notif_type.endswith(suffix):
+      if data_handler is assignable_updated_data:
+        return data_handler(notif, diff_cache=diff_cache)
       return data_handler(notif)
 
   return {}
@@ -0,0 +1,128 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Destinations for outgoing notification emails.
+
+Mail sinks collect rendered emails and hand them over to the actual delivery
+mechanism in batches. The App Engine mail API has no batch call, so the
+callback sink can send messages of a batch from a pool of worker threads,
+which overlap the waiting for the mail API calls. The pipeline that produces
+the emails does not need to know which sink is used.
+"""
+
+import abc
+import io
+import os
+import re
+from collections import namedtuple
+from logging import getLogger
+from multiprocessing.pool import ThreadPool
+
+
+# pylint: disable=invalid-name
+logger = getLogger(__name__)
+
+Message = namedtuple("Message", ["recipient", "subject", "body"])
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class MailSink(object):
+  """Base class for batched email sinks.
+
+  Sinks are meant to be used as context managers, so that the last incomplete
+  batch is flushed when the sink is closed.
+  """
+
+  __metaclass__ = abc.ABCMeta
+
+  def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+    self.batch_size = max(batch_size, 1)
+    self.sent_count = 0
+    self._pending = []
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    if exc_type is None:
+      self.flush()
+
+  def add(self, recipient, subject, body):
+    """Add an email to the current batch and send the batch if it is full."""
+    self._pending.append(Message(recipient, subject, body))
+    if len(self._pending) >= self.batch_size:
+      self.flush()
+
+  def flush(self):
+    """Send all pending emails."""
+    batch, self._pending = self._pending, []
+    if batch:
+      self.send_batch(batch)
+      self.sent_count += len(batch)
+
+  @abc.abstractmethod
+  def send_batch(self, messages):
+    """Deliver a batch of messages.
+
+    Args:
+      messages (list of Message): emails that should be sent.
+    """
+
+
+class CallbackMailSink(MailSink):
+  """Sink that delivers each message with the given send function.
+
+  If workers is more than one, messages of a batch are sent from a pool of
+  threads, the send function must be thread safe in that case.
+  """
+
+  def __init__(self, send_function, batch_size=DEFAULT_BATCH_SIZE,
+               workers=1):
+    super(CallbackMailSink, self).__init__(batch_size)
+    self.send_function = send_function
+    self.workers = max(workers, 1)
+
+  def _send(self, message):
+    self.send_function(message.recipient, message.subject, message.body)
+
+  def send_batch(self, messages):
+    workers = min(self.workers, len(messages))
+    if workers <= 1:
+      for message in messages:
+        self._send(message)
+      return
+    pool = ThreadPool(workers)
+    try:
+      pool.map(self._send, messages)
+    finally:
+      pool.terminate()
+
+
+class FileMailSink(MailSink):
+  """Sink that stores emails as html files in a local directory.
+
+  This sink is used for local testing and load measurements, where sending
+  real emails is not possible or not wanted.
+  """
+
+  def __init__(self, directory, batch_size=DEFAULT_BATCH_SIZE):
+    super(FileMailSink, self).__init__(batch_size)
+    self.directory = directory
+    if not os.path.isdir(directory):
+      os.makedirs(directory)
+
+  def _get_path(self, index, recipient):
+    """Get a unique file path for an email."""
+    file_name = u"{:06d}_{}.html".format(
+        index, re.sub(r"[^\w@.-]", "_", recipient))
+    return os.path.join(self.directory, file_name)
+
+  def send_batch(self, messages):
+    for index, message in enumerate(messages, self.sent_count):
+      with io.open(self._get_path(index, message.recipient), "w",
+                   encoding="utf-8") as email_file:
+        email_file.write(u"<!-- To: {} -->\n<!-- Subject: {} -->\n".format(
+            message.recipient, message.subject))
+        email_file.write(message.body)
+    logger.info("Stored %s emails in %s", len(messages), self.directory)
@@ -14,11 +14,11 @@ import sqlalchemy as sa
 
 from ggrc import db
 from ggrc import models
-from ggrc.fulltext.mysql import MysqlRecordProperty as Record
+from ggrc.fulltext import sort_keys
 from ggrc.models import inflector
-from ggrc.rbac import context_query_filter
 from ggrc.utils import benchmark
 from ggrc.rbac import permissions
+from ggrc.rbac import user_access
 from ggrc.query import custom_operators
 from ggrc.query.exceptions import BadQueryException
 
@@ -223,13 +223,16 @@ class QueryHelper(object):
     if permission_type == "update" and permissions.has_system_wide_update():
       return None
 
-    contexts, resources = permissions.get_context_resource(
-        model_name=model.__name__, permission_type=permission_type
+    return user_access.permission_filter(
+        model.__name__, model.context_id, model.id,
+        permission_type=permission_type,
     )
-    if contexts is not None:
-      return sa.or_(context_query_filter(model.context_id, contexts),
-                    model.id.in_(resources) if resources else sa.sql.false())
-    return sa.sql.true()
+
+  @staticmethod
+  def _get_objects_query(object_class, object_query):
+    """Get a query loading objects requested by the object query."""
+    # pylint: disable=unused-argument
+    return object_class.eager_query()
 
   def _get_objects(self, object_query):
     """Get a set of objects described in the filters."""
@@ -241,7 +244,7 @@ class QueryHelper(object):
 
     object_name = object_query["object_name"]
     object_class = inflector.get_model(object_name)
-    query = object_class.eager_query()
+    query = self._get_objects_query(object_class, object_query)
     query = query.filter(object_class.id.in_(ids))
 
     with benchmark("Get objects by ids: _get_objects -> obj in query"):
@@ -252,28 +255,36 @@ class QueryHelper(object):
 
     return objects
 
-  def _get_ids(self, object_query):
-    """Get a set of ids of objects described in the filters."""
+  def _get_target_class(self, object_query):
+    """Get the model filters are applied to, snapshotted model for Snapshot."""
+    object_class = inflector.get_model(object_query["object_name"])
+    if object_query["object_name"] == "Snapshot":
+      child_type = self._get_snapshot_child_type(object_query)
+      return getattr(models.all_models, child_type, object_class)
+    return object_class
 
-    object_name = object_query["object_name"]
-    expression = object_query.get("filters", {}).get("expression")
+  def _build_query(self, object_query):
+    """Build an unordered query of ids of objects described in the filters.
 
+    Permission and filter expressions are applied as WHERE clauses, so the
+    query can be turned into aggregates by replacing its entities.
+
+    Returns:
+      query of object ids or None if the object query has no filters.
+    """
+    expression = object_query.get("filters", {}).get("expression")
     if expression is None:
-      return set()
-    object_class = inflector.get_model(object_name)
+      return None
+    object_class = inflector.get_model(object_query["object_name"])
+    tgt_class = self._get_target_class(object_query)
     query = db.session.query(object_class.id)
 
-    tgt_class = object_class
-    if object_name == "Snapshot":
-      child_type = self._get_snapshot_child_type(object_query)
-      tgt_class = getattr(models.all_models, child_type, object_class)
-
     requested_permissions = object_query.get("permissions", "read")
-    with benchmark("Get permissions: _get_ids > _get_type_query"):
+    with benchmark("Get permissions: _build_query > _get_type_query"):
       type_query = self._get_type_query(object_class, requested_permissions)
       if type_query is not None:
         query = query.filter(type_query)
-    with benchmark("Parse filter query: _get_ids > _build_expression"):
+    with benchmark("Parse filter query: _build_query > _build_expression"):
       filter_expression = custom_operators.build_expression(
           expression,
           object_class,
@@ -282,6 +293,87 @@ class QueryHelper(object):
       )
       if filter_expression is not None:
         query = query.filter(filter_expression)
+    return query
+
+  def _get_count(self, object_query):
+    """Count objects described in the filters with a single COUNT query.
+
+    Sets "total" of the object query to the number of matching objects.
+
+    Returns:
+      the number of matching objects after "limit" is applied.
+    """
+    query = self._build_query(object_query)
+    if query is None:
+      object_query["total"] = 0
+      return 0
+    object_class = inflector.get_model(object_query["object_name"])
+    with benchmark("Count objects: _get_count"):
+      total = query.with_entities(sa.func.count(object_class.id)).scalar()
+    object_query["total"] = total
+    limit = object_query.get("limit")
+    if limit:
+      page_size, first = self._get_limit(limit)
+      return max(0, min(total - first, page_size))
+    return total
+
+  def _get_group_counts(self, object_query):
+    """Count objects described in the filters grouped by a field.
+
+    The field is given by the "group_by" parameter of the object query and
+    must be a plain column of the requested model. Sets "total" of the object
+    query to the number of matching objects.
+
+    Returns:
+      list of dicts with a "value" of the field and its "count".
+    """
+    object_class = inflector.get_model(object_query["object_name"])
+    group_attr = self._get_group_attr(object_class,
+                                      object_query.get("group_by"))
+    query = self._build_query(object_query)
+    if query is None:
+      object_query["total"] = 0
+      return []
+    with benchmark("Count objects: _get_group_counts"):
+      rows = query.with_entities(
+          group_attr,
+          sa.func.count(object_class.id),
+      ).group_by(group_attr).order_by(group_attr).all()
+    object_query["total"] = sum(count for _, count in rows)
+    return [{"value": value, "count": count} for value, count in rows]
+
+  @staticmethod
+  def _get_group_attr(model, name):
+    """Get a column of the model objects can be grouped by.
+
+    Only whitelisted and exported attributes stored in model's own columns
+    are allowed.
+    """
+    if not isinstance(name, basestring):
+      raise BadQueryException("`group_by` field name required for grouped "
+                              "counts")
+    attributes = model.attributes_map()
+    key, _ = attributes.get(name.lower(), (name.lower(), None))
+    allowed = custom_operators.GETATTR_WHITELIST.union(
+        attr_key for attr_key, _ in attributes.values())
+    attr = None
+    if key in allowed:
+      attr = getattr(model, key.encode('utf-8'), None)
+    if not (isinstance(attr, sa.orm.attributes.InstrumentedAttribute) and
+            isinstance(attr.property, sa.orm.properties.ColumnProperty)):
+      raise BadQueryException(u"Grouping by {} is not supported"
+                              .format(name))
+    return attr
+
+  def _get_ids(self, object_query):
+    """Get a set of ids of objects described in the filters."""
+
+    query = self._build_query(object_query)
+    if query is None:
+      return set()
+    object_class = inflector.get_model(object_query["object_name"])
+    tgt_class = self._get_target_class(object_query)
+
     if object_query.get("order_by"):
       with benchmark("Sorting: _get_ids > order_by"):
         query = self._apply_order_by(
@@ -348,8 +440,10 @@ class QueryHelper(object):
   def _apply_order_by(self, model, query, order_by, tgt_class):
     """Add ordering parameters to a query for objects.
 
-    This works only on direct model properties and related objects defined with
-    foreign keys and fails if any CAs are specified in order_by.
+    Direct model properties and related objects defined with foreign keys are
+    sorted by their columns. All other fields, including CAs, are sorted by
+    typed values of their full text index properties stored in
+    fulltext_sort_keys, so numbers and dates are sorted by their values.
 
     Args:
       model: the model instances of which are requested in query;
@@ -376,34 +470,34 @@ class QueryHelper(object):
                  "desc": reverse sort on this field if True}
 
       Returns:
-        ([joins], order) - a tuple of joins required for this ordering to work
-                           and ordering clause itself; join is None if no join
-                           required or [(aliased entity, relationship field)]
-                           if joins required.
+        ([joins], [orders]) - a tuple of joins required for this ordering to
+                              work and ordering clauses themselves; join is
+                              None if no join required or
+                              [(aliased entity, relationship field)] if joins
+                              required.
       """
       def by_fulltext():
-        """Join fulltext index table, order by indexed CA value."""
-        alias = sa.orm.aliased(Record, name=u"fulltext_{}".format(self._count))
+        """Join sort keys of indexed properties, order by typed values."""
+        alias = sa.orm.aliased(sort_keys.FulltextSortKey,
+                               name=u"sort_key_{}".format(self._count))
         joins = [(alias, sa.and_(
             alias.key == model.id,
             alias.type == model.__name__,
             alias.property == key,
-            alias.subproperty.in_(["", "__sort__"]))
-        )]
-        order = alias.content
-        return joins, order
+        ))]
+        return joins, sort_keys.order_columns(alias)
 
       def by_foreign_key():
         """Join the related model, order by title or name/email."""
         related_model = attr.property.mapper.class_
         if issubclass(related_model, models.mixins.Titled):
           joins = [(alias, _)] = [(sa.orm.aliased(attr), attr)]
-          order = alias.title
+          orders = [alias.title]
         else:
           raise NotImplementedError(u"Sorting by {model.__name__} is "
                                     u"not implemented yet."
                                     .format(model=related_model))
-        return joins, order
+        return joins, orders
 
       # transform clause["name"] into a model's field name
       key = clause["name"].lower()
@@ -414,27 +508,29 @@ class QueryHelper(object):
         if (isinstance(attr, sa.orm.attributes.InstrumentedAttribute) and
             isinstance(attr.property,
                         sa.orm.properties.RelationshipProperty)):
-          joins, order = by_foreign_key()
+          joins, orders = by_foreign_key()
         else:
           # a simple attribute
-          joins, order = None, attr
+          joins, orders = None, [attr]
       else:
         # Snapshot or non object attributes are treated as custom attributes
         self._count += 1
-        joins, order = by_fulltext()
+        joins, orders = by_fulltext()
 
       if clause.get("desc", False):
-        order = order.desc()
+        orders = [order.desc() for order in orders]
 
-      return joins, order
+      return joins, orders
 
-    join_lists, orders = zip(*[joins_and_order(clause) for clause in order_by])
+    join_lists, order_lists = zip(*[joins_and_order(clause)
+                                    for clause in order_by])
     for join_list in join_lists:
       if join_list is not None:
         for join in join_list:
           query = query.outerjoin(*join)
 
-    return query.order_by(*orders)
+    return query.order_by(*[order for orders in order_lists
+                            for order in orders])
 
   @staticmethod
   def _slugs_to_ids(object_name, slugs):
@@ -3,6 +3,7 @@
 
 """This module contains special query helper class for query API."""
 
+from ggrc import db
 from ggrc.builder import json
 from ggrc.query.builder import QueryHelper
 from ggrc.models import inflector
@@ -17,8 +18,10 @@ class DefaultHandler(QueryHelper):
   query object = [
     {
       # the same parameters as in QueryHelper
-      type: "values", "ids" or "count" - the type of results requested
+      type: "values", "ids", "count" or "group_count" - the type of results
+            requested
       fields: [ a list of fields to include in JSON if type is "values" ]
+      group_by: the name of the field to group by if type is "group_count"
     }
   ]
 
@@ -30,6 +33,8 @@ class DefaultHandler(QueryHelper):
       # the same fields as in QueryHelper
       values: [ filtered objects in JSON ] (present if type is "values")
       ids: [ ids of filtered objects ] (present if type is "ids")
+      counts: [ {"value": field value, "count": number of objects} ]
+              (present if type is "group_count")
       count: the number of objects filtered, after "limit" is applied
       total: the number of objects filtered, before "limit" is applied
   """
@@ -46,9 +51,9 @@ class DefaultHandler(QueryHelper):
     """
     for object_query in self.query:
       query_type = object_query.get("type", "values")
-      if query_type not in {"values", "ids", "count"}:
-        raise NotImplementedError("Only 'values', 'ids' and 'count' queries "
-                                  "are supported now")
+      if query_type not in {"values", "ids", "count", "group_count"}:
+        raise NotImplementedError("Only 'values', 'ids', 'count' and "
+                                  "'group_count' queries are supported now")
       model = inflector.get_model(object_query["object_name"])
       if query_type == "values":
         with benchmark("Get result set: get_results > _get_objects"):
@@ -62,19 +67,41 @@ class DefaultHandler(QueryHelper):
               objects,
               object_query.get("fields"),
           )
-      else:
+        continue
+
+      object_query["last_modified"] = None  # synonymous to now()
+      if query_type == "ids":
         with benchmark("Get result set: get_results -> _get_ids"):
           ids = self._get_ids(object_query)
         object_query["count"] = len(ids)
-        object_query["last_modified"] = None  # synonymous to now()
-        if query_type == "ids":
-          object_query["ids"] = ids
+        object_query["ids"] = ids
+      elif query_type == "count":
+        with benchmark("Get result set: get_results -> _get_count"):
+          object_query["count"] = self._get_count(object_query)
+      else:
+        with benchmark("Get result set: get_results -> _get_group_counts"):
+          object_query["counts"] = self._get_group_counts(object_query)
+        object_query["count"] = object_query["total"]
     return self.query
 
+  @staticmethod
+  def _get_objects_query(object_class, object_query):
+    """Get a query loading only what is needed to publish requested fields."""
+    fields = object_query.get("fields")
+    options = None
+    if fields:
+      # updated_at is needed to get last_modified of the results
+      options = json.projection_options(object_class,
+                                        set(fields).union(["updated_at"]))
+    if options is None:
+      return object_class.eager_query()
+    return db.session.query(object_class).options(*options)
+
   @staticmethod
   def _transform_to_json(objects, fields=None):
     """Make a JSON representation of objects from the list."""
-    objects_json = [json.publish(obj) for obj in objects]
+    objects_json = [json.publish(obj, attribute_whitelist=fields)
+                    for obj in objects]
     objects_json = json.publish_representation(objects_json)
     if fields:
       objects_json = [{f: o.get(f) for f in fields}
@@ -0,0 +1,195 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Per user versioned memcache of compiled permissions.
+
+Permissions of a user are stored under a key that contains a global
+generation and the version of the user. Changes of ACL entries or user roles
+only bump versions of the affected people, changes that can affect permissions
+of everyone (relationships, contexts, role definitions) bump the generation.
+Invalidation is done after commit with atomic increments, so cache misses
+never have to read and rewrite a shared list of cached keys.
+"""
+
+import marshal
+import time
+import zlib
+
+from ggrc import db
+from ggrc import settings
+
+
+# Bump when the compiled permissions structure changes.
+FORMAT_VERSION = 1
+
+PERMISSION_CACHE_TIMEOUT = 3600  # 60 minutes
+
+GENERATION_KEY = "permissions:generation"
+
+_PEOPLE_INFO_KEY = "permissions_cache_people"
+_GLOBAL_INFO_KEY = "permissions_cache_global"
+
+
+def _get_client():
+  """Get memcache client or None if memcache is not enabled."""
+  if not getattr(settings, "MEMCACHE_MECHANISM", False):
+    return None
+  from ggrc.services.common import _get_cache_manager
+  return _get_cache_manager().cache_object.memcache_client
+
+
+def _version_key(user_id):
+  return "permissions:version:{}".format(user_id)
+
+
+def _initial_version():
+  """Get a version value that was not used before an eviction."""
+  return int(time.time() * 1000)
+
+
+def compile_permissions(permissions):
+  """Store contexts and resources of a permissions dict as sets.
+
+  Permission checks test membership of ids in these collections for every
+  checked object, which is linear for lists.
+
+  Args:
+    permissions: permissions dict as built by load_permissions_for.
+
+  Returns:
+    the same dict with compiled contexts and resources.
+  """
+  for types in permissions.itervalues():
+    if not isinstance(types, dict):
+      continue
+    for permission in types.itervalues():
+      if not isinstance(permission, dict):
+        continue
+      for key in ("contexts", "resources"):
+        if key in permission:
+          permission[key] = set(permission[key])
+  return permissions
+
+
+def serialize(permissions):
+  return zlib.compress(marshal.dumps(permissions))
+
+
+def deserialize(data):
+  return marshal.loads(zlib.decompress(data))
+
+
+def _get_versions(client, keys):
+  """Get current version values, creating missing ones."""
+  versions = client.get_multi(keys)
+  missing = {key: _initial_version() for key in keys if key not in versions}
+  if missing:
+    client.add_multi(missing)
+    versions.update(client.get_multi(missing.keys()))
+  return versions
+
+
+def _get_key(client, user_id):
+  """Get the cache key of the current version of user permissions."""
+  version_key = _version_key(user_id)
+  versions = _get_versions(client, [GENERATION_KEY, version_key])
+  if GENERATION_KEY not in versions or version_key not in versions:
+    return None
+  return "permissions:{}:{}:{}:{}".format(
+      FORMAT_VERSION, versions[GENERATION_KEY], user_id,
+      versions[version_key])
+
+
+def get_key(user_id):
+  """Get the cache key of the current version of user permissions.
+
+  The key changes whenever permissions of the user are invalidated, so it can
+  be used to version anything that depends on these permissions.
+
+  Returns:
+    the key or None if permissions can not be cached.
+  """
+  client = _get_client()
+  if client is None:
+    return None
+  return _get_key(client, user_id)
+
+
+def get(user_id):
+  """Get cached permissions of a user.
+
+  Args:
+    user_id: id of the user.
+
+  Returns:
+    tuple of the cache key for the current version of user permissions and
+    cached permissions. The key is None if permissions can not be cached,
+    permissions are None on a cache miss.
+  """
+  client = _get_client()
+  if client is None:
+    return None, None
+  key = _get_key(client, user_id)
+  if key is None:
+    return None, None
+  data = client.get(key)
+  if data is None:
+    return key, None
+  return key, deserialize(data)
+
+
+def store(key, permissions):
+  """Store compiled permissions under the key returned by get."""
+  client = _get_client()
+  if client is None or key is None:
+    return
+  client.set(key, serialize(permissions), PERMISSION_CACHE_TIMEOUT)
+
+
+def invalidate(user_ids=None):
+  """Invalidate cached permissions.
+
+  Args:
+    user_ids: ids of users whose permissions changed, permissions of all users
+      are invalidated if None.
+  """
+  client = _get_client()
+  if client is None:
+    return
+  if user_ids is None:
+    keys = [GENERATION_KEY]
+  else:
+    keys = [_version_key(user_id) for user_id in user_ids]
+  if keys:
+    client.offset_multi({key: 1 for key in keys},
+                        initial_value=_initial_version())
+
+
+def invalidate_on_commit(user_ids=None, session=None):
+  """Invalidate cached permissions when the current transaction commits.
+
+  Args:
+    user_ids: ids of users whose permissions change, permissions of all users
+      are invalidated if None.
+    session: session of the transaction, db.session is used by default.
+  """
+  info = (session or db.session()).info
+  if user_ids is None:
+    info[_GLOBAL_INFO_KEY] = True
+  else:
+    info.setdefault(_PEOPLE_INFO_KEY, set()).update(user_ids)
+
+
+def handle_commit(session):
+  """Invalidate permissions changed by the committed transaction."""
+  people = session.info.pop(_PEOPLE_INFO_KEY, None)
+  if session.info.pop(_GLOBAL_INFO_KEY, False):
+    invalidate()
+  elif people:
+    invalidate(people)
+
+
+def handle_rollback(session):
+  """Forget invalidations of a transaction that was rolled back."""
+  session.info.pop(_PEOPLE_INFO_KEY, None)
+  session.info.pop(_GLOBAL_INFO_KEY, None)
@@ -0,0 +1,409 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Materialized table of contexts and resources available to users.
+
+Permission filters used to inline all contexts and resource ids a user can
+access as IN (...) lists. For users with many ACL derived resources these
+lists get huge and are repeated for every type in a query. Users with more
+than USER_ACCESS_TABLE_THRESHOLD rows get their rows stored in the
+user_access table and a stamp in user_access_stamps. Permission filters of a
+stamped user are semi joins on user_access, the permissions dict of the user
+is neither loaded nor inlined.
+
+Rows are written by the rebuild_user_access background task. Hooks on ACL
+entries, user roles and other objects that grant permissions delete stamps of
+affected people in the transaction that changes their permissions, so the
+filters of these people fall back to IN (...) lists, and start the task for
+them after the transaction commits. Users without a stamp whose lists exceed
+the threshold start the task from their filtered request.
+
+Unrestricted access is stored as rows without context and resource ids.
+"""
+
+import datetime
+
+import sqlalchemy as sa
+from flask import g
+from flask import has_request_context
+
+from ggrc import db
+from ggrc import settings
+from ggrc.rbac import context_query_filter
+from ggrc.rbac import permissions
+from ggrc.utils import benchmark
+
+
+ADMIN_ACTION = "__GGRC_ADMIN__"
+ADMIN_RESOURCE_TYPE = "__GGRC_ALL__"
+
+_PEOPLE_INFO_KEY = "user_access_people"
+_GLOBAL_INFO_KEY = "user_access_global"
+
+
+class UserAccess(db.Model):
+  """Db model for a context or a resource available to a user."""
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "user_access"
+
+  id = db.Column(db.Integer, primary_key=True)  # pylint: disable=invalid-name
+  person_id = db.Column(
+      db.Integer,
+      db.ForeignKey("people.id", ondelete="CASCADE"),
+      nullable=False,
+  )
+  action = db.Column(db.String(64), nullable=False)
+  resource_type = db.Column(db.String(64), nullable=False)
+  context_id = db.Column(db.Integer, nullable=True)
+  resource_id = db.Column(db.Integer, nullable=True)
+
+  __table_args__ = (
+      db.Index("ix_user_access_contexts",
+               "person_id", "action", "resource_type", "context_id"),
+      db.Index("ix_user_access_resources",
+               "person_id", "action", "resource_type", "resource_id"),
+  )
+
+
+class UserAccessStamp(db.Model):
+  """Db model for a marker of up to date user_access rows of a person."""
+  # pylint: disable=too-few-public-methods
+  __tablename__ = "user_access_stamps"
+
+  person_id = db.Column(
+      db.Integer,
+      db.ForeignKey("people.id", ondelete="CASCADE"),
+      primary_key=True,
+      autoincrement=False,
+  )
+  updated_at = db.Column(db.DateTime, nullable=False)
+
+
+_UPSERT_STAMP_SQL = sa.text("""
+    INSERT INTO user_access_stamps (person_id, updated_at)
+    VALUES (:person_id, :updated_at)
+    ON DUPLICATE KEY UPDATE updated_at = VALUES(updated_at)
+""")
+
+
+def get_access_rows(permissions_dict):
+  """Get user_access rows for a permissions dict.
+
+  Args:
+    permissions_dict: permissions as returned by load_permissions_for.
+
+  Returns:
+    sorted list of (action, resource_type, context_id, resource_id) tuples.
+    Rows without context and resource ids grant access to all objects of the
+    type, the admin row without ids grants access to everything.
+  """
+  admin_contexts = permissions_dict.get(ADMIN_ACTION, {}).get(
+      ADMIN_RESOURCE_TYPE, {}).get("contexts", ())
+  if None in admin_contexts or 0 in admin_contexts:
+    return [(ADMIN_ACTION, ADMIN_RESOURCE_TYPE, None, None)]
+  rows = set()
+  for action, types in permissions_dict.iteritems():
+    if not isinstance(types, dict):
+      continue
+    for resource_type, permission in types.iteritems():
+      if not isinstance(permission, dict):
+        continue
+      for context_id in permission.get("contexts", ()):
+        rows.add((action, resource_type, context_id, None))
+      for resource_id in permission.get("resources", ()):
+        rows.add((action, resource_type, None, resource_id))
+  return sorted(rows)
+
+
+def _store_rows(person_id, rows):
+  """Replace user_access rows of a person and stamp them as up to date.
+
+  Args:
+    person_id: id of the person.
+    rows: list of user_access rows or None to remove rows and the stamp.
+  """
+  table = UserAccess.__table__
+  stamps = UserAccessStamp.__table__
+  db.session.execute(table.delete().where(table.c.person_id == person_id))
+  if rows is None:
+    db.session.execute(stamps.delete().where(
+        stamps.c.person_id == person_id))
+    return
+  db.session.execute(table.insert(), [{
+      "person_id": person_id,
+      "action": action,
+      "resource_type": resource_type,
+      "context_id": context_id,
+      "resource_id": resource_id,
+  } for action, resource_type, context_id, resource_id in rows])
+  db.session.execute(_UPSERT_STAMP_SQL, {
+      "person_id": person_id,
+      "updated_at": datetime.datetime.now(),
+  })
+
+
+def rebuild(person_ids=None):
+  """Rebuild user_access rows of people from their permissions.
+
+  Rows are stored only for people with more rows than the threshold, rows of
+  other people are removed. The caller commits the transaction.
+
+  Args:
+    person_ids: ids of people whose rows are rebuilt, all people with stored
+      rows are rebuilt if None.
+  """
+  # pylint: disable=cyclic-import
+  from ggrc.models import all_models
+  from ggrc_basic_permissions import load_permissions_for
+  if person_ids is None:
+    person_ids = [person_id for person_id, in
+                  db.session.query(UserAccess.person_id).distinct()]
+  if not person_ids:
+    return
+  threshold = getattr(settings, "USER_ACCESS_TABLE_THRESHOLD", 0)
+  people = all_models.Person.query.filter(
+      all_models.Person.id.in_(person_ids))
+  for person in people:
+    with benchmark("Rebuild user access rows"):
+      rows = get_access_rows(load_permissions_for(person))
+      _store_rows(person.id, rows if threshold and
+                  len(rows) > threshold else None)
+
+
+def schedule_rebuild(person_ids=None):
+  """Rebuild user_access rows of people after the current request.
+
+  Args:
+    person_ids: ids of people whose rows are outdated, rows of all people are
+      rebuilt if None.
+  """
+  if not has_request_context():
+    return
+  pending = getattr(g, "user_access_rebuild", None)
+  if pending is None:
+    pending = g.user_access_rebuild = set()
+  if person_ids is None:
+    pending.add(None)
+  else:
+    pending.update(person_ids)
+
+
+def start_rebuild(response):
+  """Start the background task for people scheduled in the request."""
+  pending = getattr(g, "user_access_rebuild", None)
+  g.user_access_rebuild = None
+  g.user_access_stamp = None
+  if pending and response.status_code < 400:
+    # pylint: disable=cyclic-import
+    from ggrc.views import start_rebuild_user_access
+    start_rebuild_user_access(
+        None if None in pending else sorted(pending))
+  return response
+
+
+def invalidate(person_ids=None, session=None):
+  """Stop using user_access rows of people whose permissions changed.
+
+  Stamps are deleted in the current transaction and the rows are rebuilt
+  after it commits.
+
+  Args:
+    person_ids: ids of people whose permissions changed, rows of all people
+      are invalidated if None.
+    session: session of the transaction, db.session is used by default.
+  """
+  session = session or db.session()
+  table = UserAccessStamp.__table__
+  if person_ids is None:
+    if session.execute(table.delete()).rowcount:
+      session.info[_GLOBAL_INFO_KEY] = True
+  elif person_ids:
+    stamped = {person_id for person_id, in session.execute(
+        sa.select([table.c.person_id]).where(
+            table.c.person_id.in_(person_ids)))}
+    if stamped:
+      session.execute(table.delete().where(table.c.person_id.in_(stamped)))
+      session.info.setdefault(_PEOPLE_INFO_KEY, set()).update(stamped)
+  else:
+    return
+  if has_request_context():
+    g.user_access_stamp = None
+
+
+def handle_commit(session):
+  """Rebuild rows of people invalidated in the committed transaction."""
+  people = session.info.pop(_PEOPLE_INFO_KEY, None)
+  if session.info.pop(_GLOBAL_INFO_KEY, False):
+    schedule_rebuild()
+  elif people:
+    schedule_rebuild(people)
+
+
+def handle_rollback(session):
+  """Forget invalidations of a transaction that was rolled back."""
+  session.info.pop(_PEOPLE_INFO_KEY, None)
+  session.info.pop(_GLOBAL_INFO_KEY, None)
+
+
+def get_context_people(stubs):
+  """Get ids of people with user roles in contexts of the given objects.
+
+  These people can access objects mapped to the given objects through
+  context relationships, directly or through context implications.
+
+  Args:
+    stubs: set of (type, id) tuples of mapped objects.
+  """
+  # pylint: disable=cyclic-import
+  from ggrc.models import all_models
+  if not stubs:
+    return set()
+  context = all_models.Context
+  implication = all_models.ContextImplication
+  user_role = all_models.UserRole
+  object_contexts = sa.select([context.id]).where(
+      sa.tuple_(context.related_object_type,
+                context.related_object_id).in_(stubs))
+  rows = db.session.execute(sa.union(
+      sa.select([user_role.person_id]).where(
+          user_role.context_id.in_(object_contexts)),
+      sa.select([user_role.person_id]).select_from(
+          user_role.__table__.join(
+              implication.__table__,
+              user_role.context_id == implication.source_context_id)
+      ).where(implication.context_id.in_(object_contexts)),
+  ))
+  return {person_id for person_id, in rows}
+
+
+def _get_stamped_person_id():
+  """Get id of the current user if the user has up to date rows.
+
+  The stamp is checked once per request.
+  """
+  if not getattr(settings, "USER_ACCESS_TABLE_THRESHOLD", 0):
+    return None
+  person_id = getattr(permissions.get_user(), "id", None)
+  if person_id is None:
+    return None
+  stamp = getattr(g, "user_access_stamp", None)
+  if stamp is None or stamp[0] != person_id:
+    stamped = db.session.query(sa.exists().where(
+        UserAccessStamp.person_id == person_id)).scalar()
+    stamp = g.user_access_stamp = (person_id, stamped)
+  return person_id if stamp[1] else None
+
+
+def _access_condition(person_id, action, resource_type, admin=False):
+  """Get condition for rows of a person granting action on a type.
+
+  Args:
+    admin: include rows granting admin access.
+  """
+  from ggrc.rbac.permissions_provider import get_contributing_resource_types
+  condition = sa.and_(
+      UserAccess.action == action,
+      UserAccess.resource_type.in_(
+          get_contributing_resource_types(resource_type)),
+  )
+  if admin:
+    condition = sa.or_(condition, sa.and_(
+        UserAccess.action == ADMIN_ACTION,
+        UserAccess.resource_type == ADMIN_RESOURCE_TYPE,
+    ))
+  return sa.and_(UserAccess.person_id == person_id, condition)
+
+
+def _unrestricted(person_id, action, resource_type):
+  """Check if a person can access all objects of a type."""
+  return sa.exists().where(sa.and_(
+      _access_condition(person_id, action, resource_type, admin=True),
+      UserAccess.context_id.is_(None),
+      UserAccess.resource_id.is_(None),
+  ))
+
+
+def _contexts(person_id, action, resource_type):
+  """Get subquery of contexts where a person can access objects of a type."""
+  return sa.select([UserAccess.context_id]).where(sa.and_(
+      _access_condition(person_id, action, resource_type, admin=True),
+      UserAccess.context_id.isnot(None),
+  ))
+
+
+def _resources(person_id, action, resource_type):
+  """Get subquery of objects of a type a person can access."""
+  return sa.select([UserAccess.resource_id]).where(sa.and_(
+      _access_condition(person_id, action, resource_type),
+      UserAccess.resource_id.isnot(None),
+  ))
+
+
+def _list_filter(model_name, context_column, resource_column,
+                 permission_type, permission_model):
+  """Get filter with inlined contexts and resources of the current user.
+
+  Users with lists longer than the threshold get their rows rebuilt after
+  the request.
+  """
+  # pylint: disable=too-many-arguments
+  contexts, resources = permissions.get_context_resource(
+      model_name=model_name,
+      permission_type=permission_type,
+      permission_model=permission_model,
+  )
+  if contexts is None:
+    return sa.true()
+  resources = resources or []
+
+  threshold = getattr(settings, "USER_ACCESS_TABLE_THRESHOLD", 0)
+  person_id = getattr(permissions.get_user(), "id", None)
+  if threshold and person_id is not None and \
+     len(contexts) + len(resources) > threshold:
+    schedule_rebuild([person_id])
+  return sa.or_(
+      context_query_filter(context_column, contexts),
+      resource_column.in_(resources) if resources else sa.false(),
+  )
+
+
+def permission_filter(model_name, context_column, resource_column,
+                      permission_type="read", permission_model=None):
+  """Get filter for objects available to the current user.
+
+  Args:
+    model_name: name of the filtered model.
+    context_column: column with context ids of filtered objects.
+    resource_column: column with ids of filtered objects.
+    permission_type: action that should be allowed on the objects.
+    permission_model: model name used for the permission check instead of
+      model_name, contexts are still limited to readable model_name contexts.
+
+  Returns:
+    sqlalchemy filter expression.
+  """
+  # pylint: disable=too-many-arguments
+  person_id = _get_stamped_person_id()
+  if person_id is None:
+    return _list_filter(model_name, context_column, resource_column,
+                        permission_type, permission_model)
+
+  permission_model = permission_model or model_name
+  context_filter = context_column.in_(
+      _contexts(person_id, permission_type, permission_model))
+  if permission_model != model_name:
+    context_filter = sa.and_(context_filter, sa.or_(
+        _unrestricted(person_id, "read", model_name),
+        context_column.in_(_contexts(person_id, "read", model_name)),
+    ))
+  return sa.or_(
+      _unrestricted(person_id, permission_type, permission_model),
+      context_filter,
+      resource_column.in_(
+          _resources(person_id, permission_type, permission_model)),
+  )
+
+
+def init_app(app):
+  """Start rebuilding of user_access rows after requests."""
+  app.after_request(start_rebuild)
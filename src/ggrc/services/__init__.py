@@ -98,6 +98,14 @@ def init_extra_services(app):
   from ggrc.services.suggest import suggest
   app.add_url_rule('/people/suggest', 'suggest', login_required(suggest))
 
+  from ggrc.services.bulk_mapping import bulk_map, bulk_unmap
+  app.add_url_rule(
+      '/api/relationships/bulk_map', 'bulk_map', login_required(bulk_map),
+      methods=['POST'])
+  app.add_url_rule(
+      '/api/relationships/bulk_unmap', 'bulk_unmap',
+      login_required(bulk_unmap), methods=['POST'])
+
   from ggrc.services.description import ServiceDescription
   app.add_url_rule(
       '/api', view_func=ServiceDescription.as_view('ServiceDescription'))
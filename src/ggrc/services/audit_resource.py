@@ -9,8 +9,8 @@ instead.
 
 from werkzeug.exceptions import Forbidden
 
-from ggrc import db
 from ggrc import models
+from ggrc.models import audit_summary
 from ggrc.utils import benchmark
 from ggrc.rbac import permissions
 from ggrc.services import common
@@ -35,7 +35,12 @@ class AuditResource(common.ExtendedResource):
     return command_map[command](*args, **kwargs)
 
   def summary_query(self, id):
-    """Get data for audit summary page."""
+    """Get data for audit summary page.
+
+    Returns:
+      list of (status, verified, count) triples with the number of audit
+      assessments in each group.
+    """
     # id name is used as a kw argument and can't be changed here
     # pylint: disable=invalid-name,redefined-builtin
     with benchmark("check audit permissions"):
@@ -43,12 +48,6 @@ class AuditResource(common.ExtendedResource):
       if not permissions.is_allowed_read_for(audit):
         raise Forbidden()
     with benchmark("Get audit summary data"):
-      data = db.session.query(
-          models.Assessment.status,
-          models.Assessment.verified,
-      ).filter(
-          models.Assessment.audit_id == id
-      ).all()
+      data = audit_summary.get_summary(id)
     with benchmark("Make response"):
-      response_object = list(data)
-      return self.json_success_response(response_object, )
+      return self.json_success_response(data, )
@@ -0,0 +1,355 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Bulk mapping and unmapping of objects.
+
+Posting relationships to /api/relationships runs hooks, automapping,
+revision logging and indexing for every relationship. Bulk requests accept a
+list of source and destination stubs instead:
+
+  [{"source": {"type": "Program", "id": 1},
+    "destination": {"type": "Control", "id": 2}}, ...]
+
+Map permissions are checked once per distinct object, relationships are
+inserted or deleted with a single statement, revisions are written with one
+bulk insert and automapping and reindexing run once for the whole set.
+
+Mappings of types with side effects implemented in per object hooks
+(snapshots, assignee roles, issue audits, comments, documents and
+notifications) are not supported and have to be posted to /api/relationships.
+"""
+
+import datetime
+import json
+
+from flask import current_app
+from flask import request
+import sqlalchemy as sa
+from sqlalchemy.orm import load_only
+from werkzeug.exceptions import BadRequest
+from werkzeug.exceptions import Forbidden
+
+from ggrc import db
+from ggrc import models
+from ggrc import settings
+from ggrc.automapper import AutomapperGenerator
+from ggrc.fulltext import listeners
+from ggrc.login import get_current_user_id
+from ggrc.models import all_models
+from ggrc.models import person_object_count
+from ggrc.models.cache import Cache
+from ggrc.models.exceptions import ValidationError
+from ggrc.models.exceptions import translate_message
+from ggrc.models.relationship import Relatable
+from ggrc.models.relationship import Stub
+from ggrc.rbac import permissions
+from ggrc.rbac import permissions_cache
+from ggrc.services import change_stamps
+from ggrc.services import common
+from ggrc.utils import benchmark
+
+
+EXCLUDED_TYPES = frozenset([
+    "Assessment",
+    "Audit",
+    "Comment",
+    "Document",
+    "Snapshot",
+])
+
+
+def _get_stub(stub_json):
+  """Get a Stub of a mappable object from its JSON representation."""
+  try:
+    stub = Stub(stub_json["type"], int(stub_json["id"]))
+    model = models.get_model(stub.type)
+  except (KeyError, TypeError, ValueError):
+    raise BadRequest("Invalid object: {}".format(json.dumps(stub_json)))
+  if (stub.type in EXCLUDED_TYPES or model is None or
+          not issubclass(model, Relatable)):
+    raise BadRequest(
+        "{} objects can not be mapped in bulk.".format(stub.type))
+  return stub
+
+
+def parse_pairs(body):
+  """Get unique (source, destination) stub pairs from a request body.
+
+  Pairs with the same objects in the opposite order are duplicates.
+
+  Raises:
+    BadRequest if the body is not a list of valid pairs.
+  """
+  if not isinstance(body, list):
+    raise BadRequest("List of source and destination pairs expected.")
+  if len(body) > settings.BULK_MAPPING_MAX_PAIRS:
+    raise BadRequest("At most {} pairs can be processed at once.".format(
+        settings.BULK_MAPPING_MAX_PAIRS))
+  pairs = []
+  seen = set()
+  for item in body:
+    if not isinstance(item, dict):
+      raise BadRequest("Invalid pair: {}".format(json.dumps(item)))
+    source = _get_stub(item.get("source"))
+    destination = _get_stub(item.get("destination"))
+    if source == destination:
+      raise BadRequest("{} {} can not be mapped to itself.".format(*source))
+    key = frozenset((source, destination))
+    if key not in seen:
+      seen.add(key)
+      pairs.append((source, destination))
+  return pairs
+
+
+def _load_objects(pairs):
+  """Load all objects of pairs with one query per type.
+
+  Raises:
+    BadRequest if any of the objects does not exist.
+  """
+  stubs = {stub for pair in pairs for stub in pair}
+  ids_by_type = {}
+  for stub in stubs:
+    ids_by_type.setdefault(stub.type, set()).add(stub.id)
+  objects = {}
+  for type_, ids in ids_by_type.iteritems():
+    model = models.get_model(type_)
+    columns = [name for name in ("id", "context_id")
+               if name in sa.inspect(model).column_attrs]
+    query = model.query.options(load_only(*columns)).filter(model.id.in_(ids))
+    objects.update((Stub(type_, obj.id), obj) for obj in query)
+  missing = stubs - set(objects)
+  if missing:
+    raise BadRequest("Objects not found: {}".format(", ".join(
+        "{} {}".format(*stub) for stub in sorted(missing))))
+  return objects.values()
+
+
+def _check_permissions(objects, action):
+  """Check that the current user can map or unmap all objects.
+
+  Mapping an object requires update permissions on it unless the user can
+  create or delete any relationship, see the relationship condition.
+
+  Raises:
+    Forbidden if any of the objects can not be mapped.
+  """
+  is_allowed = getattr(permissions, "is_allowed_{}".format(action))
+  if (is_allowed("Relationship", None, None) and
+          not permissions.has_conditions(action, "Relationship")):
+    return
+  for obj in objects:
+    # Mapping a person does not require a permission check on the person
+    if isinstance(obj, all_models.Person):
+      continue
+    if not permissions.is_allowed_update_for(obj):
+      raise Forbidden()
+
+
+def _relationships_query(pairs, *entities):
+  """Query relationships of pairs in both directions."""
+  rel = all_models.Relationship
+  keys = [(src.type, src.id, dst.type, dst.id) for src, dst in pairs]
+  query = db.session.query(*(entities or (rel,)))
+  return query.filter(
+      sa.tuple_(rel.source_type, rel.source_id,
+                rel.destination_type, rel.destination_id).in_(keys),
+  ).union(query.filter(
+      sa.tuple_(rel.destination_type, rel.destination_id,
+                rel.source_type, rel.source_id).in_(keys),
+  ))
+
+
+def map_objects(pairs):
+  """Create relationships between pairs of objects.
+
+  Returns:
+    tuple with a dict of log JSON by created relationships, including
+    automappings, and the number of pairs that were already mapped.
+  """
+  rel = all_models.Relationship
+  with benchmark("Bulk map: load objects"):
+    objects = _load_objects(pairs)
+  with benchmark("Bulk map: check permissions"):
+    _check_permissions(objects, "create")
+  with benchmark("Bulk map: find existing relationships"):
+    existing = {
+        frozenset((Stub(src_type, src_id), Stub(dst_type, dst_id)))
+        for src_type, src_id, dst_type, dst_id in _relationships_query(
+            pairs, rel.source_type, rel.source_id,
+            rel.destination_type, rel.destination_id)
+    }
+    new_pairs = [pair for pair in pairs if frozenset(pair) not in existing]
+  if not new_pairs:
+    return {}, len(pairs)
+
+  with benchmark("Bulk map: insert relationships"):
+    user_id = get_current_user_id()
+    now = datetime.datetime.now()
+    # INSERT IGNORE skips relationships created by concurrent requests
+    db.session.execute(rel.__table__.insert().prefix_with("IGNORE").values([{
+        "modified_by_id": user_id,
+        "created_at": now,
+        "updated_at": now,
+        "source_type": src.type,
+        "source_id": src.id,
+        "destination_type": dst.type,
+        "destination_id": dst.id,
+        "context_id": None,
+        "parent_id": None,
+        "automapping_id": None,
+    } for src, dst in new_pairs]))
+    relationships = _relationships_query(new_pairs).all()
+
+  with benchmark("Bulk map: automappings"):
+    automapper = AutomapperGenerator()
+    for relationship in relationships:
+      automapper.generate_automappings(relationship)
+
+  logged = {relationship: relationship.log_json()
+            for relationship in relationships}
+  cache = Cache.get_cache()
+  if cache:
+    # automapped relationships are stored in the cache by the automapper
+    logged.update((obj, content) for obj, content in cache.new.iteritems()
+                  if isinstance(obj, rel))
+  return logged, len(pairs) - len(new_pairs)
+
+
+def unmap_objects(pairs):
+  """Delete relationships between pairs of objects.
+
+  Returns:
+    dict of log JSON by deleted relationships.
+  """
+  rel = all_models.Relationship
+  with benchmark("Bulk unmap: load objects"):
+    objects = _load_objects(pairs)
+  with benchmark("Bulk unmap: check permissions"):
+    _check_permissions(objects, "delete")
+  with benchmark("Bulk unmap: delete relationships"):
+    relationships = _relationships_query(pairs).all()
+    if not relationships:
+      return {}
+    logged = {relationship: relationship.log_json()
+              for relationship in relationships}
+    for relationship in relationships:
+      listeners.mark_for_reindex(relationship)
+    db.session.execute(rel.__table__.delete().where(
+        rel.id.in_([relationship.id for relationship in relationships])))
+    for relationship in relationships:
+      db.session.expunge(relationship)
+  return logged
+
+
+def log_revisions(action, logged):
+  """Log an event with revisions written by a single bulk insert.
+
+  Args:
+    action: revision action, "created" or "deleted".
+    logged: dict of log JSON by relationships.
+
+  Returns:
+    list of ids of the inserted revisions.
+  """
+  user_id = get_current_user_id()
+  event = all_models.Event(
+      modified_by_id=user_id,
+      action="BULK",
+      resource_id=0,
+      resource_type=None,
+      context_id=0,
+  )
+  db.session.add(event)
+  db.session.flush()
+  now = datetime.datetime.now()
+  db.session.execute(all_models.Revision.__table__.insert(), [{
+      "event_id": event.id,
+      "modified_by_id": user_id,
+      "created_at": now,
+      "updated_at": now,
+      "action": action,
+      "resource_id": relationship.id,
+      "resource_type": relationship.type,
+      "resource_slug": None,
+      "source_type": relationship.source_type,
+      "source_id": relationship.source_id,
+      "destination_type": relationship.destination_type,
+      "destination_id": relationship.destination_id,
+      "context_id": None,
+      "content": content,
+  } for relationship, content in logged.iteritems()])
+  return [revision_id for revision_id, in db.session.query(
+      all_models.Revision.id).filter_by(event_id=event.id)]
+
+
+def _commit(action, logged):
+  """Log revisions, invalidate caches and commit changed relationships."""
+  from ggrc import views
+  if not logged:
+    db.session.commit()
+    return
+  with benchmark("Bulk mapping: log revisions"):
+    if action == "created":
+      for relationship in logged:
+        listeners.mark_for_reindex(relationship)
+    revision_ids = log_revisions(action, logged)
+  modified_objects = Cache()
+  if action == "created":
+    modified_objects.new = logged
+  else:
+    modified_objects.deleted = logged
+  common.update_memcache_before_commit(
+      request, modified_objects, common.CACHE_EXPIRY_COLLECTION)
+  permissions_cache.invalidate_on_commit()
+  change_stamps.bump_on_commit([all_models.Relationship.__name__])
+  # relationships are written without the session, so the counter hooks do
+  # not see them
+  person_object_count.mark_mappings_stale(
+      ((relationship.source_type, relationship.source_id),
+       (relationship.destination_type, relationship.destination_id))
+      for relationship in logged
+  )
+  with benchmark("Bulk mapping: commit"):
+    db.session.commit()
+  common.update_memcache_after_commit(request)
+  views.start_compute_attributes(revision_ids)
+
+
+def _get_request_pairs():
+  """Get pairs posted to a bulk mapping endpoint."""
+  if "X-Requested-By" not in request.headers:
+    raise BadRequest("X-Requested-By header is REQUIRED.")
+  if request.mimetype != "application/json":
+    raise BadRequest("Content-Type must be application/json")
+  return parse_pairs(request.json)
+
+
+def _make_response(result):
+  return current_app.make_response((
+      json.dumps(result), 200, [("Content-Type", "application/json")]))
+
+
+def bulk_map():
+  """Map posted pairs of objects."""
+  pairs = _get_request_pairs()
+  try:
+    logged, existing = map_objects(pairs)
+    _commit("created", logged)
+  except ValidationError as error:
+    db.session.rollback()
+    raise BadRequest(translate_message(error))
+  return _make_response({
+      "created": len(logged),
+      "existing": existing,
+  })
+
+
+def bulk_unmap():
+  """Unmap posted pairs of objects."""
+  pairs = _get_request_pairs()
+  logged = unmap_objects(pairs)
+  _commit("deleted", logged)
+  return _make_response({
+      "deleted": len(logged),
+  })
@@ -0,0 +1,152 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Per type change stamps for cheap conditional GET of collections.
+
+Every object type has a stamp in memcache that is incremented when a
+transaction that created, changed or deleted objects of that type commits.
+The ETag of a collection is built from stamps of the collection type and of
+the types its objects reference, the permissions version of the user, the
+last modification time and the request arguments. A matching If-None-Match
+header can therefore be answered before the collection is loaded or
+serialized.
+"""
+
+import hashlib
+import itertools
+import time
+
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc import settings
+from ggrc.rbac import permissions_cache
+
+
+_TYPES_INFO_KEY = "change_stamps_types"
+
+# Names of types that affect the representation of a model, by model.
+_DEPENDENT_TYPES = {}
+
+
+def _get_client():
+  """Get memcache client or None if memcache is not enabled."""
+  if not getattr(settings, "MEMCACHE_MECHANISM", False):
+    return None
+  from ggrc.services.common import _get_cache_manager
+  return _get_cache_manager().cache_object.memcache_client
+
+
+def _stamp_key(type_name):
+  return "change_stamp:{}".format(type_name)
+
+
+def _initial_stamp():
+  """Get a stamp value that was not used before an eviction."""
+  return int(time.time() * 1000)
+
+
+def get_dependent_types(model):
+  """Get names of types whose changes can change published model objects.
+
+  Published objects contain stubs of their related objects, so besides the
+  model and its subclasses these are all types mapped by its relationships.
+  """
+  if model not in _DEPENDENT_TYPES:
+    mappers = set()
+    for mapper in sa.inspect(model).self_and_descendants:
+      mappers.add(mapper)
+      for relationship in mapper.relationships:
+        mappers.update(relationship.mapper.self_and_descendants)
+    _DEPENDENT_TYPES[model] = sorted(
+        mapper.class_.__name__ for mapper in mappers)
+  return _DEPENDENT_TYPES[model]
+
+
+def get_stamps(type_names):
+  """Get current stamps of types.
+
+  Returns:
+    list of stamps in the order of type_names or None if stamps are not
+    available.
+  """
+  client = _get_client()
+  if client is None:
+    return None
+  keys = [_stamp_key(type_name) for type_name in type_names]
+  stamps = client.get_multi(keys)
+  missing = {key: _initial_stamp() for key in keys if key not in stamps}
+  if missing:
+    client.add_multi(missing)
+    stamps.update(client.get_multi(missing.keys()))
+  if len(stamps) != len(keys):
+    return None
+  return [stamps[key] for key in keys]
+
+
+def bump(type_names):
+  """Mark objects of given types as changed."""
+  client = _get_client()
+  if client is None or not type_names:
+    return
+  client.offset_multi({_stamp_key(type_name): 1 for type_name in type_names},
+                      initial_value=_initial_stamp())
+
+
+def collection_etag(model, user_id, last_modified, args):
+  """Get ETag of a collection without loading it.
+
+  Args:
+    model: model of the collection.
+    user_id: id of the user the collection is filtered for.
+    last_modified: last modification time of the collection.
+    args: MultiDict with arguments of the collection request.
+
+  Returns:
+    ETag string or None if change stamps are not available.
+  """
+  type_names = get_dependent_types(model)
+  stamps = get_stamps(type_names)
+  permissions_key = permissions_cache.get_key(user_id)
+  if stamps is None or permissions_key is None:
+    return None
+  info = "{} {} {} {}".format(
+      permissions_key,
+      zip(type_names, stamps),
+      last_modified,
+      sorted(args.items(multi=True)),
+  )
+  return '"{0}"'.format(hashlib.sha1(info).hexdigest())
+
+
+def bump_on_commit(type_names, session=None):
+  """Bump stamps of types when the current transaction commits.
+
+  Args:
+    type_names: names of changed types.
+    session: session of the transaction, db.session is used by default.
+  """
+  info = (session or db.session()).info
+  info.setdefault(_TYPES_INFO_KEY, set()).update(type_names)
+
+
+def handle_flush(session, flush_context):
+  """Remember types of objects changed by the flush."""
+  # pylint: disable=unused-argument
+  bump_on_commit(
+      (obj.__class__.__name__ for obj in
+       itertools.chain(session.new, session.dirty, session.deleted)),
+      session=session,
+  )
+
+
+def handle_commit(session):
+  """Bump stamps of types changed by the committed transaction."""
+  types = session.info.pop(_TYPES_INFO_KEY, None)
+  if types:
+    bump(types)
+
+
+def handle_rollback(session):
+  """Forget changes of a transaction that was rolled back."""
+  session.info.pop(_TYPES_INFO_KEY, None)
@@ -25,6 +25,7 @@ import sqlalchemy.orm.exc
 from sqlalchemy import and_, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import class_mapper
+from sqlalchemy.orm import load_only
 from sqlalchemy.sql.expression import tuple_
 from werkzeug.exceptions import BadRequest, Forbidden
 
@@ -39,6 +40,7 @@ from ggrc.models.cache import Cache
 from ggrc.models.exceptions import ValidationError, translate_message
 from ggrc.rbac import permissions, context_query_filter
 from ggrc.services.attribute_query import AttributeQueryBuilder
+from ggrc.services import change_stamps
 from ggrc.services import signals
 from ggrc.models.background_task import BackgroundTask, create_task
 from ggrc.query import utils as query_utils
@@ -51,6 +53,15 @@ logger = getLogger(__name__)
 
 CACHE_EXPIRY_COLLECTION = 60
 
+# Fields filter_resource() needs to check read permissions of a resource.
+_PERMISSION_FIELDS = ("id", "type", "context")
+
+# Additional fields filter_resource() reads for resources of some models.
+_MODEL_PERMISSION_FIELDS = {
+    "Relationship": ("source", "destination"),
+    "Revision": ("resource_type", "resource_id"),
+}
+
 
 def _get_cache_manager():
   """Returns an instance of CacheManager."""
@@ -248,7 +259,6 @@ def update_memcache_after_commit(context):
     if delete_result is not True:
       logger.error("CACHE: Failed to remove status entries from cache")
 
-  clear_permission_cache()
   cache_manager.clear_cache()
 
 
@@ -295,17 +305,6 @@ def update_snapshot_index(session, cache):
   reindex_snapshots(reindex_snapshots_ids)
 
 
-def clear_permission_cache():
-  if not getattr(settings, 'MEMCACHE_MECHANISM', False):
-    return
-  cache = _get_cache_manager().cache_object.memcache_client
-  cached_keys_set = cache.get('permissions:list') or set()
-  cached_keys_set.add('permissions:list')
-  # We delete all the cached user permissions as well as
-  # the permissions:list value itself
-  cache.delete_multi(cached_keys_set)
-
-
 class ModelView(View):
   """Basic view handler for all models"""
   # pylint: disable=protected-access
@@ -636,13 +635,58 @@ class Resource(ModelView):
   def post(*args, **kwargs):
     raise NotImplementedError()
 
-  def get(self, id):
-    """Default JSON request handlers"""
-    with benchmark("Query for object"):
-      obj = self.get_object(id)
+  def check_read_permissions(self, obj):
+    """Raise Forbidden if the current user can not read the object."""
+    if not permissions.is_allowed_read(
+        self.model.__name__, obj.id, obj.context_id)\
+       and not permissions.has_conditions('read', self.model.__name__):
+      raise Forbidden()
+    if not permissions.is_allowed_read_for(obj):
+      raise Forbidden()
+
+  def etag_matches(self, obj_etag):
+    """Check if the If-None-Match header of the request matches an etag."""
+    return (obj_etag is not None and
+            self.request.headers.get('If-None-Match') == obj_etag)
+
+  @staticmethod
+  def make_not_modified_response(obj_etag):
+    return current_app.make_response(('', 304, [('Etag', obj_etag)]))
+
+  def collection_etag(self, last_modified):
+    """Get etag of the requested collection without loading it.
+
+    Returns:
+      etag string or None if change stamps are not available.
+    """
+    return change_stamps.collection_etag(
+        self.model, get_current_user_id(), last_modified, request.args)
+
+  def not_modified_response(self, obj_id):
+    """Answer a conditional GET from the modification time of the object.
+
+    Only columns needed for the etag and the read permission checks are
+    loaded and the object is not serialized.
+
+    Returns:
+      304 response if the object etag matches If-None-Match, None otherwise.
+    """
+    column_attrs = class_mapper(self.model).column_attrs
+    columns = [name for name in ("id", "context_id", self.modified_attr_name)
+               if name in column_attrs]
+    obj = db.session.query(self.model).options(
+        load_only(*columns)).filter(self.model.id == obj_id).first()
     if obj is None:
-      return self.not_found_response()
+      return None
+    obj_etag = etag(self.modified_at(obj), get_info(obj))
+    if not self.etag_matches(obj_etag):
+      return None
+    with benchmark("Query read permissions"):
+      self.check_read_permissions(obj)
+    return self.make_not_modified_response(obj_etag)
 
+  def get(self, id):
+    """Default JSON request handlers"""
     accept_header = self.request.headers.get('Accept', '').strip()
     if (
         accept_header and
@@ -652,13 +696,19 @@ class Resource(ModelView):
       return current_app.make_response((
           'application/json', 406, [('Content-Type', 'text/plain')]))
 
+    if 'If-None-Match' in self.request.headers:
+      with benchmark("Check object etag"):
+        response = self.not_modified_response(id)
+      if response is not None:
+        return response
+
+    with benchmark("Query for object"):
+      obj = self.get_object(id)
+    if obj is None:
+      return self.not_found_response()
+
     with benchmark("Query read permissions"):
-      if not permissions.is_allowed_read(
-          self.model.__name__, obj.id, obj.context_id)\
-         and not permissions.has_conditions('read', self.model.__name__):
-        raise Forbidden()
-      if not permissions.is_allowed_read_for(obj):
-        raise Forbidden()
+      self.check_read_permissions(obj)
     with benchmark("Serialize object"):
       object_for_json = self.object_for_json(obj)
 
@@ -888,7 +938,15 @@ class Resource(ModelView):
     }
     return matches, collection_extras
 
-  def get_matched_resources(self, matches):
+  def get_matched_resources(self, matches, fields=None):
+    """Get published resources for matches from cache or database.
+
+    Args:
+      matches: list of match tuples.
+      fields: names of requested fields, if given only these fields and the
+        fields needed for permission checks are loaded for resources missing
+        in the cache, and such partial resources are not cached.
+    """
     cache_objs = {}
     if self.has_cache():
       self.request.cache_manager = _get_cache_manager()
@@ -900,8 +958,8 @@ class Resource(ModelView):
 
     database_objs = {}
     if database_matches:
-      database_objs = self.get_resources_from_database(matches)
-      if self.has_cache():
+      database_objs = self.get_resources_from_database(matches, fields)
+      if self.has_cache() and fields is None:
         with benchmark("Add resources to cache"):
           self.add_resources_to_cache(database_objs)
     return cache_objs, database_objs
@@ -917,6 +975,12 @@ class Resource(ModelView):
         return current_app.make_response((
             'application/json', 406, [('Content-Type', 'text/plain')]))
 
+    with benchmark("dispatch_request > collection_get > Check etag"):
+      last_modified = self.collection_last_modified()
+      collection_etag = self.collection_etag(last_modified)
+      if self.etag_matches(collection_etag):
+        return self.make_not_modified_response(collection_etag)
+
     with benchmark("dispatch_request > collection_get > Collection matches"):
       # We skip querying by contexts for Creator role and relationship objects,
       # because it will filter out objects that the Creator can access.
@@ -946,7 +1010,11 @@ class Resource(ModelView):
         } for m in matches]
 
       else:
-        cache_objs, database_objs = self.get_matched_resources(matches)
+        custom_fields = None
+        if '__fields' in request.args:
+          custom_fields = request.args['__fields'].split(',')
+        cache_objs, database_objs = self.get_matched_resources(
+            matches, custom_fields)
         objs = {}
         objs.update(cache_objs)
         objs.update(database_objs)
@@ -958,23 +1026,24 @@ class Resource(ModelView):
         cache_op = 'Hit' if cache_objs else 'Miss'
     with benchmark("dispatch_request > collection_get > Create Response"):
       # Return custom fields specified via `__fields=id,title,description` etc.
-      # TODO this can be optimized by filter_resource() not retrieving
-      # the other fields to being with
+      # Resources loaded from the database contain only these fields and the
+      # ones required by filter_resource(), cached ones are full.
       if '__fields' in request.args:
-        custom_fields = request.args['__fields'].split(',')
-        objs = [{f: o[f] for f in custom_fields if f in o} for o in objs]
+        objs = _select_fields(objs, request.args['__fields'].split(','))
       with benchmark("Serialize collection"):
         collection = self.build_collection_representation(
             objs, extras=extras)
 
-      if 'If-None-Match' in self.request.headers and \
-         self.request.headers['If-None-Match'] == etag(collection):
-        return current_app.make_response((
-            '', 304, [('Etag', etag(collection))]))
+      if collection_etag is None:
+        # Without change stamps the etag depends on the whole representation
+        collection_etag = etag(collection)
+        if self.etag_matches(collection_etag):
+          return self.make_not_modified_response(collection_etag)
 
       with benchmark("Make response"):
         return self.json_success_response(
-            collection, self.collection_last_modified(), cache_op=cache_op)
+            collection, last_modified, cache_op=cache_op,
+            obj_etag=collection_etag)
 
   def get_resources_from_cache(self, matches):
     """Get resources from cache for specified matches"""
@@ -1386,19 +1455,34 @@ class Resource(ModelView):
     paging_obj['total'] = paging.total
     return paging_obj
 
-  def get_resources_from_database(self, matches):
+  def get_resources_from_database(self, matches, fields=None):
+    """Load and publish resources for matches.
+
+    If fields are given and no inclusions are requested, only columns and
+    relationships needed to publish these fields are loaded.
+    """
     # FIXME: This is cheating -- `matches` should be allowed to be any model
     model = self.model
     ids = {m[0]: m for m in matches}
+    includes = self.get_properties_to_include(request.args.get('__include'))
+    options = None
+    if fields is not None and not includes:
+      fields = set(fields).union(_PERMISSION_FIELDS)
+      fields.update(_MODEL_PERMISSION_FIELDS.get(model.__name__, ()))
+      options = ggrc.builder.json.projection_options(model, fields)
     with benchmark("Query database for matches"):
-      query = model.eager_query()
+      if options is None:
+        query = model.eager_query()
+        fields = None
+      else:
+        query = db.session.query(model).options(*options)
       # We force the query here so that we can benchmark it
       objs = query.filter(model.id.in_(ids.keys())).all()
     with benchmark("Publish objects"):
       resources = {}
-      includes = self.get_properties_to_include(request.args.get('__include'))
       for obj in objs:
-        resources[ids[obj.id]] = ggrc.builder.json.publish(obj, includes)
+        resources[ids[obj.id]] = ggrc.builder.json.publish(
+            obj, includes, attribute_whitelist=fields)
     with benchmark("Publish representation"):
       ggrc.builder.json.publish_representation(resources)
     return resources
@@ -1608,6 +1692,12 @@ def filter_resource(resource, depth=0, user_permissions=None):  # noqa
     assert False, "Non-object passed to filter_resource"
 
 
+def _select_fields(resources, fields):
+  """Get resources with only the given fields."""
+  return [{field: resource[field] for field in fields if field in resource}
+          for resource in resources]
+
+
 def _is_creator():
   current_user = get_current_user()
   return hasattr(current_user, 'system_wide_role') \
@@ -11,6 +11,7 @@ from werkzeug.exceptions import Forbidden
 from ggrc import db
 from ggrc import login
 from ggrc import models
+from ggrc.models import person_object_count
 from ggrc.utils import benchmark
 from ggrc.services import common
 from ggrc.query import my_objects
@@ -23,63 +24,6 @@ class PersonResource(common.ExtendedResource):
   # method post is abstract and not used.
   # pylint: disable=abstract-method
 
-  MY_WORK_OBJECTS = {
-      "Issue": 0,
-      "AccessGroup": 0,
-      "Assessment": 0,
-      "Audit": 0,
-      "Clause": 0,
-      "Contract": 0,
-      "Control": 0,
-      "DataAsset": 0,
-      "Facility": 0,
-      "Market": 0,
-      "Objective": 0,
-      "OrgGroup": 0,
-      "Policy": 0,
-      "Process": 0,
-      "Product": 0,
-      "Program": 0,
-      "Project": 0,
-      "Regulation": 0,
-      "Risk": 0,
-      "Section": 0,
-      "Standard": 0,
-      "System": 0,
-      "Threat": 0,
-      "Vendor": 0,
-      "CycleTaskGroupObjectTask": 0,
-  }
-
-  ALL_OBJECTS = {
-      "Issue": 0,
-      "AccessGroup": 0,
-      "Assessment": 0,
-      "Audit": 0,
-      "Clause": 0,
-      "Contract": 0,
-      "Control": 0,
-      "DataAsset": 0,
-      "Facility": 0,
-      "Market": 0,
-      "Objective": 0,
-      "OrgGroup": 0,
-      "Policy": 0,
-      "Process": 0,
-      "Product": 0,
-      "Program": 0,
-      "Project": 0,
-      "Regulation": 0,
-      "Risk": 0,
-      "Section": 0,
-      "Standard": 0,
-      "System": 0,
-      "Threat": 0,
-      "Vendor": 0,
-      "CycleTaskGroupObjectTask": 0,
-      "Workflow": 0,
-  }
-
   def get(self, *args, **kwargs):
     # This is to extend the get request for additional data.
     # pylint: disable=arguments-differ
@@ -166,6 +110,82 @@ class PersonResource(common.ExtendedResource):
       }
       return self.json_success_response(response_object, )
 
+  @staticmethod
+  def _get_stored_counts(counter, types, count_function):
+    """Get counts from the counter store, recomputing only stale types.
+
+    Args:
+      counter: name of the stored counter set.
+      types: object types that should be present in the response.
+      count_function: function that computes counts for a list of types.
+
+    Returns:
+      dict with object type as key and count as value.
+    """
+    person_id = login.get_current_user_id()
+    with benchmark("Read stored counters"):
+      counts, versions = person_object_count.get_counts(person_id, counter)
+    stale_types = [type_ for type_ in types if type_ not in counts]
+    if stale_types:
+      with benchmark("Recompute stale counters"):
+        new_counts = count_function(stale_types)
+      with benchmark("Store recomputed counters"):
+        person_object_count.store_counts(person_id, counter, new_counts,
+                                         versions)
+      counts.update(new_counts)
+    return {type_: counts[type_] for type_ in types}
+
+  @staticmethod
+  def _count_my_work(types):
+    """Count my work objects of the given types for the current user."""
+    aliased = my_objects.get_myobjects_query(
+        types=types,
+        contact_id=login.get_current_user_id(),
+        is_creator=login.is_creator(),
+    )
+    all_ = db.session.query(
+        aliased.c.type,
+        aliased.c.id,
+    )
+
+    all_ids = collections.defaultdict(set)
+    for type_, id_ in all_:
+      all_ids[type_].add(id_)
+
+    counts = dict.fromkeys(types, 0)
+    for type_, ids in all_ids.items():
+      model = models.get_model(type_)
+      # pylint: disable=protected-access
+      # We must move the type permissions query to a proper utility function
+      # but we will not do that for a patch release
+      permission_filter = builder.QueryHelper._get_type_query(model, "read")
+      if permission_filter is not None:
+        count = model.query.filter(
+            model.id.in_(ids),
+            permission_filter,
+        ).count()
+      else:
+        count = model.query.filter(model.id.in_(ids)).count()
+      counts[type_] = count
+    return counts
+
+  @staticmethod
+  def _count_all_objects(types):
+    """Count all objects of the given types visible to the current user."""
+    counts = {}
+    for model_type in types:
+      model = models.get_model(model_type)
+      # pylint: disable=protected-access
+      # We must move the type permissions query to a proper utility function
+      # but we will not do that for a patch release
+      permission_filter = builder.QueryHelper._get_type_query(model, "read")
+      if permission_filter is not None:
+        count = model.query.filter(permission_filter).count()
+      else:
+        count = model.query.count()
+      counts[model_type] = count
+    return counts
+
   def _my_work_count(self, **kwargs):
     """Get object counts for my work page."""
     id_ = kwargs.get("id")
@@ -173,36 +193,11 @@ class PersonResource(common.ExtendedResource):
       raise Forbidden()
 
     with benchmark("Make response"):
-      aliased = my_objects.get_myobjects_query(
-          types=self.MY_WORK_OBJECTS.keys(),
-          contact_id=login.get_current_user_id(),
-          is_creator=login.is_creator(),
+      response_object = self._get_stored_counts(
+          person_object_count.MY_WORK,
+          person_object_count.MY_WORK_TYPES,
+          self._count_my_work,
       )
-      all_ = db.session.query(
-          aliased.c.type,
-          aliased.c.id,
-      )
-
-      all_ids = collections.defaultdict(set)
-      for type_, id_ in all_:
-        all_ids[type_].add(id_)
-
-      response_object = self.MY_WORK_OBJECTS.copy()
-      for type_, ids in all_ids.items():
-        model = models.get_model(type_)
-        # pylint: disable=protected-access
-        # We must move the type permissions query to a proper utility function
-        # but we will not do that for a patch release
-        permission_filter = builder.QueryHelper._get_type_query(model, "read")
-        if permission_filter is not None:
-          count = model.query.filter(
-              model.id.in_(ids),
-              permission_filter,
-          ).count()
-        else:
-          count = model.query.filter(model.id.in_(ids)).count()
-        response_object[type_] = count
-
       return self.json_success_response(response_object, )
 
   def _all_objects_count(self, **kwargs):
@@ -213,18 +208,9 @@ class PersonResource(common.ExtendedResource):
       raise Forbidden()
 
     with benchmark("Make response"):
-
-      response_object = self.ALL_OBJECTS.copy()
-      for model_type in response_object:
-        model = models.get_model(model_type)
-        # pylint: disable=protected-access
-        # We must move the type permissions query to a proper utility function
-        # but we will not do that for a patch release
-        permission_filter = builder.QueryHelper._get_type_query(model, "read")
-        if permission_filter is not None:
-          count = model.query.filter(permission_filter).count()
-        else:
-          count = model.query.count()
-        response_object[model_type] = count
-
+      response_object = self._get_stored_counts(
+          person_object_count.ALL_OBJECTS,
+          person_object_count.ALL_OBJECTS_TYPES,
+          self._count_all_objects,
+      )
       return self.json_success_response(response_object, )
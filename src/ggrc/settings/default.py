@@ -107,6 +107,93 @@ EMAIL_DIGEST = JINJA2.get_template("notifications/email_digest.html")
 EMAIL_DAILY = JINJA2.get_template("notifications/view_daily_digest.html")
 EMAIL_PENDING = JINJA2.get_template("notifications/view_pending_digest.html")
 
+# Daily digest pipeline. Number of threads used for sending digest emails,
+# size of batches passed to the mail sink and an optional local directory
+# where emails are stored instead of being sent (for local testing).
+DIGEST_WORKERS = int(os.environ.get('GGRC_DIGEST_WORKERS', '1'))
+DIGEST_MAIL_BATCH_SIZE = int(os.environ.get('GGRC_DIGEST_MAIL_BATCH_SIZE',
+                                            '100'))
+DIGEST_MAIL_DIR = os.environ.get('GGRC_DIGEST_MAIL_DIR', '')
+
+# Asynchronous fulltext indexing. If enabled, commits only store changed
+# objects in the fulltext index outbox, which is drained by a cron job in
+# batches of the given size using the given number of worker threads.
+FULLTEXT_INDEX_ASYNC = bool(os.environ.get('GGRC_FULLTEXT_INDEX_ASYNC'))
+FULLTEXT_OUTBOX_BATCH_SIZE = int(os.environ.get(
+    'GGRC_FULLTEXT_OUTBOX_BATCH_SIZE', '500'))
+FULLTEXT_OUTBOX_WORKERS = int(os.environ.get('GGRC_FULLTEXT_OUTBOX_WORKERS',
+                                             '1'))
+
+# Number of revisions whose fulltext records are kept in memory and reused
+# between chunks of a snapshot reindex, 0 disables the cache.
+SNAPSHOT_INDEX_CACHE_SIZE = int(os.environ.get(
+    'GGRC_SNAPSHOT_INDEX_CACHE_SIZE', '1000'))
+
+# Snapshot scopes with more pairs than the threshold are created and updated
+# by a background task in chunks of the given size, 0 disables the background
+# mode.
+SNAPSHOT_BACKGROUND_THRESHOLD = int(os.environ.get(
+    'GGRC_SNAPSHOT_BACKGROUND_THRESHOLD', '0'))
+SNAPSHOT_CHUNK_SIZE = int(os.environ.get('GGRC_SNAPSHOT_CHUNK_SIZE', '1000'))
+
+# Permission filters of users with more accessible contexts and resources
+# than the threshold join the materialized user_access table instead of
+# inlining the ids, 0 disables the table.
+USER_ACCESS_TABLE_THRESHOLD = int(os.environ.get(
+    'GGRC_USER_ACCESS_TABLE_THRESHOLD', '1000'))
+
+# Number of seconds the maintenance flag and loaded users are cached in the
+# process memory, 0 disables the caches. Changes made by other processes are
+# visible after at most this many seconds.
+MAINTENANCE_CHECK_TTL = int(os.environ.get(
+    'GGRC_MAINTENANCE_CHECK_TTL', '10'))
+USER_CACHE_TTL = int(os.environ.get('GGRC_USER_CACHE_TTL', '10'))
+
+# Return the number of queries issued before the request handler in the
+# X-GGRC-Preamble-Queries response header.
+EXPOSE_PREAMBLE_QUERY_COUNT = bool(os.environ.get(
+    'GGRC_EXPOSE_PREAMBLE_QUERY_COUNT', ''))
+
+# Backend running queued background tasks: "appengine", "local" for the
+# database queue processed by `python -m ggrc.task_queue` workers or "sync"
+# for running tasks inside the request. Defaults to "appengine" on App Engine
+# and "sync" elsewhere.
+BACKGROUND_TASK_BACKEND = os.environ.get('GGRC_BACKGROUND_TASK_BACKEND', '')
+# Number of worker processes started by the local task queue command.
+BACKGROUND_TASK_WORKERS = int(os.environ.get(
+    'GGRC_BACKGROUND_TASK_WORKERS', '2'))
+# Space separated name:limit pairs of tasks that must not run more than limit
+# times in parallel.
+BACKGROUND_TASK_CONCURRENCY = dict(
+    (name, int(limit)) for name, limit in (
+        item.split(':') for item in os.environ.get(
+            'GGRC_BACKGROUND_TASK_CONCURRENCY',
+            'reindex:1 compute_attributes:1').split()
+    )
+)
+# Failed tasks are retried after BACKGROUND_TASK_RETRY_DELAY seconds doubled
+# with each attempt. Tasks claimed for longer than BACKGROUND_TASK_TIMEOUT
+# seconds are considered abandoned by a dead worker and run again.
+BACKGROUND_TASK_MAX_ATTEMPTS = int(os.environ.get(
+    'GGRC_BACKGROUND_TASK_MAX_ATTEMPTS', '3'))
+BACKGROUND_TASK_RETRY_DELAY = int(os.environ.get(
+    'GGRC_BACKGROUND_TASK_RETRY_DELAY', '60'))
+BACKGROUND_TASK_TIMEOUT = int(os.environ.get(
+    'GGRC_BACKGROUND_TASK_TIMEOUT', '3600'))
+BACKGROUND_TASK_POLL_INTERVAL = int(os.environ.get(
+    'GGRC_BACKGROUND_TASK_POLL_INTERVAL', '5'))
+
+# Maximal number of objects of one type computed by a single computed
+# attributes partition. Partitions run as parallel background tasks unless the
+# synchronous task backend is used.
+COMPUTED_ATTRIBUTES_PARTITION_SIZE = int(os.environ.get(
+    'GGRC_COMPUTED_ATTRIBUTES_PARTITION_SIZE', '1000'))
+
+# Maximal number of object pairs mapped or unmapped by a single bulk mapping
+# request.
+BULK_MAPPING_MAX_PAIRS = int(os.environ.get(
+    'GGRC_BULK_MAPPING_MAX_PAIRS', '10000'))
+
 USE_APP_ENGINE_ASSETS_SUBDOMAIN = False
 
 BACKGROUND_COLLECTION_POST_SLEEP = 0
@@ -146,6 +233,11 @@ GGRC_Q_INTEGRATION_URL = os.environ.get('GGRC_Q_INTEGRATION_URL', '')
 # Integration service
 INTEGRATION_SERVICE_URL = os.environ.get('INTEGRATION_SERVICE_URL')
 
+# Number of emails verified with a single Integration Service request and
+# looked up with a single query when people are resolved in bulk.
+EXTERNAL_PERSON_BATCH_SIZE = int(os.environ.get(
+    'GGRC_EXTERNAL_PERSON_BATCH_SIZE', '100'))
+
 # Integration service mandatory header value
 URLFETCH_SERVICE_ID = os.environ.get('URLFETCH_SERVICE_ID')
 
@@ -155,6 +247,18 @@ ISSUE_TRACKER_ENABLED = bool(os.environ.get('ISSUE_TRACKER_ENABLED'))
 # URL template for composing Issue Tracker ticker URL.
 ISSUE_TRACKER_BUG_URL_TMPL = os.environ.get('ISSUE_TRACKER_BUG_URL_TMPL')
 
+# Bulk issue tracker updates: number of concurrent requests, maximal number of
+# requests per second (0 for no limit), retries of throttled or failed
+# requests and the base of their randomized exponential backoff in seconds.
+ISSUE_TRACKER_SYNC_WORKERS = int(os.environ.get(
+    'ISSUE_TRACKER_SYNC_WORKERS', '8'))
+ISSUE_TRACKER_SYNC_RATE = float(os.environ.get(
+    'ISSUE_TRACKER_SYNC_RATE', '10'))
+ISSUE_TRACKER_SYNC_RETRIES = int(os.environ.get(
+    'ISSUE_TRACKER_SYNC_RETRIES', '3'))
+ISSUE_TRACKER_SYNC_RETRY_DELAY = float(os.environ.get(
+    'ISSUE_TRACKER_SYNC_RETRY_DELAY', '1'))
+
 # Dashboard integration
 _DEFAULT_DASHBOARD_INTEGRATION_CONFIG = {
     "ca_name_regexp": r"^Dashboard_(.*)$",
@@ -15,3 +15,6 @@ FULLTEXT_INDEXER = 'ggrc.fulltext.mysql.MysqlIndexer'
 LOGIN_MANAGER = 'ggrc.login.noop'
 # SQLALCHEMY_ECHO = True
 MEMCACHE_MECHANISM = False
+# Tests recreate objects with the same ids, so nothing is cached in memory.
+MAINTENANCE_CHECK_TTL = 0
+USER_CACHE_TTL = 0
@@ -15,11 +15,14 @@ from sqlalchemy.sql.expression import bindparam
 
 from ggrc import db
 from ggrc import models
+from ggrc import settings
 from ggrc.models import all_models
 from ggrc.login import get_current_user_id
+from ggrc.rbac import permissions_cache
 from ggrc.utils import benchmark
 
 from ggrc.snapshotter.acl import get_acl_payload
+from ggrc.snapshotter.acl import insert_scope_acl
 from ggrc.snapshotter.datastructures import Attr
 from ggrc.snapshotter.datastructures import Pair
 from ggrc.snapshotter.datastructures import Stub
@@ -30,6 +33,7 @@ from ggrc.snapshotter.helpers import create_snapshot_dict
 from ggrc.snapshotter.helpers import create_snapshot_revision_dict
 from ggrc.snapshotter.helpers import get_relationships
 from ggrc.snapshotter.helpers import get_revisions
+from ggrc.snapshotter.helpers import get_scope_snapshots
 from ggrc.snapshotter.helpers import get_snapshots
 from ggrc.snapshotter.indexer import reindex_pairs
 
@@ -253,6 +257,7 @@ class SnapshotGenerator(object):
 
       with benchmark("Insert Snapshot entries into Revision"):
         self._execute(models.Revision.__table__.insert(), revision_payload)
+      self._commit()
       return OperationResponse("update", True, for_update, response_data)
 
   def analyze(self):
@@ -319,16 +324,19 @@ class SnapshotGenerator(object):
   def _execute(self, operation, data):
     """Execute bulk operation on data if not in dry mode
 
+    The operation is not committed, so that all writes of a single create or
+    update call are committed together with _commit.
+
     Args:
       operation: sqlalchemy operation
       data: a list of dictionaries with keys representing column names and
         values to insert with operation
-    Returns:
-      True if successful.
     """
     if data and not self.dry_run:
-      engine = db.engine
-      engine.execute(operation, data)
+      db.session.execute(operation, data)
+
+  def _commit(self):
+    if not self.dry_run:
       db.session.commit()
 
   def create(self, event, revisions, _filter=None):
@@ -409,6 +417,9 @@ class SnapshotGenerator(object):
       with benchmark("Snapshot._create.write acls to database"):
         self._execute(all_models.AccessControlList.__table__.insert(),
                       acl_payload)
+        if not self.dry_run:
+          permissions_cache.invalidate_on_commit(
+              {acl["person_id"] for acl in acl_payload})
 
       with benchmark("Snapshot._create.create parent object -> snapshot rels"):
         for snapshot in snapshots:
@@ -448,8 +459,65 @@ class SnapshotGenerator(object):
 
       with benchmark("Snapshot._create.write revisions to database"):
         self._execute(models.Revision.__table__.insert(), revision_payload)
+      self._commit()
       return OperationResponse("create", True, for_create, response_data)
 
+  def process_in_chunks(self, event, revisions, with_update=True,
+                        chunk_size=None, progress=None):
+    """Create and update snapshots in separately committed chunks.
+
+    Each chunk is written and indexed in its own transaction. A retry after
+    a failure only processes pairs of the chunks that were not finished,
+    since finished pairs are found as existing snapshots by analyze and
+    updating an up to date snapshot is a noop.
+
+    Args:
+      event: A ggrc.models.Event instance
+      revisions: A dict of pairs with revisions that should be used for
+        snapshots of these pairs.
+      with_update: Update existing snapshots too, otherwise only missing
+        snapshots are created.
+      chunk_size: number of pairs processed in a single transaction.
+      progress: callable receiving the number of processed and all pairs
+        after each chunk.
+    Returns:
+      OperationResponse
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    if chunk_size is None:
+      chunk_size = getattr(settings, "SNAPSHOT_CHUNK_SIZE", 1000)
+    for_create, for_update = self.analyze()
+    if not with_update:
+      for_update = set()
+    total = len(for_create) + len(for_update)
+    done = 0
+    created, updated = set(), set()
+    operations = (
+        (self._update, for_update, updated),
+        (self._create, for_create, created),
+    )
+    for operation, pairs, processed in operations:
+      for chunk in _split_pairs(pairs, chunk_size):
+        with benchmark("Snapshot.process_in_chunks.chunk"):
+          result = operation(chunk, event=event, revisions=revisions,
+                             _filter=None)
+          if not self.dry_run:
+            reindex_pairs(result.response)
+        processed.update(result.response)
+        done += len(chunk)
+        if progress:
+          progress(done, total)
+
+    if not self.dry_run:
+      self._copy_snapshot_relationships()
+      db.session.commit()
+    return OperationResponse("upsert", True, {
+        "create": created,
+        "update": updated,
+    }, {
+        "dry-run": self.dry_run
+    })
+
   def _copy_snapshot_relationships(self):
     """Add relationships between snapshotted objects.
 
@@ -458,48 +526,127 @@ class SnapshotGenerator(object):
     created for all objects inside a single parent scope.
     """
     for parent in self.parents:
-      query = """
-          INSERT IGNORE INTO relationships (
-              modified_by_id,
-              created_at,
-              updated_at,
-              source_id,
-              source_type,
-              destination_id,
-              destination_type,
-              context_id
-          )
-          SELECT
-              :user_id,
-              now(),
-              now(),
-              snap_1.id,
-              "Snapshot",
-              snap_2.id,
-              "Snapshot",
-              snap_2.context_id
-          FROM relationships AS rel
-          INNER JOIN snapshots AS snap_1
-              ON (snap_1.child_type, snap_1.child_id) =
-                 (rel.source_type, rel.source_id)
-          INNER JOIN snapshots AS snap_2
-              ON (snap_2.child_type, snap_2.child_id) =
-                 (rel.destination_type, rel.destination_id)
-          WHERE
-              snap_1.parent_id = :parent_id AND
-              snap_2.parent_id = :parent_id
-          """
-      db.session.execute(query, {
-          "user_id": get_current_user_id(),
-          "parent_id": parent.id
-      })
+      _copy_snapshot_relationships(parent, get_current_user_id())
+
+
+def _copy_snapshot_relationships(parent, user_id):
+  """Add relationships between snapshots of a single parent scope."""
+  query = """
+      INSERT IGNORE INTO relationships (
+          modified_by_id,
+          created_at,
+          updated_at,
+          source_id,
+          source_type,
+          destination_id,
+          destination_type,
+          context_id
+      )
+      SELECT
+          :user_id,
+          now(),
+          now(),
+          snap_1.id,
+          "Snapshot",
+          snap_2.id,
+          "Snapshot",
+          snap_2.context_id
+      FROM relationships AS rel
+      INNER JOIN snapshots AS snap_1
+          ON (snap_1.child_type, snap_1.child_id) =
+             (rel.source_type, rel.source_id)
+      INNER JOIN snapshots AS snap_2
+          ON (snap_2.child_type, snap_2.child_id) =
+             (rel.destination_type, rel.destination_id)
+      WHERE
+          snap_1.parent_id = :parent_id AND
+          snap_2.parent_id = :parent_id
+      """
+  db.session.execute(query, {
+      "user_id": user_id,
+      "parent_id": parent.id
+  })
+
+
+def _split_pairs(pairs, chunk_size):
+  """Split pairs into sorted chunks of the given size."""
+  pairs = sorted(pairs)
+  for index in range(0, len(pairs), chunk_size):
+    yield set(pairs[index:index + chunk_size])
+
+
+def _start_in_background(generator, operation, event, revisions):
+  """Start a background task for large snapshot scopes.
+
+  Args:
+    generator: SnapshotGenerator with added parent objects.
+    operation: "create" or "upsert".
+    event: A ggrc.models.Event instance that triggered the operation.
+    revisions: A dict of pairs with revisions for these pairs.
+
+  Returns:
+    The started background task or None if the scope is small enough to be
+    handled in the current request.
+  """
+  threshold = getattr(settings, "SNAPSHOT_BACKGROUND_THRESHOLD", 0)
+  if not threshold or generator.dry_run or event is None:
+    return None
+  for_create, for_update = generator.analyze()
+  size = len(for_create)
+  if operation == "upsert":
+    size += len(for_update)
+  if size <= threshold:
+    return None
+  from ggrc import views
+  return views.start_snapshot_scope(
+      operation=operation,
+      parents=[parent._asdict() for parent in generator.parents],
+      event_id=event.id,
+      revisions=[{
+          "parent": pair[0]._asdict(),
+          "child": pair[1]._asdict(),
+          "revision_id": revision_id,
+      } for pair, revision_id in revisions.iteritems()],
+  )
+
+
+def process_snapshot_scope(parameters, progress=None):
+  """Create or update snapshots of a scope in chunks.
+
+  This is the body of the background task started for large scopes.
+
+  Args:
+    parameters: dict with operation, parents, event_id and revisions as
+      stored by _start_in_background.
+    progress: callable receiving the number of processed and all pairs.
+
+  Returns:
+    OperationResponse
+  """
+  event = all_models.Event.query.get(parameters["event_id"])
+  revisions = {
+      Pair(Stub.from_dict(revision["parent"]),
+           Stub.from_dict(revision["child"])): revision["revision_id"]
+      for revision in parameters.get("revisions", [])
+  }
+  generator = SnapshotGenerator(dry_run=False)
+  for parent in parameters["parents"]:
+    obj = getattr(all_models, parent["type"]).query.get(parent["id"])
+    if obj is not None:
+      generator.add_parent(obj)
+  return generator.process_in_chunks(
+      event=event,
+      revisions=revisions,
+      with_update=parameters["operation"] == "upsert",
+      progress=progress,
+  )
 
 
 def create_snapshots(objs, event, revisions=None, _filter=None, dry_run=False):
   """Create snapshots of parent objects."""
   # pylint: disable=unused-argument
   if not revisions:
-    revisions = set()
+    revisions = dict()
 
   with benchmark("Snapshot.create_snapshots"):
     with benchmark("Snapshot.create_snapshots.init"):
@@ -510,6 +657,12 @@ def create_snapshots(objs, event, revisions=None, _filter=None, dry_run=False):
         db.session.add(obj)
         with benchmark("Snapshot.create_snapshots.add_parent_objects"):
           generator.add_parent(obj)
+    if _filter is None:
+      task = _start_in_background(generator, "create", event, revisions)
+      if task is not None:
+        return OperationResponse("create", True, set(), {
+            "background_task": task.id,
+        })
     with benchmark("Snapshot.create_snapshots.create"):
       return generator.create(event=event,
                               revisions=revisions,
@@ -520,7 +673,7 @@ def upsert_snapshots(objs, event, revisions=None, _filter=None, dry_run=False):
   """Update (and create if needed) snapshots of parent objects."""
   # pylint: disable=unused-argument
   if not revisions:
-    revisions = set()
+    revisions = dict()
 
   with benchmark("Snapshot.update_snapshots"):
     generator = SnapshotGenerator(dry_run)
@@ -529,33 +682,135 @@ def upsert_snapshots(objs, event, revisions=None, _filter=None, dry_run=False):
     for obj in objs:
       db.session.add(obj)
       generator.add_parent(obj)
+    if _filter is None:
+      task = _start_in_background(generator, "upsert", event, revisions)
+      if task is not None:
+        return OperationResponse("upsert", True, {}, {
+            "background_task": task.id,
+        })
     return generator.upsert(event=event, revisions=revisions, _filter=_filter)
 
 
+_CLONE_SNAPSHOTS_SQL = """
+    INSERT INTO snapshots (
+        parent_type,
+        parent_id,
+        child_type,
+        child_id,
+        revision_id,
+        modified_by_id,
+        context_id,
+        created_at,
+        updated_at
+    )
+    SELECT
+        :new_type,
+        :new_id,
+        child_type,
+        child_id,
+        revision_id,
+        :user_id,
+        :context_id,
+        now(),
+        now()
+    FROM snapshots
+    WHERE
+        parent_type = :base_type AND
+        parent_id = :base_id
+"""
+
+_CLONE_SCOPE_RELATIONSHIPS_SQL = """
+    INSERT IGNORE INTO relationships (
+        source_type,
+        source_id,
+        destination_type,
+        destination_id,
+        modified_by_id,
+        context_id,
+        created_at,
+        updated_at
+    )
+    SELECT
+        parent_type,
+        parent_id,
+        child_type,
+        child_id,
+        :user_id,
+        :context_id,
+        now(),
+        now()
+    FROM snapshots
+    WHERE
+        parent_type = :new_type AND
+        parent_id = :new_id
+"""
+
+
 def clone_scope(base_parent, new_parent, event):
   """Create exact copy of parent object scope.
 
+  Snapshots, their ACL entries and relationships of the new parent are copied
+  on the database side with INSERT ... SELECT statements, so the number of
+  queries does not depend on the size of the scope. Revisions are written with
+  a single bulk insert and the new scope is reindexed in bulk.
+
   Args:
     base_parent: Old parent object
     new_parent: New parent object
     event: Event that triggered scope cloning
   """
-
+  # pylint: disable=too-many-locals
   with benchmark("clone_scope.clone audit scope"):
-    source_snapshots = db.session.query(
-        models.Snapshot.child_type,
-        models.Snapshot.child_id,
-        models.Snapshot.revision_id
-    ).filter(
-        models.Snapshot.parent_type == base_parent.type,
-        models.Snapshot.parent_id == base_parent.id)
-
-    snapshot_revisions = {
-        Pair.from_4tuple((new_parent.type, new_parent.id, ctype, cid)): revid
-        for ctype, cid, revid in source_snapshots}
-
+    user_id = get_current_user_id()
+    context_id = new_parent.context_id
     parent = Stub(new_parent.type, new_parent.id)
-    children = {pair.child for pair in snapshot_revisions}
-    generator = SnapshotGenerator(dry_run=False)
-    generator.add_family(parent, children)
-    generator.create(event, snapshot_revisions)
+    params = {
+        "base_type": base_parent.type,
+        "base_id": base_parent.id,
+        "new_type": new_parent.type,
+        "new_id": new_parent.id,
+        "user_id": user_id,
+        "context_id": context_id,
+    }
+
+    with benchmark("clone_scope.copy snapshots"):
+      db.session.execute(_CLONE_SNAPSHOTS_SQL, params)
+
+    with benchmark("clone_scope.copy access control list"):
+      insert_scope_acl(parent, user_id)
+
+    with benchmark("clone_scope.create parent object -> snapshot rels"):
+      db.session.execute(_CLONE_SCOPE_RELATIONSHIPS_SQL, params)
+
+    with benchmark("clone_scope.create revision payload"):
+      snapshots = get_scope_snapshots(parent)
+      relationships = get_relationships({
+          (snapshot.parent_type, snapshot.parent_id,
+           snapshot.child_type, snapshot.child_id)
+          for snapshot in snapshots
+      })
+      revision_payload = [
+          create_snapshot_revision_dict("created", event.id, snapshot,
+                                        user_id, context_id)
+          for snapshot in snapshots
+      ] + [
+          create_relationship_revision_dict("created", event.id, relationship,
+                                            user_id, context_id)
+          for relationship in relationships
+      ]
+
+    with benchmark("clone_scope.write revisions to database"):
+      if revision_payload:
+        db.session.execute(models.Revision.__table__.insert(),
+                           revision_payload)
+
+    with benchmark("clone_scope.copy snapshot relationships"):
+      _copy_snapshot_relationships(parent, user_id)
+    db.session.commit()
+
+    with benchmark("clone_scope.reindex snapshots"):
+      reindex_pairs([
+          Pair.from_4tuple((snapshot.parent_type, snapshot.parent_id,
+                            snapshot.child_type, snapshot.child_id))
+          for snapshot in snapshots
+      ])
@@ -3,17 +3,16 @@
 
 """Handle acl"""
 
+import sqlalchemy as sa
 from sqlalchemy.sql.expression import tuple_
 
 from ggrc import db
 from ggrc.models import all_models
+from ggrc.rbac import permissions_cache
 
 
-def get_acl_payload(snapshots):
-  """Get ACL payload for newly created snapshots"""
-  acl_payload = []
-  parents = set((snapshot.parent_id, snapshot.parent_type)
-                for snapshot in snapshots)
+def _get_ac_roles():
+  """Get ids of audit roles and of the snapshot roles they propagate to."""
   ac_roles = db.session.query(
       all_models.AccessControlRole.id,
       all_models.AccessControlRole.name).filter(
@@ -21,7 +20,15 @@ def get_acl_payload(snapshots):
           "Auditors", "Audit Captains", "Auditors Snapshot Mapped",
           "Audit Captains Mapped"))
   )
-  ac_roles = {name: id_ for id_, name in ac_roles}
+  return {name: id_ for id_, name in ac_roles}
+
+
+def get_acl_payload(snapshots):
+  """Get ACL payload for newly created snapshots"""
+  acl_payload = []
+  parents = set((snapshot.parent_id, snapshot.parent_type)
+                for snapshot in snapshots)
+  ac_roles = _get_ac_roles()
   parent_roles = db.session.query(
       all_models.AccessControlList.id,
       all_models.AccessControlList.person_id,
@@ -46,3 +53,68 @@ def get_acl_payload(snapshots):
           "person_id": person_id
       })
   return acl_payload
+
+
+def insert_scope_acl(parent, user_id):
+  """Propagate audit roles to all snapshots of the parent scope.
+
+  ACL entries are created with a single INSERT ... SELECT statement from the
+  parent ACL entries and the snapshots that are already stored in the
+  database. The statement is not committed, cached permissions of people
+  with propagated roles are invalidated on commit.
+
+  Args:
+    parent: Stub of the parent object of snapshots.
+    user_id: id of the user creating the entries.
+  """
+  ac_roles = _get_ac_roles()
+  db.session.execute(sa.text("""
+      INSERT INTO access_control_list (
+          person_id,
+          ac_role_id,
+          object_id,
+          object_type,
+          parent_id,
+          modified_by_id,
+          created_at,
+          updated_at
+      )
+      SELECT
+          acl.person_id,
+          CASE acl.ac_role_id
+              WHEN :auditors THEN :auditors_mapped
+              ELSE :captains_mapped
+          END,
+          snap.id,
+          "Snapshot",
+          acl.id,
+          :user_id,
+          now(),
+          now()
+      FROM snapshots AS snap
+      INNER JOIN access_control_list AS acl
+          ON acl.object_type = snap.parent_type AND
+             acl.object_id = snap.parent_id
+      WHERE
+          snap.parent_type = :parent_type AND
+          snap.parent_id = :parent_id AND
+          acl.ac_role_id IN (:auditors, :captains)
+  """), {
+      "auditors": ac_roles["Auditors"],
+      "captains": ac_roles["Audit Captains"],
+      "auditors_mapped": ac_roles["Auditors Snapshot Mapped"],
+      "captains_mapped": ac_roles["Audit Captains Mapped"],
+      "user_id": user_id,
+      "parent_type": parent.type,
+      "parent_id": parent.id,
+  })
+  person_ids = db.session.query(
+      all_models.AccessControlList.person_id
+  ).filter(
+      all_models.AccessControlList.object_type == parent.type,
+      all_models.AccessControlList.object_id == parent.id,
+      all_models.AccessControlList.ac_role_id.in_(
+          (ac_roles["Auditors"], ac_roles["Audit Captains"])),
+  ).distinct()
+  permissions_cache.invalidate_on_commit(
+      {person_id for person_id, in person_ids})
@@ -112,23 +112,27 @@ def get_relationships(relationships):
       return set()
 
 
+def _get_snapshot_columns():
+  return db.session.query(
+      models.Snapshot.id,
+      models.Snapshot.context_id,
+      models.Snapshot.created_at,
+      models.Snapshot.updated_at,
+      models.Snapshot.parent_type,
+      models.Snapshot.parent_id,
+      models.Snapshot.child_type,
+      models.Snapshot.child_id,
+      models.Snapshot.revision_id,
+      models.Snapshot.modified_by_id,
+  )
+
+
 def get_snapshots(objects=None, ids=None):
   with benchmark("snapshotter.helpers.get_snapshots"):
     if objects and ids:
       raise Exception(
           "Insert only iterable of (parent, child) tuples or set of IDS")
-    columns = db.session.query(
-        models.Snapshot.id,
-        models.Snapshot.context_id,
-        models.Snapshot.created_at,
-        models.Snapshot.updated_at,
-        models.Snapshot.parent_type,
-        models.Snapshot.parent_id,
-        models.Snapshot.child_type,
-        models.Snapshot.child_id,
-        models.Snapshot.revision_id,
-        models.Snapshot.modified_by_id,
-    )
+    columns = _get_snapshot_columns()
     if objects:
       return columns.filter(
           tuple_(
@@ -144,6 +148,19 @@ def get_snapshots(objects=None, ids=None):
     return set()
 
 
+def get_scope_snapshots(parent):
+  """Retrieve all snapshots of a parent object.
+
+  Args:
+    parent: Stub of the parent object.
+  """
+  with benchmark("snapshotter.helpers.get_scope_snapshots"):
+    return _get_snapshot_columns().filter(
+        models.Snapshot.parent_type == parent.type,
+        models.Snapshot.parent_id == parent.id,
+    ).all()
+
+
 def create_json_stub(model_, context_id, object_id):
   from ggrc.models import all_models
   return {  # pylint: disable=protected-access
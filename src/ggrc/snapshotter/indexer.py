@@ -5,6 +5,7 @@
 
 import logging
 from collections import defaultdict
+from collections import OrderedDict
 import itertools
 
 from sqlalchemy.sql.expression import tuple_
@@ -12,9 +13,11 @@ from sqlalchemy import orm
 
 from ggrc import db
 from ggrc import models
+from ggrc import settings
 from ggrc.models import all_models
 from ggrc.fulltext.mysql import MysqlRecordProperty as Record
 from ggrc.fulltext import get_indexer
+from ggrc.fulltext import sort_keys
 from ggrc.models.reflection import AttributeInfo
 from ggrc.utils import generate_query_chunks
 
@@ -109,6 +112,40 @@ def get_searchable_attributes(attributes, cads, content):
   return searchable_values
 
 
+class RevisionRecordCache(object):
+  """LRU cache of fulltext records computed from revisions.
+
+  Records of a revision don't depend on the snapshot that points to it, so
+  they can be reused for all snapshots of the same revision. The cache must
+  not outlive a single reindex run since the records also depend on custom
+  attribute definitions.
+  """
+
+  def __init__(self, max_size):
+    self.max_size = max_size
+    self._records = OrderedDict()
+
+  def get(self, revision_id):
+    """Get cached records for a revision or None."""
+    records = self._records.pop(revision_id, None)
+    if records is not None:
+      self._records[revision_id] = records
+    return records
+
+  def set(self, revision_id, records):
+    """Store records of a revision and evict the least recently used."""
+    self._records.pop(revision_id, None)
+    self._records[revision_id] = records
+    while len(self._records) > self.max_size:
+      self._records.popitem(last=False)
+
+
+def _get_record_cache():
+  """Get a revision records cache for a multi-chunk reindex."""
+  size = getattr(settings, "SNAPSHOT_INDEX_CACHE_SIZE", 0)
+  return RevisionRecordCache(size) if size > 0 else None
+
+
 def reindex():
   """Reindex all snapshots."""
   columns = db.session.query(
@@ -117,9 +154,10 @@ def reindex():
       models.Snapshot.child_type,
       models.Snapshot.child_id,
   )
+  record_cache = _get_record_cache()
   for query_chunk in generate_query_chunks(columns):
     pairs = {Pair.from_4tuple(p) for p in query_chunk}
-    reindex_pairs(pairs)
+    reindex_pairs(pairs, record_cache=record_cache)
     db.session.commit()
 
 
@@ -133,9 +171,10 @@ def reindex_snapshots(snapshot_ids):
       models.Snapshot.child_type,
       models.Snapshot.child_id,
   ).filter(models.Snapshot.id.in_(snapshot_ids))
+  record_cache = _get_record_cache()
   for query_chunk in generate_query_chunks(columns):
     pairs = {Pair.from_4tuple(p) for p in query_chunk}
-    reindex_pairs(pairs)
+    reindex_pairs(pairs, record_cache=record_cache)
     db.session.commit()
 
 
@@ -149,6 +188,7 @@ def delete_records(snapshot_ids):
       Record.type == "Snapshot",
       Record.key.in_(snapshot_ids)
   ).delete(synchronize_session=False)
+  sort_keys.delete("Snapshot", snapshot_ids)
   db.session.commit()
 
 
@@ -240,15 +280,9 @@ def get_category_data(rec, category_item):
   yield newrec
 
 
-def get_properties(snapshot):
-  """Return properties for sent revision dict and pair object."""
-  properties = snapshot["revision"].copy()
-  properties.update({
-      "parent": PARENT_PROPERTY_TMPL.format(**snapshot),
-      "child": CHILD_PROPERTY_TMPL.format(**snapshot),
-      "child_type": snapshot["child_type"],
-      "child_id": snapshot["child_id"]
-  })
+def get_revision_properties(revision_properties):
+  """Return properties shared by all snapshots of a revision."""
+  properties = revision_properties.copy()
   assignees = properties.pop("assignees", None) or []
   for person, roles in assignees:
     if person:
@@ -257,6 +291,23 @@ def get_properties(snapshot):
   return properties
 
 
+def get_snapshot_properties(snapshot):
+  """Return properties that differ between snapshots of the same revision."""
+  return {
+      "parent": PARENT_PROPERTY_TMPL.format(**snapshot),
+      "child": CHILD_PROPERTY_TMPL.format(**snapshot),
+      "child_type": snapshot["child_type"],
+      "child_id": snapshot["child_id"]
+  }
+
+
+def get_properties(snapshot):
+  """Return properties for sent revision dict and pair object."""
+  properties = get_revision_properties(snapshot["revision"])
+  properties.update(get_snapshot_properties(snapshot))
+  return properties
+
+
 def get_record_value(prop, val, rec):
   """Return itearble object with record as element of that object."""
   if not prop or val is None:
@@ -294,17 +345,101 @@ def get_record_value(prop, val, rec):
   return []
 
 
-def reindex_pairs(pairs):
+def _get_records(properties, rec):
+  """Get fulltext records for all properties based on rec template."""
+  records = []
+  for prop, val in properties.items():
+    records.extend(get_record_value(prop, val, rec.copy()))
+  return records
+
+
+def _get_revision_records(revision, cads):
+  """Get fulltext records of a revision without snapshot specific fields.
+
+  Args:
+    revision: Revision instance with loaded content.
+    cads: list of custom attribute definitions for the revision type.
+  Returns:
+    list of record dicts with property, subproperty and content fields.
+  """
+  properties = get_revision_properties(get_searchable_attributes(
+      CLASS_PROPERTIES[revision.resource_type],
+      cads,
+      revision.content,
+  ))
+  # key and type are used only in warnings about unsupported values and get
+  # replaced by snapshot values for every snapshot of the revision.
+  return _get_records(properties, {
+      "key": revision.id,
+      "type": "Revision",
+      "subproperty": "",
+  })
+
+
+def _load_revision_records(revision_ids, record_cache=None):
+  """Get fulltext records for all given revisions.
+
+  Records are computed once per revision. Revisions found in record_cache
+  are not loaded from the database at all.
+
+  Returns:
+    dict with revision id as key and list of revision records as value.
+  """
+  revision_records = {}
+  if record_cache is not None:
+    for revision_id in revision_ids:
+      records = record_cache.get(revision_id)
+      if records is not None:
+        revision_records[revision_id] = records
+  missing_ids = set(revision_ids) - set(revision_records)
+  if not missing_ids:
+    return revision_records
+
+  cad_dict = _get_custom_attribute_dict()
+  revisions = all_models.Revision.query.filter(
+      all_models.Revision.id.in_(missing_ids)
+  ).options(
+      orm.load_only(
+          "id",
+          "resource_type",
+          "resource_id",
+          "_content",
+          "content_normalized",
+          "created_at",
+          "updated_at",
+      ),
+  )
+  for revision in revisions:
+    records = _get_revision_records(
+        revision, cad_dict[revision.resource_type])
+    revision_records[revision.id] = records
+    if record_cache is not None:
+      record_cache.set(revision.id, records)
+  return revision_records
+
+
+def reindex_pairs(pairs, record_cache=None):
   """Reindex selected snapshots.
 
+  Fulltext records that come from revision content are computed only once
+  for each distinct revision and copied to all snapshots pointing to it.
+
   Args:
     pairs: A list of parent-child pairs that uniquely represent snapshot
     object whose properties should be reindexed.
+    record_cache: optional RevisionRecordCache shared between calls.
   """
   if not pairs:
     return
-  snapshots = dict()
-  snapshot_query = models.Snapshot.query.filter(
+  snapshot_query = db.session.query(
+      models.Snapshot.id,
+      models.Snapshot.context_id,
+      models.Snapshot.parent_type,
+      models.Snapshot.parent_id,
+      models.Snapshot.child_type,
+      models.Snapshot.child_id,
+      models.Snapshot.revision_id,
+  ).filter(
       tuple_(
           models.Snapshot.parent_type,
           models.Snapshot.parent_id,
@@ -313,53 +448,31 @@ def reindex_pairs(pairs):
       ).in_(
           {pair.to_4tuple() for pair in pairs}
       )
-  ).options(
-      orm.subqueryload("revision").load_only(
-          "id",
-          "resource_type",
-          "resource_id",
-          "_content",
-      ),
-      orm.load_only(
-          "id",
-          "context_id",
-          "parent_type",
-          "parent_id",
-          "child_type",
-          "child_id",
-          "revision_id",
-      )
   )
-  cad_dict = _get_custom_attribute_dict()
-  for snapshot in snapshot_query:
-    revision = snapshot.revision
-    snapshots[snapshot.id] = {
-        "id": snapshot.id,
-        "context_id": snapshot.context_id,
-        "parent_type": snapshot.parent_type,
-        "parent_id": snapshot.parent_id,
-        "child_type": snapshot.child_type,
-        "child_id": snapshot.child_id,
-        "revision": get_searchable_attributes(
-            CLASS_PROPERTIES[revision.resource_type],
-            cad_dict[revision.resource_type],
-            revision.content)
-    }
+  snapshots = [snapshot._asdict() for snapshot in snapshot_query]
+  revision_records = _load_revision_records(
+      {snapshot["revision_id"] for snapshot in snapshots},
+      record_cache,
+  )
+
   search_payload = []
-  for snapshot in snapshots.values():
-    for prop, val in get_properties(snapshot).items():
-      search_payload.extend(
-          get_record_value(
-              prop,
-              val,
-              {
-                  "key": snapshot["id"],
-                  "type": "Snapshot",
-                  "context_id": snapshot["context_id"],
-                  "tags": TAG_TMPL.format(**snapshot),
-                  "subproperty": "",
-              }
-          )
-      )
-  delete_records(snapshots.keys())
+  for snapshot in snapshots:
+    snapshot_fields = {
+        "key": snapshot["id"],
+        "type": "Snapshot",
+        "context_id": snapshot["context_id"],
+        "tags": TAG_TMPL.format(**snapshot),
+    }
+    for record in revision_records.get(snapshot["revision_id"], []):
+      stamped = record.copy()
+      stamped.update(snapshot_fields)
+      search_payload.append(stamped)
+    search_payload.extend(_get_records(
+        get_snapshot_properties(snapshot),
+        dict(snapshot_fields, subproperty=""),
+    ))
+  snapshot_ids = [snapshot["id"] for snapshot in snapshots]
+  delete_records(snapshot_ids)
   insert_records(search_payload)
+  sort_keys.refresh("Snapshot", snapshot_ids)
+  db.session.commit()
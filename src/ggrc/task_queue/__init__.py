@@ -0,0 +1,220 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Database backed queue of the local background task backend.
+
+Tasks created with the "local" BACKGROUND_TASK_BACKEND are stored in the
+background_task_queue table and processed by worker processes started with
+`python -m ggrc.task_queue`. Workers claim tasks one by one under a named
+MySQL lock, which keeps per task name concurrency limits exact across all
+workers. Failed tasks are retried with an exponential backoff and claims of
+dead workers are released after BACKGROUND_TASK_TIMEOUT.
+
+Queue entries keep the time a task was runnable, claimed and finished, so
+waiting and running times of tasks can be checked with plain SQL.
+"""
+
+import datetime
+import os
+import socket
+import time
+from logging import getLogger
+
+import flask_login
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc import settings
+from ggrc.models.background_task import BackgroundTask
+from ggrc.models.background_task import QueuedBackgroundTask
+
+
+logger = getLogger(__name__)
+
+CLAIM_LOCK = "ggrc_background_task_queue"
+CLAIM_LOCK_TIMEOUT = 10  # seconds
+
+_QUEUE = QueuedBackgroundTask.__table__
+_TASKS = BackgroundTask.__table__
+
+
+def _now():
+  return datetime.datetime.utcnow()
+
+
+def get_worker_id():
+  return "{}:{}".format(socket.gethostname(), os.getpid())
+
+
+def get_retry_delay(attempts):
+  """Get number of seconds to wait before the next attempt of a task."""
+  return settings.BACKGROUND_TASK_RETRY_DELAY * 2 ** max(attempts - 1, 0)
+
+
+def _release_abandoned(connection, now):
+  """Release claims of workers that did not finish a task in time.
+
+  Abandoned tasks without remaining attempts are marked as failed.
+  """
+  expired = now - datetime.timedelta(seconds=settings.BACKGROUND_TASK_TIMEOUT)
+  abandoned = sa.and_(
+      _QUEUE.c.finished_at.is_(None),
+      _QUEUE.c.claimed_at < expired,
+  )
+  exhausted = sa.and_(
+      abandoned,
+      _QUEUE.c.attempts >= settings.BACKGROUND_TASK_MAX_ATTEMPTS,
+  )
+  task_ids = [task_id for task_id, in connection.execute(
+      sa.select([_QUEUE.c.background_task_id]).where(exhausted))]
+  if task_ids:
+    logger.warning("Background tasks %s were abandoned too many times",
+                   task_ids)
+    connection.execute(_TASKS.update().where(
+        _TASKS.c.id.in_(task_ids)).values(status="Failure"))
+    connection.execute(_QUEUE.update().where(exhausted).values(
+        finished_at=now))
+  connection.execute(_QUEUE.update().where(abandoned).values(
+      claimed_by=None,
+      claimed_at=None,
+  ))
+
+
+def _get_full_task_names(connection):
+  """Get names of tasks that reached their concurrency limit."""
+  limits = getattr(settings, "BACKGROUND_TASK_CONCURRENCY", None) or {}
+  if not limits:
+    return []
+  running = dict(connection.execute(sa.select([
+      _QUEUE.c.task_name,
+      sa.func.count(),
+  ]).where(sa.and_(
+      _QUEUE.c.task_name.in_(limits.keys()),
+      _QUEUE.c.claimed_by.isnot(None),
+      _QUEUE.c.finished_at.is_(None),
+  )).group_by(_QUEUE.c.task_name)).fetchall())
+  return [name for name, limit in limits.iteritems()
+          if limit and running.get(name, 0) >= limit]
+
+
+def claim(worker_id):
+  """Claim the next runnable task for a worker.
+
+  Args:
+    worker_id: unique name of the claiming worker.
+
+  Returns:
+    id of the claimed queue entry or None if there is no runnable task.
+  """
+  item_id = None
+  with db.engine.connect() as connection:
+    locked = connection.execute(
+        sa.text("SELECT GET_LOCK(:name, :timeout)"),
+        name=CLAIM_LOCK,
+        timeout=CLAIM_LOCK_TIMEOUT,
+    ).scalar()
+    if not locked:
+      return None
+    try:
+      with connection.begin():
+        now = _now()
+        _release_abandoned(connection, now)
+        condition = [
+            _QUEUE.c.finished_at.is_(None),
+            _QUEUE.c.claimed_by.is_(None),
+            _QUEUE.c.run_after <= now,
+        ]
+        full_names = _get_full_task_names(connection)
+        if full_names:
+          condition.append(_QUEUE.c.task_name.notin_(full_names))
+        item_id = connection.execute(
+            sa.select([_QUEUE.c.id]).where(
+                sa.and_(*condition)
+            ).order_by(
+                _QUEUE.c.run_after,
+                _QUEUE.c.id,
+            ).limit(1)
+        ).scalar()
+        if item_id is not None:
+          connection.execute(_QUEUE.update().where(
+              _QUEUE.c.id == item_id
+          ).values(
+              claimed_by=worker_id,
+              claimed_at=now,
+              attempts=_QUEUE.c.attempts + 1,
+          ))
+    finally:
+      connection.execute(sa.text("SELECT RELEASE_LOCK(:name)"),
+                         name=CLAIM_LOCK)
+  return item_id
+
+
+def _run_handler(app, task, item):
+  """Run the view function registered for the task url."""
+  endpoint, _ = app.url_map.bind("localhost").match(item.url,
+                                                    method=item.method)
+  with app.test_request_context(item.url, method=item.method):
+    if task.modified_by:
+      flask_login.login_user(task.modified_by)
+    app.view_functions[endpoint](task)
+
+
+def run(item_id):
+  """Run a claimed task and schedule a retry if it failed.
+
+  This must be called inside an application context.
+
+  Args:
+    item_id: id of the queue entry returned by claim.
+  """
+  from ggrc.app import app
+  item = QueuedBackgroundTask.query.get(item_id)
+  task = BackgroundTask.query.get(item.background_task_id)
+  started = time.time()
+  try:
+    _run_handler(app, task, item)
+  except Exception:  # pylint: disable=broad-except
+    logger.exception("Background task %s crashed", task.name)
+    db.session.rollback()
+    task.status = "Failure"
+  duration = time.time() - started
+  waited = (item.claimed_at - item.run_after).total_seconds()
+
+  if task.status == "Failure" and \
+     item.attempts < settings.BACKGROUND_TASK_MAX_ATTEMPTS:
+    delay = get_retry_delay(item.attempts)
+    logger.warning("Background task %s failed on attempt %s, retrying in %ss",
+                   task.name, item.attempts, delay)
+    task.status = "Pending"
+    item.run_after = _now() + datetime.timedelta(seconds=delay)
+    item.claimed_by = None
+    item.claimed_at = None
+  else:
+    item.finished_at = _now()
+  logger.info("Background task %s: %s on attempt %s, waited %.3fs, "
+              "ran %.3fs",
+              task.name, task.status, item.attempts, waited, duration)
+  db.session.add(task)
+  db.session.add(item)
+  db.session.commit()
+
+
+def work(worker_id=None, until_empty=False):
+  """Process queued tasks.
+
+  Args:
+    worker_id: unique name of the worker, host name and pid by default.
+    until_empty: stop when there is no runnable task instead of polling the
+      queue forever.
+  """
+  from ggrc.app import app
+  worker_id = worker_id or get_worker_id()
+  while True:
+    with app.app_context():
+      item_id = claim(worker_id)
+      if item_id is not None:
+        run(item_id)
+    if item_id is None:
+      if until_empty:
+        return
+      time.sleep(settings.BACKGROUND_TASK_POLL_INTERVAL)
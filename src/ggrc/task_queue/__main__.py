@@ -0,0 +1,39 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Start workers of the local background task backend.
+
+Usage:
+  python -m ggrc.task_queue [number of workers]
+"""
+
+import multiprocessing
+import sys
+
+from ggrc import db
+from ggrc import settings
+from ggrc import task_queue
+
+
+def _start_worker():
+  # Connections of the parent process must not be shared with workers.
+  db.engine.dispose()
+  task_queue.work()
+
+
+def main():
+  """Start worker processes and wait for them."""
+  if len(sys.argv) > 1:
+    count = int(sys.argv[1])
+  else:
+    count = settings.BACKGROUND_TASK_WORKERS
+  processes = [multiprocessing.Process(target=_start_worker)
+               for _ in range(count)]
+  for process in processes:
+    process.start()
+  for process in processes:
+    process.join()
+
+
+if __name__ == "__main__":
+  main()
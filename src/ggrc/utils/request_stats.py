@@ -0,0 +1,92 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Counters of database queries issued while handling a request.
+
+Preamble queries are queries issued by before_request handlers (such as the
+maintenance check) and queries issued by user and permission loading, which
+Flask-Login and the permissions provider do lazily inside request handlers.
+The lazy loaders mark their queries with count_preamble. The number of
+preamble queries is stored as g.preamble_query_count. If
+EXPOSE_PREAMBLE_QUERY_COUNT is enabled, it is returned in the
+X-GGRC-Preamble-Queries response header, so regressions on the common read
+path are visible without enabling full query recording.
+"""
+
+from contextlib import contextmanager
+from logging import getLogger
+
+import sqlalchemy
+from flask import g
+from flask import has_request_context
+
+from ggrc import settings
+
+
+logger = getLogger(__name__)
+
+PREAMBLE_HEADER = "X-GGRC-Preamble-Queries"
+
+
+def _count_query(*_):
+  """Increment query counter of the current request."""
+  if has_request_context():
+    g.query_count = getattr(g, "query_count", 0) + 1
+
+
+def reset_counters():
+  """Start counting queries of a new request."""
+  g.query_count = 0
+  g.preamble_query_count = None
+  g.preamble_depth = 0
+
+
+def store_preamble_count():
+  """Remember the number of queries issued before the request handler."""
+  g.preamble_query_count = getattr(g, "query_count", 0)
+
+
+@contextmanager
+def count_preamble():
+  """Count queries issued in the block as preamble queries.
+
+  Queries of blocks that run in before_request handlers are already counted
+  and nested blocks are counted only once.
+  """
+  if not has_request_context() or getattr(g, "preamble_depth", None) is None:
+    yield
+    return
+  start = getattr(g, "query_count", 0)
+  g.preamble_depth += 1
+  try:
+    yield
+  finally:
+    g.preamble_depth -= 1
+    if not g.preamble_depth and g.preamble_query_count is not None:
+      g.preamble_query_count += getattr(g, "query_count", 0) - start
+
+
+def expose_preamble_count(response):
+  """Add the number of preamble queries to the response."""
+  count = getattr(g, "preamble_query_count", None)
+  if count is not None:
+    logger.debug("Preamble queries: %s, total queries: %s",
+                 count, getattr(g, "query_count", 0))
+    if getattr(settings, "EXPOSE_PREAMBLE_QUERY_COUNT", False):
+      response.headers[PREAMBLE_HEADER] = str(count)
+  return response
+
+
+def init_app(app):
+  """Register query counters on the app.
+
+  This must be called after all other before_request handlers are registered,
+  since all queries are counted as preamble until the last of them.
+  """
+  if not sqlalchemy.event.contains(sqlalchemy.engine.Engine,
+                                   "after_cursor_execute", _count_query):
+    sqlalchemy.event.listen(sqlalchemy.engine.Engine,
+                            "after_cursor_execute", _count_query)
+  app.before_request_funcs.setdefault(None, []).insert(0, reset_counters)
+  app.before_request(store_preamble_count)
+  app.after_request(expose_preamble_count)
@@ -6,6 +6,8 @@
 from logging import getLogger
 
 from sqlalchemy.sql import select
+from sqlalchemy import bindparam
+from sqlalchemy import false
 from sqlalchemy import func
 from sqlalchemy import literal
 
@@ -13,6 +15,7 @@ from ggrc import db
 from ggrc.utils import benchmark
 from ggrc.login import get_current_user_id
 from ggrc.models import all_models
+from ggrc.models.types import LongJsonType
 from ggrc.snapshotter.rules import Types
 
 logger = getLogger(__name__)  # pylint: disable=invalid-name
@@ -97,7 +100,7 @@ def _update_existing_revisions(objects, revisions_table, obj_rev_map):
     db.session.execute(
         revisions_table.update()
         .where(revisions_table.c.id == rev_id)
-        .values(content=obj.log_json())
+        .values(content=obj.log_json(), content_normalized=False)
     )
 
 
@@ -203,3 +206,35 @@ def do_refresh_revisions():
   for type_ in sorted(Types.all | {"Assessment"}):
     logger.info("Updating revisions for: %s", type_)
     _fix_type_revisions(event, type_, _get_revisions_by_type(type_))
+
+
+def do_normalize_revisions(chunk_size=500):
+  """Store populated content for all revisions that are not normalized.
+
+  Content of normalized revisions is served as it is stored, without running
+  the populate_* helpers on every read.
+  """
+  revision = all_models.Revision
+  revisions_table = revision.__table__
+  update = revisions_table.update().where(
+      revisions_table.c.id == bindparam("revision_id")
+  ).values(
+      content=bindparam("populated_content", type_=LongJsonType),
+      content_normalized=True,
+  )
+  last_id = 0
+  while True:
+    with benchmark("Normalize revisions chunk"):
+      chunk = revision.query.filter(
+          revision.content_normalized == false(),
+          revision.id > last_id,
+      ).order_by(revision.id).limit(chunk_size).all()
+      if not chunk:
+        break
+      db.session.execute(update, [
+          {"revision_id": rev.id, "populated_content": rev.content}
+          for rev in chunk
+      ])
+      last_id = chunk[-1].id
+      db.session.commit()
+      db.session.expunge_all()
@@ -30,6 +30,25 @@ def find_user_by_id(user_id):
   return _base_user_query().get(int(user_id))
 
 
+def find_detached_user_by_id(user_id):
+  """Find Person object with its system wide roles in a separate session.
+
+  The returned object is detached with all attributes needed for permission
+  checks loaded, so it can be merged into other sessions with load=False
+  without issuing any queries.
+  """
+  session = orm.Session(bind=db.engine)
+  try:
+    return session.query(Person).options(
+        orm.undefer_group('Person_complete'),
+        orm.joinedload('user_roles').undefer_group('UserRole_complete'),
+        orm.joinedload('user_roles').joinedload('role').undefer_group(
+            'Role_complete'),
+    ).get(int(user_id))
+  finally:
+    session.close()
+
+
 def find_user_by_email(email):
   return _base_user_query().filter(Person.email == email).first()
 
@@ -105,21 +124,164 @@ def find_or_create_external_user(email, name):
   return None
 
 
+def is_external_lookup_enabled():
+  """Check if users are verified with Integration Service on lookup.
+
+  If this is disabled, find_user only looks up existing users in the DB.
+  """
+  return bool(settings.INTEGRATION_SERVICE_URL) and \
+      settings.INTEGRATION_SERVICE_URL != 'mock'
+
+
+def _chunks(values, size):
+  values = sorted(values)
+  for start in range(0, len(values), size):
+    yield values[start:start + size]
+
+
+def search_users(emails):
+  """Get names of people verified by Integration Service.
+
+  Args:
+    emails: emails to verify, emails outside of the authorized domain are
+      never verified.
+
+  Returns:
+    dict with names of verified people by their emails.
+  """
+  usernames = {}
+  for email in emails:
+    if is_authorized_domain(email):
+      usernames.setdefault(email.split("@")[0], email)
+  service = client.PersonClient()
+  names = {}
+  batch_size = getattr(settings, "EXTERNAL_PERSON_BATCH_SIZE", 100)
+  for chunk in _chunks(usernames, batch_size):
+    for ldap in service.search_persons(chunk):
+      email = usernames.get(ldap["username"])
+      if email:
+        names[email] = "%s %s" % (ldap["firstName"], ldap["lastName"])
+  return names
+
+
+def _create_users(names):
+  """Create users with Creator role with a single flush and commit.
+
+  Args:
+    names: dict with names of new users by their emails.
+
+  Returns:
+    tuple with the list of created users and a dict with validation error
+    messages of emails that could not be used.
+  """
+  users = []
+  errors = {}
+  user_id = get_current_user_id()
+  for email, name in sorted(names.iteritems()):
+    try:
+      user = Person(email=email, name=name, modified_by_id=user_id)
+    except ValueError as error:
+      errors[email] = error.message
+      continue
+    db.session.add(user)
+    users.append(user)
+  if users:
+    _add_creator_roles(users)
+  return users, errors
+
+
+def _add_creator_roles(users):
+  """Add Creator role to users and commit them with a single event."""
+  creator = basic_roles.creator()
+  for user in users:
+    db.session.add(UserRole(person=user, role=creator))
+  log_event(db.session)
+  db.session.commit()
+
+
+class PersonResolver(object):
+  """Resolver of people for sets of emails.
+
+  Existing people are loaded with one query for every
+  EXTERNAL_PERSON_BATCH_SIZE emails. If external lookup is enabled, only
+  people verified by Integration Service are resolved; they are verified in
+  batches and missing ones are created together. Results, including emails
+  that could not be resolved, are kept for the lifetime of the resolver.
+  """
+
+  def __init__(self):
+    self._people = {}
+    self._missing = set()
+    self._errors = {}
+
+  def _load_existing(self, emails):
+    batch_size = getattr(settings, "EXTERNAL_PERSON_BATCH_SIZE", 100)
+    for chunk in _chunks(emails, batch_size):
+      query = _base_user_query().options(
+          orm.joinedload('user_roles').joinedload('role'),
+      ).filter(Person.email.in_(chunk))
+      for person in query:
+        self._people[person.email.lower()] = person
+
+  def _resolve_external(self, emails):
+    """Resolve verified people, creating the missing ones."""
+    names = search_users(emails)
+    self._load_existing(names)
+    no_access = [
+        self._people[email] for email in names
+        if email in self._people and
+        self._people[email].system_wide_role == SystemWideRoles.NO_ACCESS
+    ]
+    if no_access:
+      _add_creator_roles(no_access)
+    new_users, errors = _create_users({
+        email: name for email, name in names.iteritems()
+        if email not in self._people
+    })
+    for user in new_users:
+      self._people[user.email.lower()] = user
+    self._errors.update(errors)
+
+  def resolve(self, emails):
+    """Resolve people for emails.
+
+    Args:
+      emails: iterable of emails.
+
+    Returns:
+      dict with resolved people by lower case emails.
+    """
+    requested = {email.strip().lower() for email in emails if email.strip()}
+    unknown = requested - self._missing - set(self._people)
+    if unknown:
+      if is_external_lookup_enabled():
+        self._resolve_external(unknown)
+      else:
+        self._load_existing(unknown)
+      self._missing.update(unknown - set(self._people))
+    return {email: self._people[email] for email in requested
+            if email in self._people}
+
+  def get(self, email):
+    """Resolve a single person.
+
+    Raises:
+      ValueError: if the person had to be created and the email is invalid.
+    """
+    email = email.strip().lower()
+    person = self.resolve([email]).get(email)
+    if email in self._errors:
+      raise ValueError(self._errors[email])
+    return person
+
+
 def find_user(email):
   """Find or generate user.
 
   If Integration Server is specified not found in DB user is generated
   with Creator role.
   """
-  if settings.INTEGRATION_SERVICE_URL == 'mock':
-    return find_user_by_email(email)
-
-  if settings.INTEGRATION_SERVICE_URL:
-    name = search_user(email)
-    if not name:
-      return None
-    return find_or_create_user_by_email(email, name)
-  return find_user_by_email(email)
+  return PersonResolver().get(email)
 
 
 def find_users(emails):
@@ -133,36 +295,24 @@ def find_users(emails):
         orm.undefer_group('Person_complete')).all()
 
   # Verify emails
-  usernames = [email.split('@')[0] for email in emails
-               if is_authorized_domain(email)]
-
-  service = client.PersonClient()
-  ldaps = service.search_persons(usernames)
-
-  authorized_domain = getattr(settings, "AUTHORIZED_DOMAIN", "")
-  verified_emails = {'%s@%s' % (ldap['username'], authorized_domain)
-                     for ldap in ldaps}
+  names = search_users(emails)
 
   # Find users in db
-  users = Person.query.filter(Person.email.in_(emails)).all()
-  found_emails = {user.email for user in users}
-
-  # Create new users
-  new_emails = verified_emails - found_emails
-  new_usernames = [email.split('@')[0] for email in new_emails]
-  new_users = [('%s@%s' % (ldap['username'], authorized_domain),
-                '%s %s' % (ldap['firstName'], ldap['lastName']))
-               for ldap in ldaps if ldap['username'] in new_usernames]
-
-  for email, name in new_users:
-    user = create_user(email,
-                       name=name,
-                       modified_by_id=get_current_user_id())
-    users.append(user)
+  users = Person.query.filter(Person.email.in_(emails)).options(
+      orm.undefer_group('Person_complete'),
+      orm.joinedload('user_roles').joinedload('role'),
+  ).all()
+  found_emails = {user.email.lower() for user in users}
 
   # Grant Creator role to all users
-  for user in users:
-    if user.system_wide_role == SystemWideRoles.NO_ACCESS:
-      add_creator_role(user)
+  no_access = [user for user in users
+               if user.system_wide_role == SystemWideRoles.NO_ACCESS]
+  if no_access:
+    _add_creator_roles(no_access)
 
-  return users
+  # Create new users
+  new_users, _ = _create_users({
+      email: name for email, name in names.iteritems()
+      if email.lower() not in found_emails
+  })
+  return users + new_users
@@ -26,17 +26,18 @@ from ggrc.builder.json import publish_representation
 from ggrc.converters import get_importables, get_exportables
 from ggrc.extensions import get_extension_modules
 from ggrc.fulltext import get_indexer, mixin
-from ggrc.integrations import issues
-from ggrc.integrations import integrations_errors
+from ggrc.integrations import synchronization
 from ggrc.login import get_current_user
 from ggrc.login import login_required
 from ggrc.login import admin_required
 from ggrc.models import all_models
+from ggrc.models import audit_summary
 from ggrc.models.background_task import create_task
 from ggrc.models.background_task import make_task_response
 from ggrc.models.background_task import queued_task
 from ggrc.models.reflection import AttributeInfo
 from ggrc.rbac import permissions
+from ggrc.rbac import user_access
 from ggrc.services.common import as_json
 from ggrc.services.common import inclusion_filter
 from ggrc.query import views as query_views
@@ -63,6 +64,14 @@ def refresh_revisions(_):
   return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
 
+@app.route("/_background_tasks/normalize_revisions", methods=["POST"])
+@queued_task
+def normalize_revisions(_):
+  """Web hook to store populated revision content."""
+  revisions.do_normalize_revisions()
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
+
+
 @app.route("/_background_tasks/reindex", methods=["POST"])
 @queued_task
 def reindex(_):
@@ -85,6 +94,47 @@ def compute_attributes(args):
     return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
 
+@app.route("/_background_tasks/compute_attributes_partition",
+           methods=["POST"])
+@queued_task
+def compute_attributes_partition(task):
+  """Web hook to compute attribute values of a single partition."""
+  from ggrc.data_platform import computed_attributes
+  computed_attributes.process_partition(task.parameters)
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
+
+
+@app.route("/_background_tasks/rebuild_audit_summaries", methods=["POST"])
+@queued_task
+def rebuild_audit_summaries(_):
+  """Web hook to recompute stored assessment counts of all audits."""
+  with benchmark("Rebuild audit summaries"):
+    audit_summary.rebuild()
+    db.session.commit()
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
+
+
+@app.route("/_background_tasks/rebuild_user_access", methods=["POST"])
+@queued_task
+def rebuild_user_access(task):
+  """Web hook to rebuild user access rows of people with changed roles."""
+  with benchmark("Run rebuild_user_access background task"):
+    user_access.rebuild(task.parameters.get("person_ids"))
+    db.session.commit()
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
+
+
+@app.route("/_background_tasks/snapshot_scope", methods=["POST"])
+@queued_task
+def snapshot_scope(task):
+  """Web hook to create and update snapshots of a large scope in chunks."""
+  from ggrc import snapshotter
+  with benchmark("Run snapshot_scope background task"):
+    snapshotter.process_snapshot_scope(task.parameters,
+                                       progress=task.update_progress)
+  return app.make_response(("success", 200, [("Content-Type", "text/html")]))
+
+
 @app.route('/_background_tasks/update_audit_issues', methods=['POST'])
 @queued_task
 def update_audit_issues(args):
@@ -113,22 +163,30 @@ def update_audit_issues(args):
       relationships.destination_type == 'Audit',
       relationships.destination_id == audit_id
   )
-  cli = issues.Client()
   issue_params = {
       'comment': message,
   }
+  assessment_ids = {}
   for enabled, issue_id, assessment_id in query.all():
-    if not enabled:
+    if enabled:
+      assessment_ids[issue_id] = assessment_id
+
+  with benchmark('Update IssueTracker issues of audit'):
+    results = synchronization.update_issues(
+        (issue_id, issue_params) for issue_id in sorted(assessment_ids))
+  failed = []
+  for result in results:
+    if result.success:
       continue
-
-    try:
-      cli.update_issue(issue_id, issue_params)
-    except integrations_errors.Error as error:
-      logger.error(
-          'Unable to update IssueTracker issue ID=%s '
-          'for Assessment ID=%s while archiving/unarchiving Audit ID=%s: %s',
-          issue_id, assessment_id, audit_id, error)
-  return app.make_response(('success', 200, [('Content-Type', 'text/html')]))
+    logger.error(
+        'Unable to update IssueTracker issue ID=%s '
+        'for Assessment ID=%s while archiving/unarchiving Audit ID=%s: %s',
+        result.issue_id, assessment_ids[result.issue_id], audit_id,
+        result.error)
+    failed.append(result._asdict())
+  return app.make_response((
+      json.dumps({'updated': len(results) - len(failed), 'failed': failed}),
+      200, [('Content-Type', 'application/json')]))
 
 
 def start_compute_attributes(revision_ids):
@@ -143,6 +201,40 @@ def start_compute_attributes(revision_ids):
   task.start()
 
 
+def start_compute_partition(**parameters):
+  """Start a background task for computing a computed attributes partition."""
+  return create_task(
+      name="compute_attributes_partition",
+      url=url_for(compute_attributes_partition.__name__),
+      parameters=parameters,
+      method=u"POST",
+      queued_callback=compute_attributes_partition
+  )
+
+
+def start_snapshot_scope(**parameters):
+  """Start a background task for creating snapshots of a large scope."""
+  task = create_task(
+      name="snapshot_scope",
+      url=url_for(snapshot_scope.__name__),
+      parameters=parameters,
+      method=u"POST",
+      queued_callback=snapshot_scope
+  )
+  return task
+
+
+def start_rebuild_user_access(person_ids):
+  """Start a background task for rebuilding user access rows."""
+  return create_task(
+      name="rebuild_user_access",
+      url=url_for(rebuild_user_access.__name__),
+      parameters={"person_ids": person_ids},
+      method=u"POST",
+      queued_callback=rebuild_user_access
+  )
+
+
 def start_update_audit_issues(audit_id, message):
   """Start a background task to update IssueTracker issues related to Audit."""
   task = create_task(
@@ -186,6 +278,8 @@ def do_reindex():
   with benchmark("Create records for %s" % "Snapshot"):
     reindex_snapshots()
   indexer.invalidate_cache()
+  from ggrc.data_platform import computed_attributes
+  computed_attributes.reindex_values()
   start_compute_attributes("all_latest")
 
 
@@ -193,7 +287,9 @@ def get_permissions_json():
   """Get all permissions for current user"""
   with benchmark("Get permission JSON"):
     permissions.permissions_for(permissions.get_user())
-    return json.dumps(getattr(g, '_request_permissions', None))
+    # Compiled permissions store contexts and resources as sets.
+    return json.dumps(getattr(g, '_request_permissions', None),
+                      default=sorted)
 
 
 def get_config_json():
@@ -442,6 +538,36 @@ def admin_refresh_revisions():
                          [('Content-Type', 'text/html')])))
 
 
+@app.route("/admin/normalize_revisions", methods=["POST"])
+@login_required
+@admin_required
+def admin_normalize_revisions():
+  """Calls a webhook that stores populated revision content."""
+  task_queue = create_task(
+      name="normalize_revisions",
+      url=url_for(normalize_revisions.__name__),
+      queued_callback=normalize_revisions,
+  )
+  return task_queue.make_response(
+      app.make_response(("scheduled %s" % task_queue.name, 200,
+                         [('Content-Type', 'text/html')])))
+
+
+@app.route("/admin/rebuild_audit_summaries", methods=["POST"])
+@login_required
+@admin_required
+def admin_rebuild_audit_summaries():
+  """Calls a webhook that recomputes stored audit summaries."""
+  task_queue = create_task(
+      name="rebuild_audit_summaries",
+      url=url_for(rebuild_audit_summaries.__name__),
+      queued_callback=rebuild_audit_summaries,
+  )
+  return task_queue.make_response(
+      app.make_response(("scheduled %s" % task_queue.name, 200,
+                         [('Content-Type', 'text/html')])))
+
+
 @app.route("/admin/compute_attributes", methods=["POST"])
 @login_required
 @admin_required
@@ -451,6 +577,9 @@ def send_event_job():
       revision_ids = request.get_json().get("revision_ids", [])
     else:
       revision_ids = "all_latest"
+    if request.args.get("full"):
+      from ggrc.data_platform import computed_attributes
+      computed_attributes.reset_watermarks()
     start_compute_attributes(revision_ids)
     return app.make_response(("success", 200, [("Content-Type", "text/html")]))
 
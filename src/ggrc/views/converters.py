@@ -7,6 +7,7 @@ This module handles all view related function to import and export pages
 including the import/export api endponts.
 """
 
+import csv
 from logging import getLogger
 
 from apiclient.errors import HttpError
@@ -137,6 +138,10 @@ def handle_import_request():
     response_json = json.dumps(response_data)
     headers = [("Content-Type", "application/json")]
     return current_app.make_response((response_json, 200, headers))
+  except (csv.Error, UnicodeDecodeError):
+    # csv rows are parsed lazily, all of them are read before any objects
+    # are imported
+    raise BadRequest("Wrong file format.")
   except:  # pylint: disable=bare-except
     logger.exception("Import failed")
   raise BadRequest("Import failed due to server error.")
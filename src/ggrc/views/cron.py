@@ -45,6 +45,10 @@ def half_hour_cron_endpoint():
   return job_runner("HALF_HOUR_CRON_JOBS")
 
 
+def minute_cron_endpoint():
+  return job_runner("MINUTE_CRON_JOBS")
+
+
 def init_cron_views(app):
   app.add_url_rule(
       "/nightly_cron_endpoint",
@@ -57,3 +61,9 @@ def init_cron_views(app):
       "half_hour_cron_endpoint",
       view_func=half_hour_cron_endpoint
   )
+
+  app.add_url_rule(
+      "/minute_cron_endpoint",
+      "minute_cron_endpoint",
+      view_func=minute_cron_endpoint
+  )
@@ -23,11 +23,12 @@ from ggrc.models import all_models
 from ggrc.models.audit import Audit
 from ggrc.models.program import Program
 from ggrc.rbac import permissions as rbac_permissions
+from ggrc.rbac import permissions_cache
 from ggrc.rbac.permissions_provider import DefaultUserPermissions
-from ggrc.services.common import _get_cache_manager
 from ggrc.services import signals
 from ggrc.services.registry import service
 from ggrc.utils import benchmark
+from ggrc.utils import request_stats
 from ggrc_basic_permissions import basic_roles
 from ggrc_basic_permissions.contributed_roles import lookup_role_implications
 from ggrc_basic_permissions.contributed_roles import BasicRoleDeclarations
@@ -47,8 +48,6 @@ blueprint = Blueprint(
     static_url_path='/static/ggrc_basic_permissions',
 )
 
-PERMISSION_CACHE_TIMEOUT = 3600  # 60 minutes
-
 
 def get_public_config(_):
   """Expose additional permissions-dependent config to client.
@@ -108,8 +107,10 @@ class UserPermissions(DefaultUserPermissions):
     return self._request_permissions
 
   def check_permissions(self):
-    if not self._request_permissions:
-      self.load_permissions()
+    # Empty permissions of anonymous users are loaded only once per request.
+    if self._request_permissions is None:
+      with request_stats.count_preamble():
+        self.load_permissions()
 
   def get_email_for(self, user):
     return user.email if hasattr(user, 'email') else 'ANONYMOUS'
@@ -156,37 +157,6 @@ def collect_permissions(src_permissions, context_id, permissions):
             })
 
 
-def query_memcache(key):
-  """Check if cached permissions are available
-
-  Args:
-      key (string): key of the stored permissions
-  Returns:
-      cache (memcache_client): memcache client or None if caching
-                               is not available
-      permissions_cache (dict): dict with all permissions or None if there
-                                was a cache miss
-  """
-  if not getattr(settings, 'MEMCACHE_MECHANISM', False):
-    return None, None
-
-  cache = _get_cache_manager().cache_object.memcache_client
-  cached_keys_set = cache.get('permissions:list') or set()
-  if key not in cached_keys_set:
-    # We set the permissions:list variable so that we are able to batch
-    # remove all permissions related keys from memcache
-    cached_keys_set.add(key)
-    cache.set('permissions:list', cached_keys_set, PERMISSION_CACHE_TIMEOUT)
-    return cache, None
-
-  permissions_cache = cache.get(key)
-  if permissions_cache:
-    # If the key is both in permissions:list and in memcache itself
-    # it is safe to return the cached permissions
-    return cache, permissions_cache
-  return cache, None
-
-
 def load_default_permissions(permissions):
   """Load default permissions for all users
 
@@ -500,28 +470,6 @@ def load_backlog_workflows(permissions):
             .append(wf_context_id)
 
 
-def store_results_into_memcache(permissions, cache, key):
-  """Load personal context for user
-
-  Args:
-      permissions (dict): dict where the permissions will be stored
-      cache (cache_manager): Cache manager that should be used for storing
-                             permissions
-      key (string): key of under which permissions should be stored
-  Returns:
-      None
-  """
-  if cache is None:
-    return
-
-  cached_keys_set = cache.get('permissions:list') or set()
-  if key in cached_keys_set:
-    # We only add the permissions to the cache if the
-    # key still exists in the permissions:list after
-    # the query has executed.
-    cache.set(key, permissions, PERMISSION_CACHE_TIMEOUT)
-
-
 def load_permissions_for(user):
   """Permissions is dictionary that can be exported to json to share with
   clients. Structure is:
@@ -541,10 +489,9 @@ def load_permissions_for(user):
   'terms' are the arguments to the 'condition'.
   """
   permissions = {}
-  key = 'permissions:{}'.format(user.id)
 
   with benchmark("load_permissions > query memcache"):
-    cache, result = query_memcache(key)
+    key, result = permissions_cache.get(user.id)
     if result:
       return result
 
@@ -577,8 +524,11 @@ def load_permissions_for(user):
   with benchmark("load_permissions > load backlog workflows"):
     load_backlog_workflows(permissions)
 
+  with benchmark("load_permissions > compile permissions"):
+    permissions_cache.compile_permissions(permissions)
+
   with benchmark("load_permissions > store results into memcache"):
-    store_results_into_memcache(permissions, cache, key)
+    permissions_cache.store(key, permissions)
 
   return permissions
 
@@ -5,12 +5,10 @@
 
 """Workflows module"""
 
-import collections
-import itertools
 from datetime import datetime, date
 from logging import getLogger
 from flask import Blueprint
-from sqlalchemy import inspect, and_, orm
+from sqlalchemy import inspect, and_, func, or_, orm
 
 from ggrc import db
 from ggrc.login import get_current_user
@@ -377,75 +375,145 @@ def _update_parent_status(parent, child_statuses):
   parent.status = new_status
 
 
+def _get_child_states(parent_id, child, due_date, parent_ids):
+  """Aggregate statuses and dates of children by their parents in SQL.
+
+  Args:
+    parent_id: column of the child model with ids of parents.
+    child: model of children, cycle tasks or cycle task groups.
+    due_date: column with due dates of children.
+    parent_ids: ids of parents to aggregate children for.
+
+  Returns:
+    dict of (statuses, start date, end date, next due date) tuples by parent
+    ids, the next due date is the earliest due date of children that are not
+    done. Parents without children are missing.
+  """
+  # pylint: disable=too-many-locals
+  rows = db.session.query(
+      parent_id,
+      child.status,
+      models.Cycle.is_verification_needed,
+      func.min(child.start_date),
+      func.max(child.end_date),
+      func.min(due_date),
+  ).join(
+      models.Cycle, models.Cycle.id == child.cycle_id,
+  ).filter(
+      parent_id.in_(parent_ids),
+  ).group_by(
+      parent_id, child.status, models.Cycle.is_verification_needed,
+  )
+  states = {}
+  for (id_, status, is_verification_needed,
+       start_date, end_date, next_due_date) in rows:
+    statuses, start_dates, end_dates, due_dates = states.setdefault(
+        id_, (set(), [], [], []))
+    statuses.add(status)
+    if start_date is not None:
+      start_dates.append(start_date)
+    if end_date is not None:
+      end_dates.append(end_date)
+    done_status = child.VERIFIED if is_verification_needed else child.FINISHED
+    if status != done_status and next_due_date is not None:
+      due_dates.append(next_due_date)
+  return {
+      id_: (
+          statuses,
+          min(start_dates) if start_dates else None,
+          max(end_dates) if end_dates else None,
+          min(due_dates) if due_dates else None,
+      )
+      for id_, (statuses, start_dates, end_dates, due_dates)
+      in states.iteritems()
+  }
+
+
+def _update_parent_state(parent, state):
+  """Update status and dates of a parent from the state of its children.
+
+  Only attributes with changed values are set, so that unchanged parents are
+  not logged or indexed.
+
+  Returns:
+    True if any of the attributes changed.
+  """
+  statuses, start_date, end_date, next_due_date = state
+  old_status = parent.status
+  _update_parent_status(parent, set(statuses))
+  changed = parent.status != old_status
+  for attr, value in (("start_date", start_date),
+                      ("end_date", end_date),
+                      ("next_due_date", next_due_date)):
+    if getattr(parent, attr) != value:
+      setattr(parent, attr, value)
+      changed = True
+  return changed
+
+
+def _not_backlog(query):
+  """Filter a query joined with workflows to skip backlog workflows."""
+  return query.filter(or_(models.Workflow.kind.is_(None),
+                          models.Workflow.kind != "Backlog"))
+
+
 def update_cycle_task_tree(objs):
-  """Update cycle task group status for sent cycle task"""
-  objs = [o for o in objs or [] if o.cycle.workflow.kind != "Backlog"]
-  if not objs:
+  """Update cycle task group status for sent cycle task
+
+  Statuses and dates of tasks are aggregated in SQL once for all cycle task
+  groups of the sent tasks, sibling tasks are not loaded.
+  """
+  group_ids = {obj.cycle_task_group_id for obj in objs or []
+               if obj.cycle_task_group_id is not None}
+  if not group_ids:
     return
-  groups_dict = {i.cycle_task_group_id: i.cycle_task_group for i in objs}
-  group_task_dict = collections.defaultdict(set)
-  # load all tasks that are in the same groups there are tasks that be updated
-  task_ids = [t.id for t in db.session.deleted
-              if isinstance(t, models.CycleTaskGroupObjectTask)]
-  for task in itertools.chain(db.session.dirty, db.session.new):
-    if not isinstance(task, models.CycleTaskGroupObjectTask):
-      continue
-    group_task_dict[task.cycle_task_group].add(task)
-    if task.id:
-      task_ids.append(task.id)
-  query = models.CycleTaskGroupObjectTask.query.filter(
-      models.CycleTaskGroupObjectTask.cycle_task_group_id.in_(groups_dict)
-  ).options(
-      orm.undefer_group("CycleTaskGroupObjectTask_complete")
-  )
-  if task_ids:
-    query = query.filter(models.CycleTaskGroupObjectTask.id.notin_(task_ids))
-  tasks = query.distinct().with_for_update().all()
-  for task in tasks:
-    group_task_dict[groups_dict[task.cycle_task_group_id]].add(task)
-  updated_groups = []
-  for group in groups_dict.itervalues():
-    old_state = [group.status, group.start_date, group.end_date,
-                 group.next_due_date]
-    _update_parent_status(group, {t.status for t in group_task_dict[group]})
-    group.start_date, group.end_date = _get_date_range(group_task_dict[group])
-    group.next_due_date = _get_min_end_date(group_task_dict[group])
-    if old_state != [group.status, group.start_date, group.end_date,
-                     group.next_due_date]:
-      # if status updated then add it in list. require to update cycle state
-      updated_groups.append(group)
+  # aggregate queries have to see pending changes of tasks
+  db.session.flush()
+  groups = _not_backlog(models.CycleTaskGroup.query.join(
+      models.Cycle, models.Cycle.id == models.CycleTaskGroup.cycle_id,
+  ).join(
+      models.Workflow, models.Workflow.id == models.Cycle.workflow_id,
+  ).filter(
+      models.CycleTaskGroup.id.in_(group_ids),
+  )).options(
+      orm.undefer_group("CycleTaskGroup_complete")
+  ).with_for_update().all()
+  if not groups:
+    return
+  task = models.CycleTaskGroupObjectTask
+  states = _get_child_states(task.cycle_task_group_id, task, task.end_date,
+                             [group.id for group in groups])
+  empty_state = (set(), None, None, None)
+  # if status updated then add it in list. require to update cycle state
+  updated_groups = [group for group in groups if _update_parent_state(
+      group, states.get(group.id, empty_state))]
   if updated_groups:
     update_cycle_task_group_parent_state(updated_groups)
 
 
 def update_cycle_task_group_parent_state(objs):
   """Update cycle status for sent cycle task group"""
-  objs = [obj for obj in objs or [] if obj.cycle.workflow.kind != "Backlog"]
-  if not objs:
+  cycle_ids = {obj.cycle_id for obj in objs or []}
+  if not cycle_ids:
     return
-  cycles_dict = {}
-  cycle_groups_dict = collections.defaultdict(set)
-  group_ids = []
-  for obj in objs:
-    cycle_groups_dict[obj.cycle].add(obj)
-    group_ids.append(obj.id)
-    cycles_dict[obj.cycle.id] = obj.cycle
-  # collect all groups that are in same cycles that group from sent list
-  groups = models.CycleTaskGroup.query.filter(
-      models.CycleTaskGroup.cycle_id.in_([c.id for c in cycle_groups_dict]),
-  ).options(
-      orm.undefer_group("CycleTaskGroup_complete")
-  ).distinct().with_for_update().all()
-  for group in groups:
-    cycle_groups_dict[cycles_dict[group.cycle_id]].add(group)
-
+  db.session.flush()
+  cycles = _not_backlog(models.Cycle.query.join(
+      models.Workflow, models.Workflow.id == models.Cycle.workflow_id,
+  ).filter(
+      models.Cycle.id.in_(cycle_ids),
+  )).options(
+      orm.undefer_group("Cycle_complete")
+  ).with_for_update().all()
+  if not cycles:
+    return
+  group = models.CycleTaskGroup
+  states = _get_child_states(group.cycle_id, group, group.next_due_date,
+                             [cycle.id for cycle in cycles])
+  empty_state = (set(), None, None, None)
   updated_cycles = []
-  for cycle in cycles_dict.itervalues():
+  for cycle in cycles:
     old_status = cycle.status
-    _update_parent_status(cycle, {g.status for g in cycle_groups_dict[cycle]})
-    cycle.start_date, cycle.end_date = _get_date_range(
-        cycle_groups_dict[cycle])
-    cycle.next_due_date = _get_min_next_due_date(cycle_groups_dict[cycle])
+    _update_parent_state(cycle, states.get(cycle.id, empty_state))
     if old_status != cycle.status:
       updated_cycles.append(Signals.StatusChangeSignalObjectContext(
           instance=cycle, old_status=old_status, new_status=cycle.status))
@@ -1,7 +1,9 @@
 # Copyright (C) 2018 Google Inc.
 # Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
+import sqlalchemy as sa
 from sqlalchemy import inspect
+from sqlalchemy.orm.session import Session
 
 from ggrc.services import signals
 from ggrc_workflows.models import (
@@ -10,6 +12,7 @@ from ggrc_workflows.models import (
     CycleTaskGroupObjectTask,
 )
 from ggrc_workflows.services.common import Signals
+from ggrc_workflows.notification import pusher
 from ggrc_workflows.notification.data_handler import (
     get_cycle_data,
     get_workflow_data,
@@ -42,6 +45,10 @@ def contributed_notifications():
 
 def register_listeners():
 
+  # notifications pushed during a transaction are inserted in bulk
+  sa.event.listen(Session, "before_commit", pusher.flush_pending)
+  sa.event.listen(Session, "after_rollback", pusher.clear_pending)
+
   @signals.Restful.model_put.connect_via(Workflow)
   def workflow_put_listener(sender, obj=None, src=None, service=None):
     handle_workflow_modify(sender, obj, src, service)
@@ -107,7 +107,8 @@ def get_cycle_created_task_data(notification):
   return result
 
 
-def get_cycle_task_due(notification, tasks_cache=None, del_rels_cache=None):
+def get_cycle_task_due(notification, tasks_cache=None, del_rels_cache=None,
+                       removed_objects_cache=None):
   """Build data needed for the "task due" email notifications.
 
   Args:
@@ -116,6 +117,8 @@ def get_cycle_task_due(notification, tasks_cache=None, del_rels_cache=None):
       accessible by their ID as a key
     del_rels_cache (dict): prefetched Revision instances representing the
       relationships to Tasks that were deleted grouped by task ID as a key
+    removed_objects_cache (dict): prefetched latest Revision instances of
+      objects removed from Tasks accessible by (type, id) tuple as a key
   Returns:
     Data aggregated in a dictionary, grouped by task assignee's email address,
     which is used as a key.
@@ -144,7 +147,11 @@ def get_cycle_task_due(notification, tasks_cache=None, del_rels_cache=None):
   force = cycle_task.cycle_task_group.cycle.workflow.notify_on_change
 
   url_filter_exp = u"id={}".format(cycle_task.cycle_id)
-  task_info = get_cycle_task_dict(cycle_task, del_rels_cache=del_rels_cache)
+  task_info = get_cycle_task_dict(
+      cycle_task,
+      del_rels_cache=del_rels_cache,
+      removed_objects_cache=removed_objects_cache,
+  )
 
   task_info["task_group"] = cycle_task.cycle_task_group
   task_info["task_group_url"] = cycle_task_group_url(
@@ -173,7 +180,8 @@ def get_cycle_task_due(notification, tasks_cache=None, del_rels_cache=None):
 
 
 def get_cycle_task_overdue_data(
-    notification, tasks_cache=None, del_rels_cache=None
+    notification, tasks_cache=None, del_rels_cache=None,
+    removed_objects_cache=None
 ):
   """Compile and return all relevant email data for task overdue notification.
 
@@ -183,6 +191,8 @@ def get_cycle_task_overdue_data(
       accessible by their ID as a key
     del_rels_cache (dict): prefetched Revision instances representing the
       relationships to Tasks that were deleted grouped by task ID as a key
+    removed_objects_cache (dict): prefetched latest Revision instances of
+      objects removed from Tasks accessible by (type, id) tuple as a key
   Returns:
     Dictionary containing the compiled data under the key that equals the
     overdue task assignee's email address.
@@ -211,7 +221,11 @@ def get_cycle_task_overdue_data(
   # the filter expression to be included in the cycle task's URL and
   # automatically applied when user visits it
   url_filter_exp = u"id=" + unicode(cycle_task.cycle_id)
-  task_info = get_cycle_task_dict(cycle_task, del_rels_cache=del_rels_cache)
+  task_info = get_cycle_task_dict(
+      cycle_task,
+      del_rels_cache=del_rels_cache,
+      removed_objects_cache=removed_objects_cache,
+  )
 
   task_info['task_group'] = cycle_task.cycle_task_group
   task_info['task_group_url'] = cycle_task_group_url(
@@ -393,7 +407,26 @@ def deleted_task_rels_cache(task_ids):
   return rels_cache
 
 
-def get_cycle_task_data(notification, tasks_cache=None, del_rels_cache=None):
+def removed_task_objects_cache(del_rels_cache):
+  """Compile and return latest revisions of objects removed from Tasks.
+
+  Args:
+    del_rels_cache (dict): Revision instances of deleted relationships
+      grouped by task ID, as returned by deleted_task_rels_cache.
+  Returns:
+    Dictionary containing latest Revision instances of removed objects with
+    (object type, object id) tuples used as keys.
+  """
+  stubs = {
+      _get_object_info_from_revision(rel, "CycleTaskGroupObjectTask")
+      for rels in del_rels_cache.itervalues()
+      for rel in rels
+  }
+  return data_handlers.get_latest_revisions(stubs)
+
+
+def get_cycle_task_data(notification, tasks_cache=None, del_rels_cache=None,
+                        removed_objects_cache=None):
   if tasks_cache is None:
     tasks_cache = {}
 
@@ -411,13 +444,16 @@ def get_cycle_task_data(notification, tasks_cache=None, del_rels_cache=None):
     return get_cycle_task_declined_data(notification)
   elif notification_name.endswith("cycle_task_due_in"):
     return get_cycle_task_due(
-        notification, tasks_cache=tasks_cache, del_rels_cache=del_rels_cache)
+        notification, tasks_cache=tasks_cache, del_rels_cache=del_rels_cache,
+        removed_objects_cache=removed_objects_cache)
   elif "cycle_task_due_today" == notification_name:
     return get_cycle_task_due(
-        notification, tasks_cache=tasks_cache, del_rels_cache=del_rels_cache)
+        notification, tasks_cache=tasks_cache, del_rels_cache=del_rels_cache,
+        removed_objects_cache=removed_objects_cache)
   elif notification_name == "cycle_task_overdue":
     return get_cycle_task_overdue_data(
-        notification, tasks_cache=tasks_cache, del_rels_cache=del_rels_cache)
+        notification, tasks_cache=tasks_cache, del_rels_cache=del_rels_cache,
+        removed_objects_cache=removed_objects_cache)
 
   return {}
 
@@ -533,7 +569,8 @@ def _get_object_info_from_revision(revision, known_type):
   return object_type, object_id
 
 
-def get_cycle_task_dict(cycle_task, del_rels_cache=None):
+def get_cycle_task_dict(cycle_task, del_rels_cache=None,
+                        removed_objects_cache=None):
 
   object_titles = []
   # every object should have a title or at least a name like person object
@@ -562,14 +599,16 @@ def get_cycle_task_dict(cycle_task, del_rels_cache=None):
     deleted_relationships = deleted_relationships_sources.union(
         deleted_relationships_destinations).all()
 
-  for deleted_relationship in deleted_relationships:
-    removed_object_type, removed_object_id = _get_object_info_from_revision(
-        deleted_relationship, "CycleTaskGroupObjectTask")
-    object_data = db.session.query(Revision).filter(
-        Revision.resource_type == removed_object_type,
-        Revision.resource_id == removed_object_id,
-    ).order_by(Revision.id.desc()).first()
+  removed_objects = [
+      _get_object_info_from_revision(rel, "CycleTaskGroupObjectTask")
+      for rel in deleted_relationships
+  ]
+  if removed_objects_cache is None:
+    removed_objects_cache = data_handlers.get_latest_revisions(
+        removed_objects)
 
+  for removed_object in removed_objects:
+    object_data = removed_objects_cache[removed_object]
     object_titles.append(
         u"{} [removed from task]".format(object_data.content["display_name"])
     )
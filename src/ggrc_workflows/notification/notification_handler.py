@@ -63,7 +63,7 @@ def done_tasks_notify(tasks):
   """
   if not tasks:
     return
-  pusher.get_notification_query(*tasks).delete(synchronize_session="fetch")
+  pusher.cancel(tasks)
   cycle_tasks_dict = collections.defaultdict(list)
   cycles_dict = {}
   task_ids = []
@@ -120,13 +120,9 @@ def not_done_tasks_notify(tasks):
       notification_types.add(n_type)
   # delete all notifications for cycles about all tasks compleated and
   # all tasks notifications that required to be updated
-  pusher.get_notification_query(
-      *(list(cycles) + tasks),
-      **{"notification_names": [
-          "all_cycle_tasks_completed"
-      ] + list(notification_types)}
-  ).delete(
-      synchronize_session="fetch"
+  pusher.cancel(
+      list(cycles) + tasks,
+      ["all_cycle_tasks_completed"] + list(notification_types),
   )
   notification_type_query = pusher.get_notification_types(*notification_types)
   notification_types_dict = {t.name: t for t in notification_type_query}
@@ -172,9 +168,7 @@ def handle_cycle_modify(obj):
     return
   if not obj.is_current:
     # delete all notifications for cycle tasks
-    pusher.get_notification_query(
-        *list(obj.cycle_task_group_object_tasks)
-    ).delete(synchronize_session="fetch")
+    pusher.cancel(obj.cycle_task_group_object_tasks)
 
 
 def handle_cycle_created(obj, manually):
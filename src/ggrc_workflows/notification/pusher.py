@@ -1,6 +1,16 @@
+"""Creation and scheduling of workflow notifications.
+
+Notifications pushed during a transaction are collected in the session and
+written with a single bulk insert before the transaction commits or before
+notifications are queried. Pushing the same notification type for the same
+object twice in a transaction creates one notification.
+"""
+
+import collections
 import datetime
 from dateutil import relativedelta
 
+import sqlalchemy as sa
 from sqlalchemy import or_
 from sqlalchemy import tuple_
 from sqlalchemy.sql.expression import true
@@ -12,9 +22,55 @@ from ggrc.models.notification import NotificationType
 
 REPEATABLE_NOTIFICATIONS = {"cycle_task_overdue", }
 
+_PENDING_INFO_KEY = "pending_workflow_notifications"
+
+
+def _get_pending(session=None):
+  """Get pending notifications by (object, notification type id) pairs."""
+  info = (session or db.session()).info
+  return info.setdefault(_PENDING_INFO_KEY, collections.OrderedDict())
+
+
+def flush_pending(session=None):
+  """Insert notifications pushed in the current transaction.
+
+  Args:
+    session: session of the transaction, db.session is used by default.
+  """
+  session = session or db.session()
+  pending = session.info.pop(_PENDING_INFO_KEY, None)
+  if not pending:
+    return
+  if any(obj.id is None for obj, _ in pending):
+    # notified objects created in this transaction need ids
+    session.flush()
+  now = datetime.datetime.now()
+  rows = [{
+      "object_id": obj.id,
+      "object_type": obj.type,
+      "notification_type_id": notification_type_id,
+      "send_on": send_on,
+      "repeating": repeating,
+      "custom_message": u"",
+      "force_notifications": False,
+      "created_at": now,
+      "updated_at": now,
+      "modified_by_id": None,
+      "context_id": None,
+  } for (obj, notification_type_id), (send_on, repeating)
+      in pending.iteritems() if not sa.inspect(obj).deleted]
+  if rows:
+    session.execute(Notification.__table__.insert(), rows)
+
+
+def clear_pending(session):
+  """Drop notifications pushed in a transaction that was rolled back."""
+  session.info.pop(_PENDING_INFO_KEY, None)
+
 
 def get_notification_query(*objs, **kwargs):
   # maybe we shouldn't return different thigs here.
+  flush_pending()
   keys = [(obj.id, obj.type) for obj in objs]
   notif_key = tuple_(Notification.object_id, Notification.object_type)
   query = Notification.query.filter(
@@ -45,14 +101,90 @@ def get_notification_type(name):
 
 
 def push(obj, notif_type, send_on=None, repeating=False):
-  return Notification(
-      object=obj,
-      notification_type=notif_type,
-      send_on=send_on or datetime.date.today(),
-      repeating=repeating,
+  """Schedule a notification to be inserted with the current transaction."""
+  _get_pending()[(obj, notif_type.id)] = (
+      send_on or datetime.date.today(),
+      repeating,
   )
 
 
+def cancel(objs, notification_names=None):
+  """Cancel pending notifications of objects.
+
+  Args:
+    objs: notified objects.
+    notification_names: names of notification types to cancel, all
+      notifications of the objects are cancelled if empty.
+  """
+  if not objs:
+    return
+  objs = set(objs)
+  type_ids = None
+  if notification_names:
+    type_ids = {n.id for n in get_notification_types(*notification_names)}
+  pending = _get_pending()
+  for obj, notification_type_id in pending.keys():
+    if obj in objs and (type_ids is None or notification_type_id in type_ids):
+      del pending[(obj, notification_type_id)]
+  get_notification_query(
+      *objs, notification_names=notification_names
+  ).delete(synchronize_session="fetch")
+
+
+def reschedule(send_at_by_obj, *notification_names):
+  """Move or create notifications of objects whose dates changed.
+
+  Notifications that would be sent in the past are cancelled, existing ones
+  are moved with one update per send date and missing ones are created.
+
+  Args:
+    send_at_by_obj: dict of new dates by notified objects.
+    notification_names: names of notification types to reschedule.
+  """
+  # pylint: disable=too-many-locals
+  if not send_at_by_obj:
+    return
+  today = datetime.datetime.combine(datetime.date.today(),
+                                    datetime.datetime.min.time())
+  notif_types = get_notification_types(*notification_names)
+  existing = get_notification_query(
+      *send_at_by_obj, notification_names=notification_names
+  ).with_entities(
+      Notification.id,
+      Notification.object_type,
+      Notification.object_id,
+      Notification.notification_type_id,
+  ).all()
+  contexts = {
+      (obj.type, obj.id, notif_type.id): (obj, get_notification_context(
+          notif_type, send_at_by_obj[obj]))
+      for obj in send_at_by_obj
+      for notif_type in notif_types
+  }
+  ids_by_send_on = collections.defaultdict(list)
+  for id_, object_type, object_id, notification_type_id in existing:
+    _, context = contexts.pop(
+        (object_type, object_id, notification_type_id), (None, None))
+    if context is None:
+      continue
+    # this should not be allowed, but if a cycle task is changed to a past
+    # date, we remove the current pending notification if it exists
+    send_on = context["send_on"]
+    ids_by_send_on[send_on if send_on >= today else None].append(id_)
+  for send_on, ids in ids_by_send_on.iteritems():
+    query = Notification.query.filter(Notification.id.in_(ids))
+    if send_on is None:
+      query.delete(synchronize_session="fetch")
+    else:
+      query.update({Notification.send_on: send_on},
+                   synchronize_session="fetch")
+  # when cycle date is moved in the future and no current create new
+  # notification
+  for obj, context in contexts.itervalues():
+    if context["send_on"] >= today:
+      push(obj, **context)
+
+
 def get_notification_context(notification_type, send_at):
   """Return notification context dict for sent data."""
   today = datetime.datetime.combine(datetime.date.today(),
@@ -71,27 +203,7 @@ def get_notification_context(notification_type, send_at):
 
 
 def update_or_create_notifications(obj, send_at, *notification_names):
-  today = datetime.datetime.combine(datetime.date.today(),
-                                    datetime.datetime.min.time())
-  types = {n.name: n for n in get_notification_types(*notification_names)}
-  for notification_name in notification_names:
-    notif_type = types[notification_name]
-    notification_context = get_notification_context(notif_type, send_at)
-    query = get_notification_query(
-        obj
-    ).filter(
-        Notification.notification_type_id == notif_type.id
-    )
-    send_on = notification_context["send_on"]
-    if send_on < today:
-      # this should not be allowed, but if a cycle task is changed to a past
-      # date, we remove the current pending notification if it exists
-      query.delete(synchronize_session="fetch")
-    elif not query.update({Notification.send_on: send_on},
-                          synchronize_session="fetch"):
-      # when cycle date is moved in the future and no current create new
-      # notification
-      push(obj, **notification_context)
+  reschedule({obj: send_at}, *notification_names)
 
 
 def create_notifications_for_objects(notification_type, send_at, *objs):
@@ -0,0 +1,29 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Dict based stand-in for the memcache client in tests without a testbed."""
+
+
+class FakeMemcache(object):
+  """Minimal dict based memcache client."""
+
+  def __init__(self):
+    self.data = {}
+
+  def get(self, key):
+    return self.data.get(key)
+
+  def get_multi(self, keys):
+    return {key: self.data[key] for key in keys if key in self.data}
+
+  def add_multi(self, mapping):
+    for key, value in mapping.iteritems():
+      self.data.setdefault(key, value)
+
+  def set(self, key, value, time=0):
+    # pylint: disable=unused-argument
+    self.data[key] = value
+
+  def offset_multi(self, mapping, initial_value=0):
+    for key, delta in mapping.iteritems():
+      self.data[key] = self.data.get(key, initial_value) + delta
@@ -0,0 +1,108 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for permission filters based on the user_access table."""
+
+import mock
+
+from ggrc import db
+from ggrc.models import all_models
+from ggrc.rbac import user_access
+from ggrc.rbac.user_access import UserAccess
+from ggrc.rbac.user_access import UserAccessStamp
+from integration.ggrc import TestCase
+from integration.ggrc.api_helper import Api
+from integration.ggrc.generator import ObjectGenerator
+from integration.ggrc.models import factories
+
+
+@mock.patch("ggrc.settings.USER_ACCESS_TABLE_THRESHOLD", 1, create=True)
+class TestUserAccess(TestCase):
+  """Test /query permission filters that join the user_access table."""
+
+  def setUp(self):
+    super(TestUserAccess, self).setUp()
+    self.api = Api()
+    self.creator = ObjectGenerator().generate_person(user_role="Creator")[1]
+    with factories.single_commit():
+      role = factories.AccessControlRoleFactory(object_type="Control",
+                                                read=True)
+      controls = [factories.ControlFactory() for _ in range(3)]
+      factories.ControlFactory()
+      self.acls = [
+          factories.AccessControlListFactory(object=control, ac_role=role,
+                                             person=self.creator)
+          for control in controls
+      ]
+    self.control_ids = {control.id for control in controls}
+
+  def _query_control_ids(self):
+    """Get ids of controls returned by /query for the creator."""
+    response = self.api.send_request(self.api.client.post, data=[{
+        "object_name": "Control",
+        "filters": {"expression": {}},
+        "type": "ids",
+    }], api_link="/query")
+    self.assert200(response)
+    return set(response.json[0]["Control"]["ids"])
+
+  def _get_resource_ids(self):
+    """Get ids of controls in user_access rows of the creator."""
+    return {row.resource_id for row in UserAccess.query.filter_by(
+        person_id=self.creator.id, action="read", resource_type="Control")}
+
+  def test_query_filter(self):
+    """Creator gets objects available through ACL joined from the table."""
+    self.api.set_user(self.creator)
+
+    self.assertEqual(self._query_control_ids(), self.control_ids)
+    self.assertIsNotNone(UserAccessStamp.query.get(self.creator.id))
+    self.assertEqual(self._get_resource_ids(), self.control_ids)
+
+    with mock.patch("ggrc.rbac.permissions.get_context_resource") as lists:
+      self.assertEqual(self._query_control_ids(), self.control_ids)
+    lists.assert_not_called()
+
+  def test_acl_change_rebuilds_rows(self):
+    """Removed ACL entries are not available after the rows are rebuilt."""
+    self.api.set_user(self.creator)
+    self.assertEqual(self._query_control_ids(), self.control_ids)
+
+    acl = all_models.AccessControlList.query.get(self.acls[0].id)
+    removed_id = acl.object_id
+    db.session.delete(acl)
+    db.session.commit()
+    self.assertIsNone(UserAccessStamp.query.get(self.creator.id))
+
+    self.api.set_user(self.creator)
+    self.assertEqual(self._query_control_ids(),
+                     self.control_ids - {removed_id})
+    self.assertIsNotNone(UserAccessStamp.query.get(self.creator.id))
+    self.assertEqual(self._get_resource_ids(),
+                     self.control_ids - {removed_id})
+
+  def test_rebuild_small_users(self):
+    """Rows of people with few rows are removed on rebuild."""
+    user_access.rebuild([self.creator.id])
+    db.session.commit()
+    self.assertEqual(self._get_resource_ids(), self.control_ids)
+
+    with mock.patch("ggrc.settings.USER_ACCESS_TABLE_THRESHOLD", 1000):
+      user_access.rebuild()
+      db.session.commit()
+    self.assertEqual(self._get_resource_ids(), set())
+    self.assertIsNone(UserAccessStamp.query.get(self.creator.id))
+
+  def test_unrestricted_rows(self):
+    """Unrestricted access is stored as rows without ids."""
+    self.assertEqual(user_access.get_access_rows({
+        "__GGRC_ADMIN__": {"__GGRC_ALL__": {"contexts": [0]}},
+        "read": {"Control": {"resources": [1]}},
+    }), [("__GGRC_ADMIN__", "__GGRC_ALL__", None, None)])
+    self.assertEqual(user_access.get_access_rows({
+        "read": {"Control": {"contexts": [None, 2], "resources": [1]}},
+    }), [
+        ("read", "Control", None, None),
+        ("read", "Control", None, 1),
+        ("read", "Control", 2, None),
+    ])
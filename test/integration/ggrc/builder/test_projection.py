@@ -0,0 +1,95 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for loading and publishing only requested fields."""
+
+import sqlalchemy as sa
+
+from ggrc import db
+from ggrc.builder import json
+from ggrc.models import all_models
+
+from integration.ggrc import TestCase
+from integration.ggrc.api_helper import Api
+from integration.ggrc.generator import ObjectGenerator
+from integration.ggrc.models import factories
+
+
+class TestProjection(TestCase):
+  """Tests for projection of published attributes."""
+
+  def setUp(self):
+    super(TestProjection, self).setUp()
+    self.client.get("/login")
+    with factories.single_commit():
+      self.assessment = factories.AssessmentFactory(
+          title="Projected", description="Long description")
+    self.assessment_id = self.assessment.id
+    db.session.expunge_all()
+
+  def test_load_published_columns(self):
+    """Only columns of requested attributes are loaded."""
+    fields = ["id", "title", "status", "context"]
+    options = json.projection_options(all_models.Assessment, fields)
+
+    assessment = db.session.query(all_models.Assessment).options(
+        *options).get(self.assessment_id)
+
+    unloaded = sa.inspect(assessment).unloaded
+    self.assertNotIn("title", unloaded)
+    self.assertNotIn("status", unloaded)
+    self.assertIn("description", unloaded)
+    self.assertIn("test_plan", unloaded)
+
+    published = json.publish(assessment, attribute_whitelist=fields)
+    self.assertEqual(published["title"], "Projected")
+    self.assertNotIn("description", published)
+    self.assertIn("selfLink", published)
+
+  def test_custom_publish_full_load(self):
+    """Attributes with custom publish logic require full objects."""
+    self.assertIsNone(
+        json.projection_options(all_models.Assessment, ["id", "audit"]))
+
+  def test_collection_fields(self):
+    """Collection GET returns only fields given in __fields."""
+    response = self.client.get(
+        "/api/assessments?__fields=id,title,selfLink")
+    self.assert200(response)
+
+    assessments = response.json["assessments_collection"]["assessments"]
+    self.assertEqual(assessments, [{
+        "id": self.assessment_id,
+        "title": "Projected",
+        "selfLink": "/api/assessments/{}".format(self.assessment_id),
+    }])
+
+  def test_creator_revision_fields(self):
+    """Creator gets only requested fields of revisions of own objects."""
+    api = Api()
+    _, creator = ObjectGenerator().generate_person(user_role="Creator")
+    acr_id = all_models.AccessControlRole.query.filter_by(
+        object_type="Policy", name="Admin").first().id
+    api.set_user(creator)
+    response = api.post(all_models.Policy, {
+        "policy": {
+            "title": "Creator Policy",
+            "context": None,
+            "access_control_list": [{
+                "person": {"id": creator.id, "type": "Person"},
+                "ac_role_id": acr_id,
+                "context": None,
+            }],
+        },
+    })
+    self.assertEqual(response.status_code, 201)
+    policy_id = response.json["policy"]["id"]
+
+    response = api.client.get(
+        "/api/revisions?__fields=id,action&resource_type=Policy")
+    self.assert200(response)
+
+    revisions = response.json["revisions_collection"]["revisions"]
+    revision = all_models.Revision.query.filter_by(
+        resource_type="Policy", resource_id=policy_id).one()
+    self.assertEqual(revisions, [{"id": revision.id, "action": "created"}])
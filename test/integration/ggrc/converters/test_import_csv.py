@@ -2,8 +2,12 @@
 # Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 """Tests for basic csv imports."""
 
+import csv
+import json
 from collections import OrderedDict
 
+import mock
+
 from ggrc import models
 from ggrc.converters import errors
 from integration.ggrc import TestCase
@@ -29,6 +33,22 @@ class TestBasicCsvImport(TestCase):
           "email": "{}@reciprocitylabs.com".format(person),
       }, "Administrator")
 
+  def test_wrong_format_row(self):
+    """Csv errors in rows after the first one result in a bad request."""
+    def get_rows(_):
+      yield ["Object type"]
+      raise csv.Error("line contains NUL")
+
+    with mock.patch("ggrc.gdrive.file_actions.get_gdrive_file",
+                    new=get_rows):
+      response = self.client.post(
+          "/_service/import_csv",
+          data=json.dumps({"id": "123"}),
+          content_type="application/json",
+          headers={"X-test-only": "false", "X-requested-by": "GGRC"},
+      )
+    self.assert400(response)
+
   def test_policy_basic_import(self):
     """Test basic policy import."""
     filename = "policy_basic_import.csv"
@@ -0,0 +1,74 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for lookup cache of objects referenced in import blocks."""
+
+from collections import OrderedDict
+
+import mock
+
+from ggrc import models
+from ggrc.converters.reference_cache import ReferenceCache
+from ggrc.utils import QueryCounter
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestReferenceCache(TestCase):
+  """Tests for ReferenceCache."""
+
+  @staticmethod
+  def _get_cache(column, values):
+    """Get reference cache for a block with a single column."""
+    block = mock.MagicMock()
+    block.headers = OrderedDict([(column, {})])
+    block.rows = [[value] for value in values]
+    return ReferenceCache(block)
+
+  def test_get_object(self):
+    """All objects referenced in a column are loaded with one query."""
+    with factories.single_commit():
+      controls = [factories.ControlFactory() for _ in range(5)]
+    slugs = [control.slug for control in controls]
+    cache = self._get_cache("slug", slugs + ["missing"])
+
+    with QueryCounter() as counter:
+      for slug in slugs:
+        obj = cache.get_object(models.Control, "slug", slug.lower(),
+                               column="slug")
+        self.assertEqual(obj.slug, slug)
+      self.assertIsNone(cache.get_object(models.Control, "slug", "missing",
+                                         column="slug"))
+      self.assertEqual(counter.get, 1)
+
+  def test_get_object_not_prefetched(self):
+    """Values missing from the column are loaded and cached on lookup."""
+    control = factories.ControlFactory()
+    control_id, slug = control.id, control.slug
+    cache = self._get_cache("slug", [])
+
+    with QueryCounter() as counter:
+      for _ in range(3):
+        obj = cache.get_object(models.Control, "slug", slug, column="slug")
+        self.assertEqual(obj.id, control_id)
+      self.assertEqual(counter.get, 1)
+
+  def test_get_ids(self):
+    """Ids of objects with duplicate values are loaded for a column."""
+    with factories.single_commit():
+      control = factories.ControlFactory(title="Duplicate title")
+    control_id = control.id
+    cache = self._get_cache("title", ["Duplicate title", "Unique title"])
+
+    with QueryCounter() as counter:
+      self.assertEqual(
+          cache.get_ids(models.Control, "title", "duplicate title",
+                        column="title"),
+          {control_id},
+      )
+      self.assertEqual(
+          cache.get_ids(models.Control, "title", "Unique title",
+                        column="title"),
+          set(),
+      )
+      self.assertEqual(counter.get, 1)
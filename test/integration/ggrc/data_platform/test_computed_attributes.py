@@ -4,9 +4,14 @@
 """Test last assessment module."""
 
 
+from sqlalchemy import func
+
+from ggrc import db
+from ggrc import models
 from ggrc.data_platform import computed_attributes
 
 from integration.ggrc import TestCase
+from integration.ggrc.models import factories
 
 
 class TestComputedAttributes(TestCase):
@@ -25,3 +30,48 @@ class TestComputedAttributes(TestCase):
             ("Objective", "last_assessment_date"),
         }
     )
+
+  def test_get_partitions(self):
+    """Objects are split by attribute, type and id range."""
+    partitions = computed_attributes.get_partitions({
+        "attr": {("Control", 3), ("Control", 1), ("Control", 2),
+                 ("Objective", 5)},
+    }, 2)
+    self.assertEqual(list(partitions), [
+        ("attr", "Control", [1, 2]),
+        ("attr", "Control", [3]),
+        ("attr", "Objective", [5]),
+    ])
+
+  def test_all_latest_watermarks(self):
+    """All latest computation only processes revisions after watermarks."""
+    factories.ControlFactory()
+    last_revision_id = db.session.query(func.max(models.Revision.id)).scalar()
+    attributes = computed_attributes.get_computed_attributes()
+
+    computed_attributes.compute_attributes("all_latest")
+
+    watermarks = computed_attributes.get_watermarks(attributes)
+    self.assertEqual(
+        watermarks,
+        {attr.attribute_template_id: last_revision_id for attr in attributes},
+    )
+    self.assertEqual(computed_attributes.get_changed_objects(attributes), {})
+
+  def test_partition_watermarks(self):
+    """Pending watermark is stored when the last partition completes."""
+    first, second = computed_attributes.get_computed_attributes()
+    partitions = [(first, "Control", [1]), (first, "Control", [2])]
+
+    computed_attributes.start_watermarks([first, second], partitions, 10)
+    get_watermarks = computed_attributes.get_watermarks
+    self.assertEqual(get_watermarks([first, second]),
+                     {first.attribute_template_id: None,
+                      second.attribute_template_id: 10})
+
+    computed_attributes.complete_partition(first, 10)
+    self.assertEqual(get_watermarks([first]),
+                     {first.attribute_template_id: None})
+    computed_attributes.complete_partition(first, 10)
+    self.assertEqual(get_watermarks([first]),
+                     {first.attribute_template_id: 10})
@@ -0,0 +1,59 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Integration tests for asynchronous fulltext indexing."""
+
+import mock
+
+from ggrc import db
+from ggrc.fulltext import outbox
+from ggrc.fulltext.mysql import MysqlRecordProperty
+from ggrc.models import all_models
+
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+@mock.patch("ggrc.fulltext.outbox.is_enabled", return_value=True)
+class TestFulltextOutbox(TestCase):
+  """Tests for fulltext index outbox."""
+
+  @staticmethod
+  def _get_title_record(obj):
+    return MysqlRecordProperty.query.filter(
+        MysqlRecordProperty.type == obj.type,
+        MysqlRecordProperty.key == obj.id,
+        MysqlRecordProperty.property == "title",
+    ).first()
+
+  def test_commit_enqueues(self, _):
+    """Committed changes are stored in the outbox and not indexed."""
+    with factories.single_commit():
+      market = factories.MarketFactory(title="outbox market")
+
+    self.assertIsNone(self._get_title_record(market))
+    entry = outbox.FulltextIndexOutbox.query.get(("Market", market.id))
+    self.assertIsNotNone(entry)
+    self.assertEqual(outbox.get_stats()["pending"], 1)
+
+  def test_coalescing(self, _):
+    """Repeated changes of a pending object are stored in a single row."""
+    with factories.single_commit():
+      market = factories.MarketFactory()
+    market = all_models.Market.query.get(market.id)
+    market.title = "changed title"
+    db.session.commit()
+
+    entries = outbox.FulltextIndexOutbox.query.all()
+    self.assertEqual(len(entries), 1)
+    self.assertEqual(entries[0].version, 2)
+
+  def test_drain(self, _):
+    """Draining the outbox indexes stored objects."""
+    with factories.single_commit():
+      market = factories.MarketFactory(title="outbox market")
+
+    self.assertEqual(outbox.drain(batch_size=10), 1)
+
+    self.assertEqual(self._get_title_record(market).content, "outbox market")
+    self.assertEqual(outbox.get_stats()["pending"], 0)
@@ -0,0 +1,73 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for invalidation of stored person object counts."""
+
+import datetime
+
+from ggrc import db
+from ggrc.models import person_object_count
+from ggrc.models.person_object_count import PersonObjectCount
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestPersonObjectCount(TestCase):
+  """Tests for stale marking of stored counters."""
+
+  def setUp(self):
+    super(TestPersonObjectCount, self).setUp()
+    with factories.single_commit():
+      self.assignee = factories.PersonFactory()
+      self.other = factories.PersonFactory()
+      self.control = factories.ControlFactory()
+      self.program = factories.ProgramFactory()
+      role = factories.AccessControlRoleFactory(object_type="Control")
+      factories.AccessControlListFactory(ac_role=role, object=self.control,
+                                         person=self.assignee)
+    self.person_ids = (self.assignee.id, self.other.id)
+    for person_id in self.person_ids:
+      db.session.add(PersonObjectCount(
+          person_id=person_id,
+          counter=person_object_count.MY_WORK,
+          object_type="Control",
+          count=0,
+          updated_at=datetime.datetime.now(),
+      ))
+    db.session.commit()
+
+  def _stale(self):
+    """Get stale flags of stored counters by person id."""
+    return {
+        row.person_id: row.stale
+        for row in PersonObjectCount.query.filter(
+            PersonObjectCount.person_id.in_(self.person_ids))
+    }
+
+  def test_mapping_people(self):
+    """Mappings invalidate counters of people assigned to mapped objects."""
+    factories.RelationshipFactory(source=self.program,
+                                  destination=self.control)
+    self.assertEqual(self._stale(),
+                     {self.assignee.id: True, self.other.id: False})
+
+  def test_concurrent_invalidation(self):
+    """Counters invalidated after they were read are not stored as fresh."""
+    person_object_count.mark_stale(person_ids=[self.assignee.id])
+    db.session.commit()
+    _, versions = person_object_count.get_counts(
+        self.assignee.id, person_object_count.MY_WORK)
+    person_object_count.mark_stale(person_ids=[self.assignee.id])
+    db.session.commit()
+
+    person_object_count.store_counts(
+        self.assignee.id, person_object_count.MY_WORK, {"Control": 1},
+        versions)
+    self.assertTrue(self._stale()[self.assignee.id])
+
+    _, versions = person_object_count.get_counts(
+        self.assignee.id, person_object_count.MY_WORK)
+    person_object_count.store_counts(
+        self.assignee.id, person_object_count.MY_WORK, {"Control": 1},
+        versions)
+    self.assertFalse(self._stale()[self.assignee.id])
@@ -426,3 +426,64 @@ class TestClonable(SnapshotterBaseTestCase):
         ).count(),
         0, "No snapshots should exist for new control."
     )
+
+  def test_audit_snapshot_scope_clone_acl(self):
+    """Test that snapshot ACL and relationships of the copy are created."""
+    with factories.single_commit():
+      program = factories.ProgramFactory()
+      controls = [factories.ControlFactory() for _ in range(3)]
+      for control in controls:
+        factories.RelationshipFactory(source=program, destination=control)
+    control_ids = {control.id for control in controls}
+    self.create_audit(self.refresh_object(program))
+    audit = models.Audit.query.filter_by(title="Snapshotable audit").one()
+
+    self.clone_object(audit)
+
+    audit_copy = models.Audit.query.filter_by(
+        title="Snapshotable audit - copy 1").one()
+    snapshots = models.Snapshot.query.filter_by(
+        parent_type="Audit", parent_id=audit_copy.id).all()
+    snapshot_ids = {snapshot.id for snapshot in snapshots}
+    self.assertEqual({snapshot.child_id for snapshot in snapshots},
+                     control_ids)
+
+    audit_acl = AccessControlList.query.join(AccessControlRole).filter(
+        AccessControlList.object_type == "Audit",
+        AccessControlList.object_id == audit_copy.id,
+        AccessControlRole.name.in_(("Auditors", "Audit Captains")),
+    ).all()
+    snapshot_acl = AccessControlList.query.filter(
+        AccessControlList.object_type == "Snapshot",
+        AccessControlList.object_id.in_(snapshot_ids),
+    ).all()
+    self.assertEqual(
+        {(acl.object_id, acl.parent_id, acl.person_id)
+         for acl in snapshot_acl},
+        {(snapshot_id, acl.id, acl.person_id)
+         for snapshot_id in snapshot_ids for acl in audit_acl},
+    )
+
+    relationships = models.Relationship.query.filter_by(
+        source_type="Audit", source_id=audit_copy.id,
+        destination_type="Control").all()
+    self.assertEqual({rel.destination_id for rel in relationships},
+                     control_ids)
+    self.assertEqual(
+        models.Revision.query.filter(
+            models.Revision.resource_type == "Snapshot",
+            models.Revision.resource_id.in_(snapshot_ids),
+        ).count(),
+        len(snapshot_ids),
+    )
+
+  def test_generate_attribute(self):
+    """Test that the lowest unused copy number is used for a new copy."""
+    with factories.single_commit():
+      audit = factories.AuditFactory(title="Audit 100%")
+      for title in ("Audit 100% - copy 1", "audit 100% - COPY 3",
+                    "Audit 100% - copy x", "Audit 1000 - copy 2"):
+        factories.AuditFactory(title=title)
+
+    self.assertEqual(audit.generate_attribute("title"),
+                     "Audit 100% - copy 2")
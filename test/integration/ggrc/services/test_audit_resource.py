@@ -0,0 +1,76 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for /api/audits endpoints."""
+
+from ggrc import db
+from ggrc.models import all_models
+from ggrc.models import audit_summary
+
+from integration.ggrc import api_helper
+from integration.ggrc.models import factories
+from integration.ggrc.services import TestCase
+
+
+class TestAuditResource(TestCase):
+  """Tests for special audit api endpoints."""
+
+  def setUp(self):
+    super(TestAuditResource, self).setUp()
+    self.client.get("/login")
+    self.api = api_helper.Api()
+
+  def _get_summary(self, audit_id):
+    """Helper for retrieving audit summary."""
+    response = self.client.get("/api/audits/{}/summary".format(audit_id))
+    self.assert200(response)
+    return sorted(tuple(item) for item in response.json)
+
+  def test_summary_counts(self):
+    """Audit summary contains assessment count for each status."""
+    with factories.single_commit():
+      audit = factories.AuditFactory()
+      for status in ("Not Started", "Not Started", "In Progress"):
+        factories.AssessmentFactory(audit=audit, status=status)
+      factories.AssessmentFactory()  # assessment in another audit
+    audit_id = audit.id
+
+    self.assertEqual(self._get_summary(audit_id), [
+        (u"In Progress", False, 1),
+        (u"Not Started", False, 2),
+    ])
+
+  def test_summary_status_change(self):
+    """Audit summary follows assessment status changes and deletion."""
+    with factories.single_commit():
+      audit = factories.AuditFactory()
+      assessment = factories.AssessmentFactory(audit=audit)
+      factories.AssessmentFactory(audit=audit)
+    audit_id = audit.id
+
+    assessment = all_models.Assessment.query.get(assessment.id)
+    self.api.modify_object(assessment, {"status": "In Progress"})
+    self.assertEqual(self._get_summary(audit_id), [
+        (u"In Progress", False, 1),
+        (u"Not Started", False, 1),
+    ])
+
+    assessment = all_models.Assessment.query.get(assessment.id)
+    self.api.delete(assessment)
+    self.assertEqual(self._get_summary(audit_id), [
+        (u"Not Started", False, 1),
+    ])
+
+  def test_rebuild(self):
+    """Rebuild restores summaries from the assessments table."""
+    with factories.single_commit():
+      audit = factories.AuditFactory()
+      factories.AssessmentFactory(audit=audit)
+    audit_id = audit.id
+    db.session.execute(audit_summary.AuditSummary.__table__.delete())
+
+    audit_summary.rebuild([audit_id])
+
+    self.assertEqual(audit_summary.get_summary(audit_id), [
+        (u"Not Started", False, 1),
+    ])
@@ -0,0 +1,104 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""
+Test bulk mapping REST API
+"""
+
+import json
+
+from ggrc.models import all_models
+from integration.ggrc.generator import ObjectGenerator
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+
+
+class TestBulkMapping(TestCase):
+  """Test /api/relationships/bulk_map and bulk_unmap"""
+
+  def setUp(self):
+    super(TestBulkMapping, self).setUp()
+    with factories.single_commit():
+      self.program = factories.ProgramFactory()
+      self.controls = [factories.ControlFactory() for _ in range(3)]
+    self.program_id = self.program.id
+    self.control_ids = [control.id for control in self.controls]
+
+  def _post(self, endpoint, pairs):
+    return self.client.post(
+        "/api/relationships/{}".format(endpoint),
+        data=json.dumps(pairs),
+        content_type="application/json",
+        headers={"X-Requested-By": "GGRC"},
+    )
+
+  def _pairs(self, control_ids):
+    return [{
+        "source": {"type": "Program", "id": self.program_id},
+        "destination": {"type": "Control", "id": control_id},
+    } for control_id in control_ids]
+
+  def _mapped_ids(self):
+    rel = all_models.Relationship
+    return {relationship.destination_id for relationship in rel.query.filter(
+        rel.source_type == "Program",
+        rel.source_id == self.program_id,
+        rel.destination_type == "Control",
+    )}
+
+  def test_bulk_map(self):
+    """Pairs are mapped once with revisions of created relationships."""
+    response = self._post("bulk_map", self._pairs(self.control_ids[:2]))
+    self.assert200(response)
+    self.assertEqual(response.json, {"created": 2, "existing": 0})
+    self.assertEqual(self._mapped_ids(), set(self.control_ids[:2]))
+    revisions = all_models.Revision.query.filter_by(
+        resource_type="Relationship", action="created").all()
+    self.assertEqual(len(revisions), 2)
+    self.assertEqual(len({revision.event_id for revision in revisions}), 1)
+
+    response = self._post("bulk_map", self._pairs(self.control_ids))
+    self.assert200(response)
+    self.assertEqual(response.json, {"created": 1, "existing": 2})
+    self.assertEqual(self._mapped_ids(), set(self.control_ids))
+
+  def test_bulk_unmap(self):
+    """Mapped pairs are unmapped in any direction."""
+    self._post("bulk_map", self._pairs(self.control_ids))
+    reversed_pairs = [{
+        "source": pair["destination"],
+        "destination": pair["source"],
+    } for pair in self._pairs(self.control_ids[:2])]
+
+    response = self._post("bulk_unmap", reversed_pairs)
+    self.assert200(response)
+    self.assertEqual(response.json, {"deleted": 2})
+    self.assertEqual(self._mapped_ids(), {self.control_ids[2]})
+    self.assertEqual(all_models.Revision.query.filter_by(
+        resource_type="Relationship", action="deleted").count(), 2)
+
+  def test_excluded_type(self):
+    """Types with mapping hooks can not be mapped in bulk."""
+    audit = factories.AuditFactory()
+    response = self._post("bulk_map", [{
+        "source": {"type": "Audit", "id": audit.id},
+        "destination": {"type": "Control", "id": self.control_ids[0]},
+    }])
+    self.assert400(response)
+    self.assertEqual(self._mapped_ids(), set())
+
+  def test_missing_object(self):
+    """Nothing is mapped if any of the objects does not exist."""
+    response = self._post("bulk_map", self._pairs([self.control_ids[0], 0]))
+    self.assert400(response)
+    self.assertEqual(self._mapped_ids(), set())
+
+  def test_forbidden(self):
+    """Users without update permissions can not map objects."""
+    _, creator = ObjectGenerator().generate_person(user_role="Creator")
+    self.client.get("/logout")
+    self.client.get("/login", headers={"X-ggrc-user": json.dumps(
+        {"email": creator.email, "name": creator.name})})
+    response = self._post("bulk_map", self._pairs(self.control_ids))
+    self.assert403(response)
+    self.assertEqual(self._mapped_ids(), set())
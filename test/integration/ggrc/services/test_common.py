@@ -11,6 +11,7 @@ from urlparse import urlparse
 from wsgiref.handlers import format_date_time
 from sqlalchemy import and_
 
+from appengine.fake_memcache import FakeMemcache
 from integration.ggrc.services import TestCase
 from integration.ggrc.api_helper import Api
 from integration.ggrc.generator import ObjectGenerator
@@ -324,6 +325,52 @@ class TestServices(TestCase):
     self.assertStatus(response, 304)
     self.assertIn("Etag", response.headers)
 
+  def test_get_etag_not_serialized(self):
+    """Matching If-None-Match is answered without serializing the object."""
+    mock1 = self.mock_model(foo="baz")
+    response = self.client.get(self.mock_url(mock1.id),
+                               headers=self.get_headers())
+    self.assert200(response)
+    with mock.patch("ggrc.services.common.Resource.object_for_json") as dump:
+      response = self.client.get(
+          self.mock_url(mock1.id),
+          headers=self.get_headers(("If-None-Match",
+                                    response.headers["Etag"])),
+      )
+    self.assertStatus(response, 304)
+    dump.assert_not_called()
+
+  def test_collection_etag(self):
+    """Collection etag is built from change stamps without the collection."""
+    memcache = FakeMemcache()
+    with mock.patch("ggrc.services.change_stamps._get_client",
+                    return_value=memcache), \
+        mock.patch("ggrc.rbac.permissions_cache._get_client",
+                   return_value=memcache):
+      self.mock_model(foo="baz")
+      response = self.client.get(self.mock_url(), headers=self.get_headers())
+      self.assert200(response)
+      collection_etag = response.headers["Etag"]
+
+      target = "ggrc.services.common.Resource.get_matched_resources"
+      with mock.patch(target) as get_resources:
+        response = self.client.get(
+            self.mock_url(),
+            headers=self.get_headers(("If-None-Match", collection_etag)),
+        )
+      self.assertStatus(response, 304)
+      get_resources.assert_not_called()
+
+      self.mock_model(foo="bar")
+      response = self.client.get(
+          self.mock_url(),
+          headers=self.get_headers(("If-None-Match", collection_etag)),
+      )
+      self.assert200(response)
+      self.assertEqual(
+          len(response.json["services_test_mock_models_collection"]
+              ["services_test_mock_models"]), 2)
+
 
 class TestFilteringByRequest(TestCase):
   """Test filter query by request"""
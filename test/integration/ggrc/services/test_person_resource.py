@@ -9,7 +9,9 @@ from datetime import date
 import ddt
 from freezegun import freeze_time
 
+from ggrc import db
 from ggrc.models import all_models
+from ggrc.models.person_object_count import PersonObjectCount
 from ggrc.utils import create_stub
 
 from integration.ggrc.models import factories
@@ -320,6 +322,53 @@ class TestPersonResource(TestCase, WithQueryApi):
           {"open_task_count": 2, "has_overdue": False}
       )
 
+  def test_all_objects_count_stored(self):
+    """Test stored all objects counters are invalidated on object creation."""
+    user = all_models.Person.query.first()
+    url = "/api/people/{}/all_objects_count".format(user.id)
+    factories.ControlFactory()
+
+    # missing counters are created as stale and stored on the next read
+    for _ in range(2):
+      response = self.client.get(url)
+      self.assert200(response)
+      self.assertEqual(response.json["Control"], 1)
+    stored = PersonObjectCount.query.filter_by(
+        person_id=user.id,
+        counter=u"all_objects",
+        object_type=u"Control",
+    ).one()
+    self.assertEqual((stored.count, stored.stale), (1, False))
+
+    factories.ControlFactory()
+    stored = PersonObjectCount.query.filter_by(
+        person_id=user.id,
+        counter=u"all_objects",
+        object_type=u"Control",
+    ).one()
+    self.assertTrue(stored.stale)
+
+    response = self.client.get(url)
+    self.assertEqual(response.json["Control"], 2)
+
+  def test_count_status_change(self):
+    """Test stored counters are invalidated on object status change."""
+    user = all_models.Person.query.first()
+    control = factories.ControlFactory()
+    for _ in range(2):
+      response = self.client.get(
+          "/api/people/{}/all_objects_count".format(user.id))
+      self.assert200(response)
+
+    control.status = all_models.Control.DEPRECATED
+    db.session.commit()
+    stored = PersonObjectCount.query.filter_by(
+        person_id=user.id,
+        counter=u"all_objects",
+        object_type=u"Control",
+    ).one()
+    self.assertTrue(stored.stale)
+
 
 @ddt.ddt
 class TestPersonResourcePopulated(TestCase, WithQueryApi):
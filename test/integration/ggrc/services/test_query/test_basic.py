@@ -671,6 +671,51 @@ class TestAdvancedQueryAPI(WithQueryApi, TestCase):
 
     self.assertEqual(programs_values["count"], programs_count["count"])
 
+  def test_query_count_limit(self):
+    """Count queries apply limit to "count" but not to "total"."""
+    programs_count = self._get_first_result_set(
+        self._make_query_dict("Program", type_="count",
+                              expression=["title", "~", "Cat ipsum"]),
+        "Program",
+    )
+    programs_limit = self._get_first_result_set(
+        self._make_query_dict("Program", type_="count", limit=[20, 30],
+                              expression=["title", "~", "Cat ipsum"]),
+        "Program",
+    )
+
+    self.assertEqual(programs_count["total"], programs_count["count"])
+    self.assertEqual(programs_limit["total"], programs_count["total"])
+    self.assertEqual(programs_limit["count"], programs_count["total"] - 20)
+
+  def test_query_group_count(self):
+    """Grouped counts match the counts of filtered "values" queries."""
+    query = self._make_query_dict("Program", type_="group_count")
+    query["group_by"] = "State"
+    programs_counts = self._get_first_result_set(query, "Program")
+    programs_values = self._get_first_result_set(
+        self._make_query_dict("Program", type_="values"),
+        "Program",
+    )
+
+    expected = {}
+    for program in programs_values["values"]:
+      expected[program["status"]] = expected.get(program["status"], 0) + 1
+    self.assertEqual(
+        {item["value"]: item["count"] for item in programs_counts["counts"]},
+        expected,
+    )
+    self.assertEqual(programs_counts["count"], programs_values["count"])
+    self.assertEqual(programs_counts["total"], programs_values["count"])
+
+  @ddt.data(None, "owners", "unknown field")
+  def test_query_group_count_invalid(self, group_by):
+    """Grouped counts require a field stored in a column."""
+    query = self._make_query_dict("Program", type_="group_count")
+    if group_by:
+      query["group_by"] = group_by
+    self.assert400(self._post(query))
+
   def test_query_ids(self):
     """The ids are the same for "values" and "ids" queries."""
     programs_values = self._get_first_result_set(
@@ -17,6 +17,7 @@ from ggrc.models import Person
 from ggrc_workflows.models import TaskGroup
 
 from integration.ggrc import TestCase
+from integration.ggrc.models import factories
 from integration.ggrc.query_helper import WithQueryApi
 
 
@@ -89,3 +90,41 @@ class TestOrder(TestCase, WithQueryApi):
                      .filter(Person.id == TaskGroup.contact_id)
                      .order_by(Person.email)]
     self._check_ordering("TaskGroup", sorted_titles, "Assignee")
+
+
+@ddt.ddt
+class TestCustomAttributeOrder(TestCase, WithQueryApi):
+  """Tests ordering by typed values of custom attributes"""
+
+  def setUp(self):
+    super(TestCustomAttributeOrder, self).setUp()
+    self.client.get("/login")
+
+  @ddt.data(
+      (["10", "9", "100", "-2.5"], [3, 1, 0, 2]),
+      (["12/01/2017", "01/15/2018", "06/30/2017"], [2, 0, 1]),
+      (["b", "10", "a", "9"], [2, 0, 3, 1]),
+  )
+  @ddt.unpack
+  def test_typed_order(self, values, order):
+    """Custom attribute values are sorted by their types"""
+    with factories.single_commit():
+      cad = factories.CustomAttributeDefinitionFactory(
+          title="sort cad",
+          definition_type="control",
+      )
+      for index, value in enumerate(values):
+        control = factories.ControlFactory(title="Control {}".format(index))
+        factories.CustomAttributeValueFactory(
+            custom_attribute=cad,
+            attributable=control,
+            attribute_value=value,
+        )
+    self.client.post("/admin/reindex")
+
+    sorted_titles = ["Control {}".format(index) for index in order]
+    for desc in (False, True):
+      controls = self.simple_query(
+          "Control", order_by=[{"name": "sort cad", "desc": desc}])
+      self.assertEqual([item["title"] for item in controls],
+                       sorted_titles[::-1] if desc else sorted_titles)
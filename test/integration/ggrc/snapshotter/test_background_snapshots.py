@@ -0,0 +1,65 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for snapshot creation of large scopes in background tasks."""
+
+import mock
+
+from ggrc import db
+from ggrc import snapshotter
+import ggrc.models as models
+
+from integration.ggrc.models import factories
+from integration.ggrc.snapshotter import SnapshotterBaseTestCase
+
+
+@mock.patch("ggrc.settings.SNAPSHOT_CHUNK_SIZE", 2, create=True)
+@mock.patch("ggrc.settings.SNAPSHOT_BACKGROUND_THRESHOLD", 1, create=True)
+class TestBackgroundSnapshots(SnapshotterBaseTestCase):
+  """Test snapshot creation in chunks."""
+
+  def setUp(self):
+    super(TestBackgroundSnapshots, self).setUp()
+    with factories.single_commit():
+      self.program = factories.ProgramFactory()
+      controls = [factories.ControlFactory() for _ in range(3)]
+      for control in controls:
+        factories.RelationshipFactory(source=self.program,
+                                      destination=control)
+    self.control_ids = [control.id for control in controls]
+
+  @staticmethod
+  def _get_snapshot_child_ids(audit):
+    return sorted(child_id for child_id, in db.session.query(
+        models.Snapshot.child_id
+    ).filter(
+        models.Snapshot.parent_type == "Audit",
+        models.Snapshot.parent_id == audit.id,
+    ))
+
+  def test_create_in_background(self):
+    """Large scopes are snapshotted by a background task."""
+    program = self.refresh_object(self.program)
+    self.create_audit(program)
+    audit = models.Audit.query.filter_by(title="Snapshotable audit").one()
+
+    self.assertEqual(self._get_snapshot_child_ids(audit),
+                     sorted(self.control_ids))
+    task = models.BackgroundTask.query.filter(
+        models.BackgroundTask.name.like("snapshot_scope%")).one()
+    self.assertEqual(task.status, "Success")
+
+  def test_retry_is_idempotent(self):
+    """Processing the same scope again does not duplicate snapshots."""
+    program = self.refresh_object(self.program)
+    self.create_audit(program)
+    audit = models.Audit.query.filter_by(title="Snapshotable audit").one()
+    task = models.BackgroundTask.query.filter(
+        models.BackgroundTask.name.like("snapshot_scope%")).one()
+    progress = mock.MagicMock()
+
+    snapshotter.process_snapshot_scope(task.parameters, progress=progress)
+
+    self.assertEqual(self._get_snapshot_child_ids(audit),
+                     sorted(self.control_ids))
+    self.assertFalse(progress.called)
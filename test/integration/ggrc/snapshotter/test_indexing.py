@@ -12,6 +12,7 @@ from ggrc import models
 from ggrc.models import all_models
 from ggrc.fulltext.mysql import MysqlRecordProperty as Record
 from ggrc.snapshotter.indexer import delete_records
+from ggrc.snapshotter.indexer import reindex_snapshots
 
 from integration.ggrc.snapshotter import SnapshotterBaseTestCase
 from integration.ggrc.models import factories
@@ -532,3 +533,27 @@ class TestSnapshotIndexing(SnapshotterBaseTestCase):
         Record.property == role_name.lower()
     ).values("subproperty", "content"))
     self.assertFalse(all_found_records)
+
+  def test_shared_revision_indexing(self):
+    """Snapshots of the same revision get their own records."""
+    with factories.single_commit():
+      control = factories.ControlFactory(title="shared control")
+      audits = [factories.AuditFactory() for _ in range(2)]
+    snapshots = [self._create_snapshots(audit, [control])[0]
+                 for audit in audits]
+    db.session.commit()
+    snapshot_ids = [snapshot.id for snapshot in snapshots]
+    delete_records(snapshot_ids)
+
+    reindex_snapshots(snapshot_ids)
+
+    for snapshot, audit in zip(snapshots, audits):
+      records = dict(Record.query.filter(
+          Record.type == "Snapshot",
+          Record.key == snapshot.id,
+          Record.property.in_(("title", "parent")),
+      ).values("property", "content"))
+      self.assertEqual(records, {
+          "title": "shared control",
+          "parent": "Audit-{}".format(audit.id),
+      })
@@ -0,0 +1,75 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for the database backed background task queue."""
+
+import datetime
+
+import mock
+from flask import url_for
+
+from ggrc import task_queue
+from ggrc import views
+from ggrc.models import background_task
+from ggrc.models.background_task import BackgroundTask
+from ggrc.models.background_task import QueuedBackgroundTask
+
+from integration.ggrc import TestCase
+
+
+@mock.patch("ggrc.settings.BACKGROUND_TASK_BACKEND", "local", create=True)
+class TestTaskQueue(TestCase):
+  """Tests for queueing and running tasks with the local backend."""
+
+  @staticmethod
+  def _create_reindex_task():
+    """Create a reindex task and return its id."""
+    task = background_task.create_task(
+        name="reindex",
+        url=url_for(views.reindex.__name__),
+        queued_callback=views.reindex,
+        method=u"POST",
+    )
+    return task.id
+
+  def test_task_is_queued(self):
+    """Tasks are run by workers instead of the creating request."""
+    with mock.patch("ggrc.views.do_reindex") as reindex_mock:
+      task_id = self._create_reindex_task()
+      self.assertFalse(reindex_mock.called)
+      self.assertEqual(BackgroundTask.query.get(task_id).status, "Pending")
+
+      task_queue.work(worker_id="test", until_empty=True)
+
+      self.assertTrue(reindex_mock.called)
+    self.assertEqual(BackgroundTask.query.get(task_id).status, "Success")
+    item = QueuedBackgroundTask.query.filter_by(
+        background_task_id=task_id).one()
+    self.assertIsNotNone(item.finished_at)
+    self.assertEqual(item.attempts, 1)
+
+  def test_failed_task_is_retried(self):
+    """Failed tasks are scheduled for another attempt with a delay."""
+    with mock.patch("ggrc.views.do_reindex", side_effect=ValueError):
+      task_id = self._create_reindex_task()
+      task_queue.work(worker_id="test", until_empty=True)
+
+    self.assertEqual(BackgroundTask.query.get(task_id).status, "Pending")
+    item = QueuedBackgroundTask.query.filter_by(
+        background_task_id=task_id).one()
+    self.assertIsNone(item.finished_at)
+    self.assertIsNone(item.claimed_by)
+    self.assertEqual(item.attempts, 1)
+    self.assertGreater(item.run_after, datetime.datetime.utcnow())
+
+  @mock.patch("ggrc.settings.BACKGROUND_TASK_CONCURRENCY", {"reindex": 1})
+  def test_concurrency_limit(self):
+    """Tasks are not claimed over the concurrency limit of their name."""
+    first_id = self._create_reindex_task()
+    self._create_reindex_task()
+
+    item_id = task_queue.claim("first")
+
+    item = QueuedBackgroundTask.query.get(item_id)
+    self.assertEqual(item.background_task_id, first_id)
+    self.assertIsNone(task_queue.claim("second"))
@@ -14,6 +14,7 @@ from ggrc.models import Assessment
 from ggrc.models import AssessmentTemplate
 from ggrc.models import Audit
 from ggrc.models import Person
+from ggrc.utils import user_generator
 from ggrc_basic_permissions.models import UserRole
 
 from integration.ggrc.services import TestCase
@@ -215,7 +216,8 @@ class TestUserGenerator(TestCase):
                   line=3, email="cbabbage@example.com")}}})
 
   @mock.patch("ggrc.settings.INTEGRATION_SERVICE_URL", new="endpoint")
-  @mock.patch("ggrc.utils.user_generator.search_user", return_value="user")
+  @mock.patch("ggrc.utils.user_generator.search_users",
+              side_effect=lambda emails: {email: "user" for email in emails})
   def test_invalid_email_import(self, _):
     """Test import of invalid email."""
     wrong_email = "some wrong email"
@@ -249,3 +251,28 @@ class TestUserGenerator(TestCase):
         }
     }
     self._check_csv_response(response, expected_errors)
+
+  @mock.patch('ggrc.settings.INTEGRATION_SERVICE_URL', new='endpoint')
+  @mock.patch('ggrc.settings.AUTHORIZED_DOMAIN', new='example.com')
+  @mock.patch('ggrc.settings.EXTERNAL_PERSON_BATCH_SIZE', new=2)
+  def test_person_resolver_batches(self):
+    """Test people are verified in batches and results are cached."""
+    factories.PersonFactory(email="aturing@example.com")
+    post_mock = mock.MagicMock(side_effect=self._mock_post)
+    emails = ["aturing@example.com", "cbabbage@example.com",
+              "alovelace@example.com", "unknown@other.com"]
+    with mock.patch.multiple(PersonClient, _post=post_mock):
+      resolver = user_generator.PersonResolver()
+      people = resolver.resolve(emails)
+      self.assertEqual(post_mock.call_count, 2)
+
+      self.assertEqual(set(people), set(emails[:3]))
+      self.assertIsNone(resolver.get("unknown@other.com"))
+      self.assertEqual(resolver.get("CBabbage@example.com").email,
+                       "cbabbage@example.com")
+      self.assertEqual(post_mock.call_count, 2)
+
+    created = Person.query.filter(Person.email.in_(emails[1:3])).all()
+    self.assertEqual(len(created), 2)
+    self.assertTrue(all(person.system_wide_role == "Creator"
+                        for person in created))
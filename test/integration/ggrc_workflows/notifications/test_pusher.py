@@ -0,0 +1,92 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Integration tests for batched workflow notification pushing."""
+
+import datetime
+
+from freezegun import freeze_time
+
+from ggrc import db
+from ggrc.models import all_models
+from ggrc_workflows.notification import pusher
+from integration.ggrc import TestCase
+from integration.ggrc.models import factories
+from integration.ggrc_workflows.models import factories as wf_factories
+
+
+@freeze_time("2018-02-05 12:00:00")
+class TestPusher(TestCase):
+  """Tests for pending notifications of a transaction."""
+
+  NOTIFICATION_TYPE = "cycle_task_due_today"
+
+  def setUp(self):
+    super(TestPusher, self).setUp()
+    all_models.Notification.query.delete()
+    with factories.single_commit():
+      self.tasks = [wf_factories.CycleTaskFactory() for _ in range(3)]
+    self.notif_type = pusher.get_notification_type(self.NOTIFICATION_TYPE)
+
+  def _send_dates(self):
+    """Get send dates of notifications by task ids."""
+    notifications = all_models.Notification.query.filter_by(
+        object_type="CycleTaskGroupObjectTask",
+        notification_type_id=self.notif_type.id,
+    )
+    result = {}
+    for notification in notifications:
+      self.assertNotIn(notification.object_id, result)
+      result[notification.object_id] = notification.send_on.date()
+    return result
+
+  def test_push_on_commit(self):
+    """Notifications are deduplicated and inserted on commit."""
+    for send_on in (datetime.date(2018, 2, 6), datetime.date(2018, 2, 7)):
+      for task in self.tasks:
+        pusher.push(task, self.notif_type, send_on)
+    self.assertEqual(
+        db.session.query(all_models.Notification.id).count(), 0)
+    db.session.commit()
+
+    self.assertEqual(self._send_dates(), {
+        task.id: datetime.date(2018, 2, 7) for task in self.tasks
+    })
+
+  def test_rollback(self):
+    """Notifications of rolled back transactions are dropped."""
+    pusher.push(self.tasks[0], self.notif_type)
+    db.session.rollback()
+    db.session.commit()
+    self.assertEqual(self._send_dates(), {})
+
+  def test_cancel(self):
+    """Both pending and stored notifications are cancelled."""
+    pusher.push(self.tasks[0], self.notif_type)
+    db.session.commit()
+    pusher.push(self.tasks[1], self.notif_type)
+    pusher.push(self.tasks[2], self.notif_type)
+
+    pusher.cancel(self.tasks[:2], [self.NOTIFICATION_TYPE])
+    db.session.commit()
+
+    self.assertEqual(self._send_dates(),
+                     {self.tasks[2].id: datetime.date(2018, 2, 5)})
+
+  def test_reschedule(self):
+    """Stored notifications are moved or cancelled, missing are created."""
+    pusher.push(self.tasks[0], self.notif_type, datetime.date(2018, 2, 6))
+    pusher.push(self.tasks[1], self.notif_type, datetime.date(2018, 2, 6))
+    db.session.commit()
+
+    pusher.reschedule({
+        self.tasks[0]: datetime.date(2018, 2, 10),
+        self.tasks[1]: datetime.date(2018, 2, 1),
+        self.tasks[2]: datetime.date(2018, 2, 10),
+    }, self.NOTIFICATION_TYPE)
+    db.session.commit()
+
+    self.assertEqual(self._send_dates(), {
+        self.tasks[0].id: datetime.date(2018, 2, 10),
+        self.tasks[2].id: datetime.date(2018, 2, 10),
+    })
@@ -11,6 +11,7 @@ from threading import Thread
 from freezegun import freeze_time
 
 from ggrc import db
+from ggrc.models import Revision
 from ggrc_workflows.models import Cycle
 from ggrc_workflows.models import CycleTaskGroupObjectTask
 from ggrc_workflows.models import CycleTaskGroup
@@ -450,3 +451,55 @@ class TestWorkflowCycleStatePropagation(TestCase):
       # # check cycle status
       cycle = self._get_obj(Cycle, "test workflow")
       self.assertEqual(cycle.status, "Verified")
+
+  def test_bulk_update_propagation(self):
+    """Test status propagation of bulk updated tasks in several groups"""
+    wf_data = {
+        "title": "test workflow",
+        "unit": "week",
+        "repeat_every": 1,
+        "task_groups": [{
+            "title": "test group1",
+            "task_group_tasks": [{
+                "title": "task1",
+                "start_date": dtm.date(2016, 6, 10),
+                "end_date": dtm.date(2016, 6, 13),
+            }, {
+                "title": "task2",
+                "start_date": dtm.date(2016, 6, 10),
+                "end_date": dtm.date(2016, 6, 14),
+            }]
+        }, {
+            "title": "test group2",
+            "task_group_tasks": [{
+                "title": "task3",
+                "start_date": dtm.date(2016, 6, 14),
+                "end_date": dtm.date(2016, 6, 16),
+            }]
+        }]
+    }
+
+    with freeze_time("2016-6-10 13:00:00"):  # Friday, 6/10/2016
+      _, wf = self.generator.generate_workflow(wf_data)
+      self.generator.activate_workflow(wf)
+      group2 = self._get_obj(CycleTaskGroup, "test group2")
+      group2_revisions = Revision.query.filter_by(
+          resource_type="CycleTaskGroup", resource_id=group2.id).count()
+
+      tasks = [self._get_obj(CycleTaskGroupObjectTask, title)
+               for title in ("task1", "task2")]
+      response = self.api.patch(CycleTaskGroupObjectTask, [
+          {"id": task.id, "state": "InProgress"} for task in tasks
+      ])
+      self.assert200(response)
+
+      self.assertEqual(
+          self._get_obj(CycleTaskGroup, "test group1").status, "InProgress")
+      self.assertEqual(self._get_obj(Cycle, "test workflow").status,
+                       "InProgress")
+      group2 = self._get_obj(CycleTaskGroup, "test group2")
+      self.assertEqual(group2.status, "Assigned")
+      # unchanged groups are not logged
+      self.assertEqual(Revision.query.filter_by(
+          resource_type="CycleTaskGroup", resource_id=group2.id).count(),
+          group2_revisions)
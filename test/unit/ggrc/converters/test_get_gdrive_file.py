@@ -7,6 +7,7 @@ import unittest
 import mock
 
 import ddt
+from werkzeug.exceptions import BadRequest
 
 from ggrc.gdrive import file_actions
 
@@ -36,9 +37,19 @@ class TestGetGDRiveFile(unittest.TestCase):
     self.assertEqual(
         [[u'Object_tyle', u'Code*', u'Title*', u'LIST*'],
          [u'', u'OBJ-1185', u'OBJ_title', u'user1\nuser2']],
-        file_actions.get_gdrive_file(file_data))
+        list(file_actions.get_gdrive_file(file_data)))
     auth_mock.assert_called_once_with()
     disco_mock.build.assert_called_once_with("drive",
                                              "v3",
                                              http=auth_mock.return_value)
     disco_files.get.assert_called_once_with(fileId=file_data["id"])
+
+  @mock.patch("ggrc.gdrive.file_actions.get_http_auth")
+  @mock.patch("ggrc.gdrive.file_actions.discovery")
+  def test_wrong_format(self, disco_mock, _):
+    """Test files that are not valid csv are rejected before import."""
+    disco_files = disco_mock.build.return_value.files.return_value
+    disco_files.get.return_value.execute.return_value = {"id": "123123"}
+    disco_files.export_media.return_value.execute.return_value = "\xff\x00"
+    with self.assertRaises(BadRequest):
+      file_actions.get_gdrive_file({"id": "123123"})
@@ -112,6 +112,57 @@ class TestSplitArry(unittest.TestCase):
     self.assertEqual(offests[1], 6)
     self.assertEqual(offests[2], 9)
 
+  def test_iter_blocks(self):
+    """Test splitting blocks from a csv line generator."""
+    test_data = [
+        ["", ""],
+        ["hello", "world"],
+        ["", ""],
+        ["hello", "world"],
+        ["hello", "world"],
+    ]
+    blocks = list(import_helper.iter_blocks(line for line in test_data))
+    self.assertEqual(blocks, [
+        (1, test_data[1:2]),
+        (3, test_data[3:5]),
+    ])
+
+
+class TestExtractRelevantData(unittest.TestCase):
+  """Tests for extracting headers and rows from a csv block."""
+
+  def test_extract_relevant_data(self):
+    """Object type line and column and empty columns are removed."""
+    block = [
+        [u"Object type", u"", u"", u""],
+        [u"Control", u"Code*", u"", u" Title "],
+        [u"", u" CONTROL-1 ", u"", u"title 1"],
+        [u"", u"", u"", u"title 2"],
+    ]
+    headers, rows = import_helper.extract_relevant_data(block)
+    self.assertEqual(headers, [u"Code*", u"Title"])
+    self.assertEqual(rows, [
+        [u"CONTROL-1", u"title 1"],
+        [u"", u"title 2"],
+    ])
+
+
+class TestUtf8Encoder(unittest.TestCase):
+  """Tests for encoding csv lines to utf-8."""
+
+  @mock.patch("ggrc.converters.import_helper.chardet.detect")
+  def test_encoding_guessed_once(self, detect):
+    """Guessed encoding is reused for following lines."""
+    detect.return_value = {"encoding": "latin-1"}
+    lines = ["ascii\n", "caf\xe9\n", "na\xefve\n", "utf \xc3\xa9\n"]
+    self.assertEqual(list(import_helper.utf_8_encoder(lines)), [
+        "ascii\n",
+        "caf\xc3\xa9\n",
+        "na\xc3\xafve\n",
+        "utf \xc3\xa9\n",
+    ])
+    self.assertEqual(detect.call_count, 1)
+
 
 class TestColumnOrder(unittest.TestCase):
 
@@ -0,0 +1,58 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for typed sort keys of full text records."""
+
+import datetime
+import unittest
+
+import ddt
+
+from ggrc.fulltext import sort_keys
+
+
+@ddt.ddt
+class TestSortKeys(unittest.TestCase):
+  """Tests for parsing full text content into sort values."""
+
+  @ddt.data(
+      (u"42", (42.0, None, u"42")),
+      (u" -1.5 ", (-1.5, None, u"-1.5")),
+      (u"2018-01-05", (None, datetime.datetime(2018, 1, 5), u"2018-01-05")),
+      (u"01/05/2018", (None, datetime.datetime(2018, 1, 5), u"01/05/2018")),
+      (u"2018-01-05 10:20:30.123",
+       (None, datetime.datetime(2018, 1, 5, 10, 20, 30),
+        u"2018-01-05 10:20:30.123")),
+      (u"2018-02-30", (None, None, u"2018-02-30")),
+      (u"2018-01-05 draft", (None, None, u"2018-01-05 draft")),
+      (u"1.2.3", (None, None, u"1.2.3")),
+      (None, (None, None, u"")),
+  )
+  @ddt.unpack
+  def test_get_sort_values(self, content, expected):
+    """Sort values are parsed from content {0!r}."""
+    self.assertEqual(sort_keys.get_sort_values(content), expected)
+
+  def test_long_text(self):
+    """Text sort values are truncated."""
+    _, _, text = sort_keys.get_sort_values(u"a" * 1000)
+    self.assertEqual(len(text), sort_keys.TEXT_LENGTH)
+
+  def test_build_rows(self):
+    """The __sort__ subproperty takes precedence over the empty one."""
+    rows = sort_keys.build_rows("Control", [
+        (1, u"title", u"", u"B"),
+        (1, u"admin", u"__sort__", u"a@example.com"),
+        (1, u"admin", u"", u"ignored"),
+        (2, u"title", u"", u"3"),
+    ])
+
+    self.assertEqual(
+        sorted((row["key"], row["property"], row["value_num"],
+                row["value_text"]) for row in rows),
+        [
+            (1, u"admin", None, u"a@example.com"),
+            (1, u"title", None, u"B"),
+            (2, u"title", 3.0, u"3"),
+        ],
+    )
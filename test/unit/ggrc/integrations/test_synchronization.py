@@ -0,0 +1,94 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for concurrent issue tracker synchronization."""
+
+import unittest
+
+import mock
+
+from ggrc.integrations import fake_tracker
+from ggrc.integrations import synchronization
+
+
+class FakeClock(object):
+  """Clock that only moves when sleeping."""
+
+  def __init__(self):
+    self.now = 0.0
+
+  def time(self):
+    return self.now
+
+  def sleep(self, seconds):
+    self.now += seconds
+
+
+class TokenBucketTest(unittest.TestCase):
+  """Tests for the token bucket rate limiter."""
+
+  def test_rate_limit(self):
+    """Requests over the burst capacity wait for new tokens."""
+    clock = FakeClock()
+    bucket = synchronization.TokenBucket(
+        2, capacity=2, clock=clock.time, sleep=clock.sleep)
+
+    for _ in range(6):
+      bucket.acquire()
+
+    self.assertAlmostEqual(clock.now, 2.0)
+
+  def test_no_limit(self):
+    """Zero rate does not limit requests."""
+    sleep = mock.MagicMock()
+    bucket = synchronization.TokenBucket(0, sleep=sleep)
+
+    for _ in range(100):
+      bucket.acquire()
+
+    self.assertFalse(sleep.called)
+
+
+@mock.patch('ggrc.integrations.synchronization.get_retry_delay',
+            return_value=0)
+class UpdateIssuesTest(unittest.TestCase):
+  """Tests for update_issues with the fake issue tracker."""
+
+  def test_update_issues(self, _):
+    """All issues are updated with bounded concurrency."""
+    tracker = fake_tracker.FakeIssueTracker(latency=0.01)
+    updates = [(issue_id, {'comment': 'c'}) for issue_id in range(1, 21)]
+
+    with tracker.install():
+      results = synchronization.update_issues(updates, workers=4, rate=0)
+
+    self.assertTrue(all(result.success for result in results))
+    self.assertEqual([result.issue_id for result in results], range(1, 21))
+    self.assertEqual(sorted(tracker.issues), range(1, 21))
+    self.assertLessEqual(tracker.max_concurrency, 4)
+    self.assertGreater(tracker.max_concurrency, 1)
+
+  def test_retry_transient_errors(self, delay_mock):
+    """Throttled requests are retried with a delay."""
+    tracker = fake_tracker.FakeIssueTracker(failures={1: [429, 503]})
+
+    with tracker.install():
+      results = synchronization.update_issues(
+          [(1, {'comment': 'c'})], rate=0, retries=3, retry_delay=1)
+
+    self.assertEqual(results[0].success, True)
+    self.assertEqual(results[0].attempts, 3)
+    self.assertEqual(delay_mock.call_args_list,
+                     [mock.call(0, 1), mock.call(1, 1)])
+
+  def test_permanent_errors(self, delay_mock):
+    """Client errors are not retried and are reported per issue."""
+    tracker = fake_tracker.FakeIssueTracker(failures={2: [400]})
+
+    with tracker.install():
+      results = synchronization.update_issues(
+          [(1, {}), (2, {})], rate=0, retries=3, retry_delay=1)
+
+    self.assertEqual([result.success for result in results], [True, False])
+    self.assertEqual(results[1].attempts, 1)
+    self.assertFalse(delay_mock.called)
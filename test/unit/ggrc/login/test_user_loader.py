@@ -0,0 +1,99 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Unit tests for the cached flask_login user loader."""
+
+import unittest
+
+import mock
+
+from ggrc import login
+
+
+@mock.patch("ggrc.db.session")
+@mock.patch("ggrc.utils.user_generator.find_detached_user_by_id")
+class TestUserLoader(unittest.TestCase):
+  """Tests for user_loader caching."""
+
+  def setUp(self):
+    login._USER_CACHE.clear()  # pylint: disable=protected-access
+
+  @mock.patch("ggrc.settings.USER_CACHE_TTL", 10, create=True)
+  def test_user_loaded_once(self, find_mock, session_mock):
+    """Cached users are merged into the session without loading."""
+    user = mock.MagicMock()
+    find_mock.return_value = user
+
+    for _ in range(3):
+      login.user_loader(u"1")
+
+    find_mock.assert_called_once_with(u"1")
+    session_mock.merge.assert_called_with(user, load=False)
+
+  @mock.patch("ggrc.settings.USER_CACHE_TTL", 10, create=True)
+  def test_forget_users(self, find_mock, _):
+    """Forgotten users are loaded again."""
+    login.user_loader(u"1")
+    login.forget_users([1])
+    login.user_loader(u"1")
+
+    self.assertEqual(find_mock.call_count, 2)
+
+  @mock.patch("ggrc.settings.USER_CACHE_TTL", 10, create=True)
+  def test_forget_on_commit(self, find_mock, _):
+    """Users are forgotten only when the transaction commits."""
+    session = mock.MagicMock(info={})
+    login.user_loader(u"1")
+    login.forget_users_on_commit({1}, session)
+    login.user_loader(u"1")
+    self.assertEqual(find_mock.call_count, 1)
+
+    login.handle_commit(session)
+    login.user_loader(u"1")
+    self.assertEqual(find_mock.call_count, 2)
+
+  @mock.patch("ggrc.settings.USER_CACHE_TTL", 10, create=True)
+  def test_rollback(self, find_mock, _):
+    """Users changed in a rolled back transaction stay cached."""
+    session = mock.MagicMock(info={})
+    login.user_loader(u"1")
+    login.forget_users_on_commit({1}, session)
+    login.handle_rollback(session)
+    login.handle_commit(session)
+    login.user_loader(u"1")
+
+    self.assertEqual(find_mock.call_count, 1)
+
+  @mock.patch("ggrc.settings.USER_CACHE_TTL", 10, create=True)
+  @mock.patch("ggrc.login.time.time")
+  def test_ttl(self, time_mock, find_mock, _):
+    """Users changed by other processes are reloaded after the TTL."""
+    time_mock.return_value = 100
+    login.user_loader(u"1")
+    time_mock.return_value = 110
+    login.user_loader(u"1")
+    self.assertEqual(find_mock.call_count, 1)
+
+    time_mock.return_value = 110.5
+    login.user_loader(u"1")
+    self.assertEqual(find_mock.call_count, 2)
+
+  @mock.patch("ggrc.settings.USER_CACHE_TTL", 10, create=True)
+  def test_missing_user(self, find_mock, session_mock):
+    """Missing users are not cached."""
+    find_mock.return_value = None
+
+    self.assertIsNone(login.user_loader(u"1"))
+    self.assertIsNone(login.user_loader(u"1"))
+
+    self.assertEqual(find_mock.call_count, 2)
+    self.assertFalse(session_mock.merge.called)
+
+  @mock.patch("ggrc.settings.USER_CACHE_TTL", 0, create=True)
+  @mock.patch("ggrc.utils.user_generator.find_user_by_id")
+  def test_cache_disabled(self, find_by_id_mock, find_mock, _):
+    """Users are loaded in the request session without a TTL."""
+    login.user_loader(u"1")
+
+    find_by_id_mock.assert_called_once_with(u"1")
+    self.assertFalse(find_mock.called)
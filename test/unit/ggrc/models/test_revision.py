@@ -217,3 +217,57 @@ class TestCheckPopulatedContent(unittest.TestCase):
         revision._document_evidence_hack(),
         expected_evidence,
     )
+
+
+class TestRevisionContentCache(unittest.TestCase):
+  """Unittests for memoized revision content."""
+
+  def setUp(self):
+    super(TestRevisionContentCache, self).setUp()
+    obj = mock.Mock()
+    obj.id = 1
+    obj.__class__.__name__ = "Control"
+    self.revision = all_models.Revision(
+        obj, mock.Mock(), mock.Mock(), {"title": "title", "label": "label"})
+
+  def test_content_populated_once(self):
+    """Repeated content reads don't populate content again."""
+    with mock.patch.object(all_models.Revision, "populate_content",
+                           return_value={"title": "populated"}) as populate:
+      self.assertEqual(self.revision.content, {"title": "populated"})
+      self.assertEqual(self.revision.content, {"title": "populated"})
+    populate.assert_called_once_with()
+
+  def test_content_copy(self):
+    """Changes of returned content don't affect next reads."""
+    with mock.patch("ggrc.access_control.role.get_custom_roles_for",
+                    return_value={}):
+      self.revision.content["title"] = "changed"
+      self.assertEqual(self.revision.content["title"], "title")
+
+  def test_nested_content_copy(self):
+    """Changes of nested values of returned content don't affect next reads."""
+    self.revision.content = {"access_control_list": [{"person_id": 1}]}
+    self.revision.content_normalized = True
+    self.revision.content["access_control_list"][0]["person_id"] = 2
+    self.revision.content["access_control_list"].append({"person_id": 3})
+    self.assertEqual(self.revision.content["access_control_list"],
+                     [{"person_id": 1}])
+
+  def test_content_setter(self):
+    """New content is populated after it is set."""
+    with mock.patch("ggrc.access_control.role.get_custom_roles_for",
+                    return_value={}):
+      self.assertEqual(self.revision.content["labels"],
+                       [{"id": None, "name": "label"}])
+      self.revision.content = {"label": ""}
+      self.assertEqual(self.revision.content["labels"], [])
+
+  def test_normalized_content(self):
+    """Normalized content is returned without populating it."""
+    self.revision.content_normalized = True
+    with mock.patch.object(all_models.Revision,
+                           "populate_content") as populate:
+      self.assertEqual(self.revision.content,
+                       {"title": "title", "label": "label"})
+    self.assertFalse(populate.called)
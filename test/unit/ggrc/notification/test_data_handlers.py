@@ -9,6 +9,7 @@ import unittest
 from datetime import datetime
 
 from ggrc.notifications.data_handlers import as_user_time
+from ggrc.notifications.data_handlers import _get_revision_window
 
 
 class TestAsUserTime(unittest.TestCase):
@@ -27,3 +28,33 @@ class TestAsUserTime(unittest.TestCase):
     timestamp = datetime(2017, 2, 13, 15, 40, 37)
     result = as_user_time(timestamp)
     self.assertEqual(result, "02/13/2017 07:40:37 PST")
+
+
+class TestGetRevisionWindow(unittest.TestCase):
+  """Tests for the _get_revision_window() helper function."""
+  # pylint: disable=invalid-name,protected-access
+
+  def test_no_revisions(self):
+    """Object without revisions has no revision window."""
+    self.assertEqual(_get_revision_window([], datetime(2018, 1, 1)),
+                     (None, None))
+
+  def test_revision_before_notification(self):
+    """Latest revision created before notification is used as the old one."""
+    revisions = [
+        (1, datetime(2018, 1, 1)),
+        (2, datetime(2018, 1, 2)),
+        (3, datetime(2018, 1, 4)),
+    ]
+    self.assertEqual(_get_revision_window(revisions, datetime(2018, 1, 3)),
+                     (3, 2))
+
+  def test_revision_at_notification_time(self):
+    """First revision created with the notification is used as a fallback."""
+    revisions = [
+        (1, datetime(2018, 1, 3)),
+        (2, datetime(2018, 1, 3)),
+        (3, datetime(2018, 1, 4)),
+    ]
+    self.assertEqual(_get_revision_window(revisions, datetime(2018, 1, 3)),
+                     (3, 1))
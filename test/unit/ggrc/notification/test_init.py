@@ -12,6 +12,10 @@ from ggrc.notifications import common
 
 class TestNotificationsInit(unittest.TestCase):
 
+  @patch("ggrc.notifications.data_handlers.updated_fields_cache")
+  @patch("ggrc.notifications.common.removed_task_objects_cache")
+  @patch("ggrc.notifications.common.preload_people")
+  @patch("ggrc.notifications.common.preload_notification_objects")
   @patch("ggrc.notifications.common.deleted_task_rels_cache")
   @patch("ggrc.notifications.common.cycle_tasks_cache")
   @patch("ggrc.notifications.common.get_filter_data")
@@ -0,0 +1,76 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for the ggrc.notifications.sinks module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock
+
+from ggrc.notifications import sinks
+
+
+class TestCallbackMailSink(unittest.TestCase):
+  """Tests for batching in CallbackMailSink."""
+
+  def test_sends_full_batches(self):
+    """Messages are sent only when the batch is full."""
+    send = Mock()
+    sink = sinks.CallbackMailSink(send, batch_size=2)
+    sink.add("a@example.com", "subject", "body a")
+    self.assertFalse(send.called)
+    sink.add("b@example.com", "subject", "body b")
+    self.assertEqual(send.call_count, 2)
+    self.assertEqual(sink.sent_count, 2)
+
+  def test_flushes_on_exit(self):
+    """Incomplete batch is sent when the sink is closed."""
+    send = Mock()
+    with sinks.CallbackMailSink(send, batch_size=10) as sink:
+      sink.add("a@example.com", "subject", "body a")
+      self.assertFalse(send.called)
+    send.assert_called_once_with("a@example.com", "subject", "body a")
+
+  def test_send_workers(self):
+    """All messages of a batch are sent by the worker threads."""
+    send = Mock()
+    with sinks.CallbackMailSink(send, batch_size=5, workers=3) as sink:
+      for name in ("a", "b", "c", "d"):
+        sink.add(name + "@example.com", "subject", "body " + name)
+    self.assertEqual(
+        sorted(call[0][0] for call in send.call_args_list),
+        ["a@example.com", "b@example.com", "c@example.com", "d@example.com"])
+    self.assertEqual(sink.sent_count, 4)
+
+  def test_abstract_sink(self):
+    """Sinks must implement send_batch."""
+    with self.assertRaises(TypeError):
+      sinks.MailSink()  # pylint: disable=abstract-class-instantiated
+
+
+class TestFileMailSink(unittest.TestCase):
+  """Tests for storing emails with FileMailSink."""
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def test_stores_emails(self):
+    """Each email is stored in a separate file."""
+    with sinks.FileMailSink(self.directory, batch_size=2) as sink:
+      for name in ("a", "b", "c"):
+        sink.add(name + "@example.com", "subject", u"body " + name)
+
+    file_names = sorted(os.listdir(self.directory))
+    self.assertEqual(file_names, [
+        "000000_a@example.com.html",
+        "000001_b@example.com.html",
+        "000002_c@example.com.html",
+    ])
+    with open(os.path.join(self.directory, file_names[2])) as email_file:
+      self.assertIn("body c", email_file.read())
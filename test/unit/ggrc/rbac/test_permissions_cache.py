@@ -0,0 +1,107 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for per user versioned cache of compiled permissions."""
+
+import unittest
+
+import mock
+
+from ggrc.rbac import permissions_cache
+
+
+class FakeMemcache(object):
+  """Minimal dict based memcache client."""
+
+  def __init__(self):
+    self.data = {}
+
+  def get(self, key):
+    return self.data.get(key)
+
+  def get_multi(self, keys):
+    return {key: self.data[key] for key in keys if key in self.data}
+
+  def add_multi(self, mapping):
+    for key, value in mapping.iteritems():
+      self.data.setdefault(key, value)
+
+  def set(self, key, value, _):
+    self.data[key] = value
+
+  def offset_multi(self, mapping, initial_value=0):
+    for key, delta in mapping.iteritems():
+      self.data[key] = self.data.get(key, initial_value) + delta
+
+
+class TestPermissionsCache(unittest.TestCase):
+  """Tests for compiling and caching permissions."""
+
+  def setUp(self):
+    self.client = FakeMemcache()
+    patcher = mock.patch("ggrc.rbac.permissions_cache._get_client",
+                         return_value=self.client)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+    self.permissions = permissions_cache.compile_permissions({
+        "read": {
+            "Control": {
+                "contexts": [1, 2, 2, None],
+                "resources": [5, 6],
+                "conditions": {None: [{"condition": "is", "terms": {}}]},
+            },
+        },
+    })
+
+  def test_compile(self):
+    """Contexts and resources are compiled into sets."""
+    self.assertEqual(self.permissions["read"]["Control"]["contexts"],
+                     {1, 2, None})
+    self.assertEqual(self.permissions["read"]["Control"]["resources"],
+                     {5, 6})
+
+  def test_serialize(self):
+    """Serialized permissions are loaded without changes."""
+    data = permissions_cache.serialize(self.permissions)
+    self.assertEqual(permissions_cache.deserialize(data), self.permissions)
+
+  def test_store(self):
+    """Stored permissions are returned for the same version."""
+    key, result = permissions_cache.get(1)
+    self.assertIsNone(result)
+    permissions_cache.store(key, self.permissions)
+    self.assertEqual(permissions_cache.get(1), (key, self.permissions))
+
+  def test_invalidate_user(self):
+    """Invalidation of a user does not affect other users."""
+    for user_id in (1, 2):
+      permissions_cache.store(permissions_cache.get(user_id)[0],
+                              self.permissions)
+
+    permissions_cache.invalidate([1])
+
+    self.assertIsNone(permissions_cache.get(1)[1])
+    self.assertEqual(permissions_cache.get(2)[1], self.permissions)
+
+  def test_invalidate_on_commit(self):
+    """Global invalidation is applied only after commit."""
+    permissions_cache.store(permissions_cache.get(1)[0], self.permissions)
+    session = mock.MagicMock(info={})
+
+    permissions_cache.invalidate_on_commit(session=session)
+    self.assertIsNotNone(permissions_cache.get(1)[1])
+    permissions_cache.handle_commit(session)
+
+    self.assertIsNone(permissions_cache.get(1)[1])
+    self.assertEqual(session.info, {})
+
+  def test_rollback(self):
+    """Invalidations of rolled back transactions are dropped."""
+    permissions_cache.store(permissions_cache.get(1)[0], self.permissions)
+    session = mock.MagicMock(info={})
+
+    permissions_cache.invalidate_on_commit([1], session=session)
+    permissions_cache.handle_rollback(session)
+    permissions_cache.handle_commit(session)
+
+    self.assertIsNotNone(permissions_cache.get(1)[1])
@@ -0,0 +1,94 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+"""Tests for per type change stamps."""
+
+import unittest
+
+import mock
+from werkzeug.datastructures import MultiDict
+
+from appengine.fake_memcache import FakeMemcache
+from ggrc.rbac import permissions_cache
+from ggrc.services import change_stamps
+
+
+class Control(object):  # pylint: disable=too-few-public-methods
+  """Stand-in for changed model objects."""
+
+
+class TestChangeStamps(unittest.TestCase):
+  """Tests for change stamps and collection etags."""
+
+  def setUp(self):
+    self.client = FakeMemcache()
+    for target in ("ggrc.services.change_stamps._get_client",
+                   "ggrc.rbac.permissions_cache._get_client"):
+      patcher = mock.patch(target, return_value=self.client)
+      patcher.start()
+      self.addCleanup(patcher.stop)
+    patcher = mock.patch(
+        "ggrc.services.change_stamps.get_dependent_types",
+        return_value=["Control", "Relationship"])
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  @staticmethod
+  def _etag(user_id=1, last_modified="2018-01-01", **args):
+    return change_stamps.collection_etag(
+        mock.sentinel.model, user_id, last_modified, MultiDict(args))
+
+  def test_bump(self):
+    """Only stamps of bumped types change."""
+    control, issue = change_stamps.get_stamps(["Control", "Issue"])
+    change_stamps.bump(["Control"])
+    self.assertEqual(change_stamps.get_stamps(["Control", "Issue"]),
+                     [control + 1, issue])
+
+  def test_collection_etag(self):
+    """Collection etag is stable until something it depends on changes."""
+    etag = self._etag()
+    self.assertEqual(self._etag(), etag)
+    self.assertNotEqual(self._etag(user_id=2), etag)
+    self.assertNotEqual(self._etag(last_modified="2018-01-02"), etag)
+    self.assertNotEqual(self._etag(__fields="id"), etag)
+
+    change_stamps.bump(["Issue"])
+    self.assertEqual(self._etag(), etag)
+    change_stamps.bump(["Relationship"])
+    self.assertNotEqual(self._etag(), etag)
+
+  def test_permissions_change(self):
+    """Collection etag changes with permissions of the user."""
+    etag = self._etag()
+    permissions_cache.invalidate([1])
+    self.assertNotEqual(self._etag(), etag)
+
+  def test_no_memcache(self):
+    """Etag is not available without memcache."""
+    with mock.patch("ggrc.services.change_stamps._get_client",
+                    return_value=None):
+      self.assertIsNone(self._etag())
+
+  def test_commit(self):
+    """Types of flushed objects are bumped only after commit."""
+    session = mock.MagicMock(info={}, new=[Control()], dirty=[], deleted=[])
+    etag = self._etag()
+
+    change_stamps.handle_flush(session, None)
+    self.assertEqual(self._etag(), etag)
+    change_stamps.handle_commit(session)
+
+    self.assertNotEqual(self._etag(), etag)
+    self.assertEqual(session.info, {})
+
+  def test_rollback(self):
+    """Changes of rolled back transactions are dropped."""
+    session = mock.MagicMock(info={}, new=[], dirty=[Control()], deleted=[])
+    etag = self._etag()
+
+    change_stamps.handle_flush(session, None)
+    change_stamps.handle_rollback(session)
+    change_stamps.handle_commit(session)
+
+    self.assertEqual(self._etag(), etag)
@@ -0,0 +1,49 @@
+# Copyright (C) 2018 Google Inc.
+# Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+"""Unit tests for counting preamble queries of requests."""
+
+import unittest
+
+import flask
+from flask import g
+
+from ggrc.utils import request_stats
+
+
+class TestPreambleCount(unittest.TestCase):
+  """Tests for preamble query counters."""
+
+  def setUp(self):
+    self.context = flask.Flask(__name__).test_request_context()
+    self.context.push()
+    request_stats.reset_counters()
+
+  def tearDown(self):
+    self.context.pop()
+
+  @staticmethod
+  def _query(count=1):
+    for _ in range(count):
+      request_stats._count_query()  # pylint: disable=protected-access
+
+  def test_lazy_loading(self):
+    """Marked queries in the request handler are counted as preamble."""
+    self._query(2)
+    request_stats.store_preamble_count()
+    self._query()
+    with request_stats.count_preamble():
+      self._query()
+      with request_stats.count_preamble():
+        self._query()
+    self._query()
+
+    self.assertEqual(g.preamble_query_count, 4)
+    self.assertEqual(g.query_count, 6)
+
+  def test_before_request_loading(self):
+    """Marked queries in before_request handlers are counted once."""
+    with request_stats.count_preamble():
+      self._query(2)
+    request_stats.store_preamble_count()
+
+    self.assertEqual(g.preamble_query_count, 2)